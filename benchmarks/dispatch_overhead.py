@@ -0,0 +1,63 @@
+"""Benchmark the per-call overhead of format/protocol multiple dispatch.
+
+Usage:
+
+    python -m benchmarks.dispatch_overhead [-n CALLS]
+
+We register no-op methods for a dummy format, so we only measure dispatch. "plum" is
+the plain `plum.Function` call, "fast" is the cached `gamma.io` dispatch.
+"""
+
+import argparse
+import timeit
+from typing import Literal
+
+import pandas as pd
+
+from gamma.io import Dataset, dispatch, read_pandas, read_polars, write_pandas
+from gamma.io._dataset import get_extension
+
+
+@dispatch
+def read_pandas(ds: Dataset, fmt: Literal["bench_noop"], protocol):
+    return None
+
+
+@dispatch
+def write_pandas(df: pd.DataFrame, ds: Dataset, fmt: Literal["bench_noop"], proto):
+    return None
+
+
+@dispatch
+def read_polars(ds: Dataset, fmt: Literal["bench_noop"], protocol):
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    ds = Dataset(layer="l", name="n", location="file:///tmp/x", format="bench_noop")
+    df = pd.DataFrame({"a": [1]})
+
+    cases = {
+        "read_pandas": (read_pandas, (ds, ds.format, ds.protocol)),
+        "write_pandas": (write_pandas, (df, ds, ds.format, ds.protocol)),
+        "read_polars": (read_polars, (ds, ds.format, ds.protocol)),
+        "get_extension": (get_extension, ("excel",)),
+    }
+
+    print(f"{'function':<16}{'plum (us)':>12}{'fast (us)':>12}{'speedup':>10}")
+    for name, (func, call_args) in cases.items():
+        results = []
+        for f in (func.function, func):
+            f(*call_args)  # warm up
+            secs = timeit.timeit(lambda: f(*call_args), number=args.calls)
+            results.append(secs / args.calls * 1e6)
+        slow, fast = results
+        print(f"{name:<16}{slow:>12.1f}{fast:>12.1f}{slow / fast:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
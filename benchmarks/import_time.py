@@ -0,0 +1,63 @@
+"""Benchmark the wall time of `import gamma.io` in fresh interpreters.
+
+Usage:
+
+    python -m benchmarks.import_time [-n RUNS]
+
+It also reports which dataframe backend libraries got imported, as these dominate
+startup time and should only be loaded on first use.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+BACKEND_LIBS = ["pandas", "pyarrow", "polars", "sqlalchemy"]
+
+SNIPPETS = {
+    "import gamma.io": "import gamma.io",
+    "+ read_pandas": "import gamma.io; gamma.io.read_pandas",
+    "+ all backends": "import gamma.io; gamma.io.load_backends()",
+}
+
+CODE = """
+import sys, time
+t0 = time.perf_counter()
+{snippet}
+elapsed = time.perf_counter() - t0
+print(elapsed, *[m for m in {libs} if m in sys.modules])
+"""
+
+
+def measure(snippet: str, runs: int) -> tuple[list[float], list[str]]:
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT))
+    code = CODE.format(snippet=snippet, libs=BACKEND_LIBS)
+    times = []
+    for _ in range(runs):
+        cp = subprocess.run(
+            [sys.executable, "-c", code], env=env, check=True, capture_output=True
+        )
+        elapsed, *libs = cp.stdout.decode().split()
+        times.append(float(elapsed))
+    return times, libs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, snippet in SNIPPETS.items():
+        times, libs = measure(snippet, args.runs)
+        print(
+            f"{label:<20} median={statistics.median(times) * 1000:7.1f}ms "
+            f"min={min(times) * 1000:7.1f}ms  loaded={','.join(libs) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
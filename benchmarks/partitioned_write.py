@@ -0,0 +1,107 @@
+"""Benchmark partitioned Parquet writes with different file and row group sizes.
+
+Usage:
+
+    python -m benchmarks.partitioned_write [-n ROWS] [--runs RUNS]
+
+The sample customers data is scaled up to `ROWS` rows and written partitioned by a
+skewed `cluster` column, where the largest partition holds about half of the rows.
+"pyarrow" uses the `pyarrow.dataset.write_dataset` defaults, with no file size limit
+and row groups as small as the input batches. The other cases use the `gamma.io`
+defaults for a few `target_file_size` values.
+
+We report the write time, the number of files and row groups written, and the time
+for reading the data back.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from gamma.io import Dataset, read_pandas, write_pandas
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+SAMPLE = PROJECT_ROOT / "samples" / "customers-1000.csv"
+
+CASES = {
+    "pyarrow": {"min_rows_per_group": 0, "target_file_size": None},
+    "default (256 MiB)": {},
+    "64 MiB": {"target_file_size": 64 * 2**20},
+    "16 MiB": {"target_file_size": 16 * 2**20},
+}
+
+
+def get_data(rows: int) -> pd.DataFrame:
+    sample = pd.read_csv(SAMPLE)
+    df = pd.concat([sample] * (rows // len(sample) + 1), ignore_index=True)
+    df = df.head(rows).copy()
+    df["Index"] = np.arange(rows)
+
+    # skewed partitions: cluster `k` has about `1 / 2**(k + 1)` of the rows
+    rng = np.random.default_rng(0)
+    df["cluster"] = np.minimum(rng.geometric(0.5, rows) - 1, 15).astype(str)
+    return df
+
+
+def count_row_groups(path: Path) -> tuple[int, int]:
+    files = list(path.rglob("*.parquet"))
+    return len(files), sum(pq.read_metadata(f).num_row_groups for f in files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--rows", type=int, default=2_000_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # the project `config` folder is the tests configuration
+    os.environ.setdefault("IO_TEST_TMP", tempfile.gettempdir())
+    os.environ.setdefault("IO_TEST_PROJECT_ROOT", str(PROJECT_ROOT))
+
+    df = get_data(args.rows)
+    nbytes = pa.Table.from_pandas(df, preserve_index=False).nbytes
+    print(f"{args.rows} rows, {nbytes / 2**20:.0f} MiB in memory")
+    print(
+        f"{'case':<20}{'write (s)':>10}{'MB/s':>8}{'files':>7}{'groups':>8}"
+        f"{'read (s)':>10}"
+    )
+
+    for name, write_args in CASES.items():
+        write_times, read_times = [], []
+        with tempfile.TemporaryDirectory() as td:
+            ds = Dataset(
+                layer="bench",
+                name="customers",
+                location=f"file://{td}/customers",
+                format="parquet",
+                partition_by=["cluster"],
+                write_mode="overwrite",
+                write_args=write_args,
+            )
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                write_pandas(df, ds)
+                write_times.append(time.perf_counter() - t0)
+
+                t0 = time.perf_counter()
+                read_pandas(ds)
+                read_times.append(time.perf_counter() - t0)
+
+            files, groups = count_row_groups(Path(td))
+
+        write = statistics.median(write_times)
+        read = statistics.median(read_times)
+        mbs = nbytes / 2**20 / write
+        print(f"{name:<20}{write:>10.2f}{mbs:>8.0f}{files:>7}{groups:>8}{read:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
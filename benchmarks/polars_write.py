@@ -0,0 +1,90 @@
+"""Benchmark the `pyarrow` and native Polars writers for partitioned datasets.
+
+Usage:
+
+    python -m benchmarks.polars_write [-n ROWS] [--runs RUNS]
+
+The sample customers data is scaled up to `ROWS` rows as a Polars DataFrame and
+written partitioned by a `cluster` column with 16 values, as zstd compressed Parquet
+and Feather. "pyarrow" converts the DataFrame to Arrow and uses
+`pyarrow.dataset.write_dataset`, "native" splits the partitions and writes the files
+with Polars (see the `polars_writer` writer argument).
+
+We report the median write time and the time for reading the data back.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from gamma.io import Dataset, read_polars, write_polars
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+SAMPLE = PROJECT_ROOT / "samples" / "customers-1000.csv"
+
+FORMATS = ["parquet", "feather"]
+WRITERS = ["pyarrow", "native"]
+
+
+def get_data(rows: int) -> pl.DataFrame:
+    sample = pl.read_csv(SAMPLE)
+    df = pl.concat([sample] * (rows // len(sample) + 1)).head(rows)
+    rng = np.random.default_rng(0)
+    return df.with_columns(
+        pl.Series("Index", np.arange(rows)),
+        pl.Series("cluster", rng.integers(0, 16, rows).astype(str)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--rows", type=int, default=2_000_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # the project `config` folder is the tests configuration
+    os.environ.setdefault("IO_TEST_TMP", tempfile.gettempdir())
+    os.environ.setdefault("IO_TEST_PROJECT_ROOT", str(PROJECT_ROOT))
+
+    df = get_data(args.rows)
+    nbytes = df.estimated_size()
+    print(f"{args.rows} rows, {nbytes / 2**20:.0f} MiB in memory")
+    print(f"{'format':<10}{'writer':<10}{'write (s)':>10}{'MB/s':>8}{'read (s)':>10}")
+
+    for fmt in FORMATS:
+        for writer in WRITERS:
+            write_times, read_times = [], []
+            with tempfile.TemporaryDirectory() as td:
+                ds = Dataset(
+                    layer="bench",
+                    name="customers",
+                    location=f"file://{td}/customers",
+                    format=fmt,
+                    partition_by=["cluster"],
+                    write_mode="overwrite",
+                    args={"compression": "zstd"},
+                    write_args={"polars_writer": writer},
+                )
+                for _ in range(args.runs):
+                    t0 = time.perf_counter()
+                    write_polars(df, ds)
+                    write_times.append(time.perf_counter() - t0)
+
+                    t0 = time.perf_counter()
+                    read_polars(ds)
+                    read_times.append(time.perf_counter() - t0)
+
+            write = statistics.median(write_times)
+            read = statistics.median(read_times)
+            mbs = nbytes / 2**20 / write
+            print(f"{fmt:<10}{writer:<10}{write:>10.2f}{mbs:>8.0f}{read:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
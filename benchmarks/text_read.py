@@ -0,0 +1,96 @@
+"""Benchmark the pandas/Polars and `pyarrow` readers for CSV and JSON lines datasets.
+
+Usage:
+
+    python -m benchmarks.text_read [-n ROWS] [--runs RUNS]
+
+The sample customers CSV is scaled up to `ROWS` rows and written as plain CSV, gzip
+compressed CSV and JSON lines. "default" reads the files with the pandas/Polars
+readers from a `fsspec` stream, "pyarrow" sets the `text_reader: pyarrow` reader
+argument, parsing blocks of the files in parallel (see `gamma.io._arrow.read_text`).
+
+We report the median read time and throughput over the file size on disk.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gamma.io import Dataset, read_arrow, read_pandas, read_polars
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+SAMPLE = PROJECT_ROOT / "samples" / "customers-1000.csv"
+
+FILES = {
+    "csv": ("customers.csv", "csv", {}),
+    "csv.gz": ("customers.csv.gz", "csv", {"compression": "gzip"}),
+    "jsonl": ("customers.jsonl", "json", {"orient": "records", "lines": True}),
+}
+
+READERS = {
+    "pandas": (read_pandas, {}),
+    "pandas+pyarrow": (read_pandas, {"text_reader": "pyarrow"}),
+    "polars": (read_polars, {}),
+    "polars+pyarrow": (read_polars, {"text_reader": "pyarrow"}),
+    "arrow": (read_arrow, {}),
+}
+
+
+def write_files(rows: int, folder: str) -> None:
+    sample = pd.read_csv(SAMPLE)
+    df = pd.concat([sample] * (rows // len(sample) + 1)).head(rows)
+    df["Index"] = np.arange(rows)
+
+    df.to_csv(f"{folder}/customers.csv", index=False)
+    df.to_csv(f"{folder}/customers.csv.gz", index=False, compression="gzip")
+    df.to_json(f"{folder}/customers.jsonl", orient="records", lines=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--rows", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # the project `config` folder is the tests configuration
+    os.environ.setdefault("IO_TEST_TMP", tempfile.gettempdir())
+    os.environ.setdefault("IO_TEST_PROJECT_ROOT", str(PROJECT_ROOT))
+
+    print(f"{'file':<10}{'reader':<16}{'MiB':>6}{'read (s)':>10}{'MB/s':>8}")
+    with tempfile.TemporaryDirectory() as td:
+        write_files(args.rows, td)
+
+        for label, (filename, fmt, fmt_args) in FILES.items():
+            path = f"{td}/{filename}"
+            size = os.path.getsize(path) / 2**20
+            for reader, (func, read_args) in READERS.items():
+                if reader == "polars" and label != "csv":
+                    # Polars streams support neither compressed CSV nor JSON lines
+                    continue
+                ds = Dataset(
+                    layer="bench",
+                    name="customers",
+                    location=f"file://{path}",
+                    format=fmt,
+                    args=fmt_args,
+                    read_args=read_args,
+                )
+                times = []
+                for _ in range(args.runs):
+                    t0 = time.perf_counter()
+                    func(ds)
+                    times.append(time.perf_counter() - t0)
+
+                read = statistics.median(times)
+                mbs = size / read
+                print(f"{label:<10}{reader:<16}{size:>6.0f}{read:>10.2f}{mbs:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
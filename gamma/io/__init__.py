@@ -2,35 +2,113 @@
 
 When adding support for new I/O operations, please follow the convention and expose
 the relevant functions here.
+
+Dataframe backends (eg. pandas, polars) are imported lazily, on first access of one of
+their functions, to keep `import gamma.io` fast. Declare new backend modules in
+`_BACKENDS` and their public functions in `_LAZY_ATTRS`.
 """
 
 # isort: skip_file
 # ruff: noqa: F401 E402
 
-# initialize a scoped dispatcher
+# initialize a scoped dispatcher, see `_dispatch` for the fast path details
 
-from plum import Dispatcher
+from ._dispatch import Dispatcher
 
 dispatch = Dispatcher()
 
+import importlib
+import importlib.util
+
 from .__version__ import __version__
 
 # Core features
 from ._dataset import get_dataset, get_dataset_location, read_dataset, write_dataset
+from ._dataset import clear_dataset_cache, get_dataset_cache_info
 from ._fs import get_fs_path, copy_dataset
+from ._fs import get_filesystem, close_filesystems, get_filesystem_pool_info
 from ._types import Dataset, PartitionException, DatasetException
 from ._staging import is_staging_enabled
 
-# Core dataframe libs - pandas / pyarrow
-from ._pandas import read_pandas, write_pandas, list_partitions
-
 from ._utils import try_import
 
-# Stack specific features, you should be able to remove modules
-# if you don't need specific functionality
+# Stack specific features, mapping backend modules to the library they require. You
+# should be able to remove modules if you don't need specific functionality.
+_BACKENDS = {
+    # Core dataframe libs - pandas / pyarrow
+    "._arrow": "pyarrow",
+    "._compact": "pyarrow",
+    "._convert": "pyarrow",
+    "._discovery": "pyarrow",
+    "._duckdb": "duckdb",
+    "._pandas": "pandas",
+    "._polars": "polars",
+    "._sql": "sqlalchemy",
+}
+
+# Public functions provided by backends and the modules to import for them. The
+# first module defines the function, the others register extra dispatch methods.
+# Entries loading `._pandas` must also load `._sql`, registering the SQL formats.
+_LAZY_ATTRS = {
+    "read_pandas": ["._pandas", "._sql"],
+    "write_pandas": ["._pandas", "._sql"],
+    "list_partitions": ["._pandas", "._sql"],
+    "iter_pandas": ["._pandas", "._sql"],
+    "read_arrow": ["._arrow"],
+    "iter_arrow": ["._arrow"],
+    "open_dataset_writer": ["._arrow"],
+    "compact_dataset": ["._compact"],
+    "convert_dataset": ["._convert", "._sql"],
+    "clear_discovery_cache": ["._discovery"],
+    "get_discovery_cache_info": ["._discovery"],
+    "read_polars": ["._polars"],
+    "write_polars": ["._polars"],
+    "iter_polars": ["._polars"],
+    "scan_polars": ["._polars"],
+    "get_sql_engine": ["._sql"],
+    "read_duckdb": ["._duckdb"],
+    "register_duckdb_views": ["._duckdb"],
+}
+
+_LOADED_BACKENDS: set[str] = set()
+
+
+def load_backends(*modules: str) -> bool:
+    """Import backend modules, registering their dispatch methods.
+
+    Backends whose required library is not installed are skipped.
+
+    Args:
+        *modules: Backend module names (eg. `._pandas`). Load all if not provided.
+
+    Returns: `True` if any backend was newly loaded.
+    """
+    loaded = False
+    for module in modules or _BACKENDS:
+        if module in _LOADED_BACKENDS:
+            continue
+        if importlib.util.find_spec(_BACKENDS[module]) is None:  # pragma: no cover
+            continue
+        importlib.import_module(module, __name__)
+        _LOADED_BACKENDS.add(module)
+        loaded = True
+    return loaded
+
+
+def __getattr__(name: str):
+    modules = _LAZY_ATTRS.get(name)
+    if modules is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    load_backends(*modules)
+    if modules[0] not in _LOADED_BACKENDS:  # pragma: no cover
+        lib = _BACKENDS[modules[0]]
+        raise AttributeError(f"{__name__}.{name} requires '{lib}' to be installed")
+
+    value = getattr(importlib.import_module(modules[0], __name__), name)
+    globals()[name] = value
+    return value
 
-if try_import("polars"):
-    from ._polars import read_polars, write_polars
 
-if try_import("sqlalchemy"):
-    from ._sql import get_sql_engine
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
@@ -5,90 +5,170 @@ Parquet or Feather/ArrowIPC datasets. It provides full support for "Hive" style
 partitioning.
 """
 
+import logging
+import operator
 import tempfile
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from functools import reduce
+from typing import Literal, Type
+from urllib.parse import quote, unquote
 
 import pyarrow as pa
+import pyarrow.csv as pa_csv
 import pyarrow.dataset as pa_ds
+import pyarrow.fs as pa_fs
+import pyarrow.json as pa_json
 import pyarrow.parquet as pq
 from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
+from fsspec.utils import infer_compression
 from pyarrow.compute import field as pa_field
 from pyarrow.compute import scalar as pa_scalar
 from pyarrow.feather import read_table as pa_read_feather
 from pyarrow.feather import write_feather as pa_write_feather
 
-from ._dataset import get_extension
+from . import dispatch
+from ._dataset import get_dataset, get_extension
+from ._discovery import open_cached_dataset, update_write_marker
+from ._filters import to_expression
+from ._fs import upload_file
+from ._index import (
+    apply_index,
+    feather_stats,
+    get_index_columns,
+    get_index_schema,
+    nan_free_columns,
+    parquet_stats,
+    read_index,
+    remove_index,
+    table_stats,
+    write_index,
+)
+from ._logging import log_ds_read
+from ._sorting import is_sorted_write, sort_table
 from ._staging import get_stage_reader_fs_path, get_stage_writer_fs_path
-from ._types import Dataset
+from ._types import FEATHER_STRINGS, ArrowFmt, Dataset, DatasetException
 from ._utils import (
+    check_no_filters,
+    check_write_mode,
     func_arguments,
     get_parent,
     get_single_file_in_folder,
+    list_data_files,
     remove_extra_arguments,
 )
 
+#: Directory name used by "Hive" partitioning for null partition values
+HIVE_NULL_FALLBACK = "__HIVE_DEFAULT_PARTITION__"
+
+#: The `existing_data_behavior` of `pyarrow.dataset.write_dataset` for each dataset
+#: `write_mode`. On `overwrite` we also remove the whole dataset before writing.
+EXISTING_DATA_BEHAVIOR = {
+    "overwrite": "overwrite_or_ignore",
+    "overwrite_partitions": "delete_matching",
+    "append": "overwrite_or_ignore",
+    "error_if_exists": "error",
+}
+
+#: Default target size in bytes of the files written to partitioned datasets, as
+#: estimated from the Arrow data. Override with the `target_file_size` writer argument.
+TARGET_FILE_SIZE = 256 * 2**20
+
+#: Default row group (or Feather record batch) size bounds for partitioned datasets
+MIN_ROWS_PER_GROUP = 64 * 2**10
+MAX_ROWS_PER_GROUP = 2**20
+
+#: Remote Feather files up to this size (in bytes) are read with a single request
+FEATHER_BUFFER_MAX_SIZE = 8 * 2**20
+
+#: Parquet summary files names, with all row groups metadata and the common schema
+PARQUET_METADATA_FILE = "_metadata"
+PARQUET_COMMON_METADATA_FILE = "_common_metadata"
+
+#: Compression codecs of CSV/JSON lines files decompressed by Arrow input streams.
+#: Other codecs (eg. `zip`) are decompressed by `fsspec`.
+ARROW_TEXT_CODECS = {"gzip", "bz2", "zstd"}
+
+logger = logging.getLogger("gamma.io")
+
 
 def read_feather(ds: Dataset) -> pa.Table:
-    """Reads a Arrow IPC/Feather V2 dataset."""
+    """Reads a Arrow IPC/Feather V2 dataset.
+
+    Local files can be memory-mapped with the `memory_map: true` reader argument. For
+    uncompressed files, the Arrow buffers are then backed by the OS page cache instead
+    of being copied to memory. Conversion to pandas is also zero-copy for primitive
+    columns without nulls written as a single chunk (see the `chunksize` argument).
+    """
     # get a fs, path reference
     fs: AbstractFileSystem
     fs, path = get_stage_reader_fs_path(ds)
 
-    # is path pointing to a dir
-    is_dir = fs.isdir(path)
+    if ds.partition_by:
+        # partitioned datasets are always folders, skip listing them here
+        singe_file = False
+    else:
+        # is path pointing to a dir
+        is_dir = fs.isdir(path)
 
-    # should path be pointing to a single file
-    singe_file = not is_dir or (is_dir and len(fs.find(path)) <= 1)
+        # should path be pointing to a single file
+        singe_file = not is_dir or (is_dir and len(fs.find(path)) <= 1)
 
-    if not ds.partition_by and is_dir and singe_file:
-        # adjust path if we're reading from a single file
-        path = get_single_file_in_folder(fs, path, ds)
+        if is_dir and singe_file:
+            # adjust path if we're reading from a single file
+            path = get_single_file_in_folder(fs, path, ds)
 
-    if singe_file:
-        kwargs = dict()
-        kwargs.update(ds.args)
-        kwargs.update(ds.write_args)
+    kwargs = dict()
+    kwargs.update(ds.args)
+    kwargs.update(ds.read_args)
+    _filter = get_filter_expression(ds, kwargs)
+
+    if singe_file and _filter is None:
         remove_extra_arguments(pa_read_feather, kwargs)
 
         if fs.protocol == "file":
             # fast path for single file feather in local fs
             return pa_read_feather(path, **kwargs)
         else:
-            with tempfile.TemporaryDirectory() as td:
-                local_path = f"{td}/data"
-                fs.get_file(path, local_path)
-                return pa_read_feather(local_path, **kwargs)
+            return _read_remote_feather(fs, path, kwargs)
     else:
-        # support for more complex chuncked/partitioned feather
-        kwargs = dict()
-
-        if ds.partition_by:
-            kwargs["partitioning"] = "hive"
-
-        if ds.partitions:
-            _filter = pa_scalar(True)
-            for key, val in ds.partitions.items():
-                _filter &= pa_field(key) == val
-            kwargs["filter"] = _filter
-
-        kwargs.update(ds.args)
-        kwargs.update(ds.write_args)
-        kwargs["source"] = path
-        kwargs["filesystem"] = fs
+        # support for more complex chuncked/partitioned or filtered feather
         kwargs["format"] = "feather"
-
-        # pick dataset arguments
-        dataset_args = kwargs.copy()
-        remove_extra_arguments(pa_ds.dataset, dataset_args)
+        dataset = _open_arrow_dataset(ds, fs, path, kwargs, _filter)
 
         # pick table arguments
-        table_arg_set = ["columns", "filter", "batch_size"]
+        table_arg_set = ["columns", "batch_size"]
         table_args = {k: v for k, v in kwargs.items() if k in table_arg_set}
 
-        return pa_ds.dataset(**dataset_args).to_table(**table_args)
+        return dataset.to_table(filter=_filter, **table_args)
+
+
+def _read_remote_feather(fs, path: str, kwargs: dict) -> pa.Table:
+    """Read a remote Feather file using random access reads, without a local copy.
+
+    Only the record batch buffers for the requested `columns` are fetched. Files up to
+    `FEATHER_BUFFER_MAX_SIZE` are read to memory with a single request instead.
+    """
+    kwargs = kwargs.copy()
+    kwargs.pop("memory_map", None)
+    with fs.open(path, "rb") as fo:
+        size = getattr(fo, "size", None)
+        if size is not None and size <= FEATHER_BUFFER_MAX_SIZE:
+            return pa_read_feather(pa.BufferReader(fo.read()), **kwargs)
+        return pa_read_feather(fo, **kwargs)
 
 
 def read_parquet(ds: Dataset) -> pa.Table:
-    """Read a Parquet dataset."""
+    """Read a Parquet dataset.
+
+    For partitioned datasets, we use the `_metadata` summary file if available (see
+    the `write_metadata` writer argument), avoiding to fetch every file footer. Set the
+    `use_metadata: false` reader argument to ignore it.
+
+    Local files can be memory-mapped with the `memory_map: true` reader argument.
+    """
     # get a fs, path reference
     # parquet read_table knows how to handle multi-file parquets
     fs, path = get_stage_reader_fs_path(ds)
@@ -98,23 +178,419 @@ def read_parquet(ds: Dataset) -> pa.Table:
     if ds.partition_by:
         kwargs["partitioning"] = "hive"
 
-    if ds.partitions:
-        _filter = pa_scalar(True)
-        for key, val in ds.partitions.items():
-            _filter &= pa_field(key) == val
-        kwargs["filters"] = _filter
-
     kwargs.update(ds.args)
     kwargs.update(ds.read_args)
+    kwargs["filters"] = get_filter_expression(ds, kwargs)
+    use_metadata = kwargs.pop("use_metadata", True)
+
+    if ds.partition_by:
+        dataset_args = kwargs.copy()
+        if dataset_args.get("partitioning") == "hive":
+            # same partition types as `pq.read_table`
+            dataset_args["partitioning"] = pa_ds.HivePartitioning.discover(
+                infer_dictionary=True
+            )
+        dataset_args["format"] = _get_parquet_format(kwargs)
+
+        dataset = None
+        if use_metadata:
+            dataset = _open_parquet_summary(ds, fs, path, dataset_args)
+        if dataset is None:
+            # prune known partitions folders and indexed files
+            dataset = _open_arrow_dataset(ds, fs, path, dataset_args, kwargs["filters"])
+
+        table_arg_set = ["columns", "use_threads"]
+        table_args = {k: v for k, v in kwargs.items() if k in table_arg_set}
+        return dataset.to_table(filter=kwargs["filters"], **table_args)
 
     remove_extra_arguments(pq.read_table, kwargs)
 
     return pq.read_table(source=path, filesystem=fs, **kwargs)
 
 
+def _open_parquet_summary(
+    ds: Dataset, fs, path: str, kwargs: dict
+) -> pa_ds.Dataset | None:
+    """Open a dataset from the `_metadata` summary file, if present and up to date.
+
+    The summary is checked against a listing of the data files, restricted to the
+    known partitions folder. Return `None` if missing or stale. Checked summaries are
+    cached, see `gamma.io._discovery`.
+    """
+    path = path.rstrip("/")
+    partitions_path = get_partitions_path(ds, path)
+
+    def discover() -> pa_ds.Dataset | None:
+        metadata_path = f"{path}/{PARQUET_METADATA_FILE}"
+        if not fs.exists(metadata_path):
+            return None
+
+        dataset_args = kwargs.copy()
+        remove_extra_arguments(pa_ds.parquet_dataset, dataset_args)
+        dataset_args["filesystem"] = _get_arrow_filesystem(fs, kwargs)
+        dataset = pa_ds.parquet_dataset(metadata_path, **dataset_args)
+
+        prefix = f"{partitions_path}/" if partitions_path != path else f"{path}/"
+        summary_files = {f for f in dataset.files if f.startswith(prefix)}
+        if summary_files != set(list_data_files(fs, partitions_path, path)):
+            logger.warning(
+                f"Ignoring stale Parquet summary for dataset {ds.layer}.{ds.name}"
+            )
+            return None
+
+        return dataset
+
+    key = ("summary", partitions_path, *_get_discovery_key(kwargs))
+    return open_cached_dataset(fs, path, key, kwargs, discover)
+
+
+def _get_parquet_format(kwargs: dict) -> pa_ds.ParquetFileFormat:
+    """Return the file format for the `pq.read_table` reader arguments."""
+    options = {}
+    for key in ("pre_buffer", "coerce_int96_timestamp_unit"):
+        if key in kwargs:
+            options[key] = kwargs[key]
+    if kwargs.get("buffer_size"):
+        options.update(use_buffered_stream=True, buffer_size=kwargs["buffer_size"])
+    if kwargs.get("read_dictionary") is not None:
+        options["dictionary_columns"] = kwargs["read_dictionary"]
+    return pa_ds.ParquetFileFormat(**options)
+
+
+def get_arrow_dataset(
+    ds: Dataset, filter: pa_ds.Expression | None = None
+) -> pa_ds.Dataset:
+    """Return a `pyarrow.dataset.Dataset` for a Parquet or Feather dataset.
+
+    Creating the dataset only discovers the files, no data is read.
+
+    Args:
+        ds: The dataset.
+        filter: The filter to be used when scanning, allowing to skip files using the
+            sidecar index.
+    """
+    fs, path = get_stage_reader_fs_path(ds)
+
+    kwargs = dict()
+    kwargs.update(ds.args)
+    kwargs.update(ds.read_args)
+    kwargs["format"] = "feather" if ds.format in FEATHER_STRINGS else ds.format
+
+    return _open_arrow_dataset(ds, fs, path, kwargs, filter)
+
+
+def _open_arrow_dataset(
+    ds: Dataset, fs, path: str, kwargs: dict, _filter=None
+) -> pa_ds.Dataset:
+    """Open a `pyarrow.dataset.Dataset`, pruning the known partitions folders.
+
+    If the leading partition values are known (eg. `l1` for `partition_by: [l1, l2]`)
+    we only list files beneath the matching `l1=value` folder. The partition columns
+    are still parsed from the path relative to the dataset root.
+
+    If a `_filter` is provided, we also use the sidecar index to skip files, see
+    `gamma.io._index`.
+
+    The discovered files and schema are cached, see `gamma.io._discovery`.
+    """
+    kwargs = kwargs.copy()
+    if ds.partition_by:
+        kwargs.setdefault("partitioning", "hive")
+    use_index = kwargs.pop("use_index", True)
+    partitions_path = get_partitions_path(ds, path)
+
+    def discover() -> pa_ds.Dataset:
+        dataset_args = kwargs.copy()
+        arrow_fs = _get_arrow_filesystem(fs, dataset_args)
+        remove_extra_arguments(pa_ds.dataset, dataset_args)
+
+        if partitions_path != path:
+            try:
+                return pa_ds.dataset(
+                    partitions_path,
+                    filesystem=arrow_fs,
+                    partition_base_dir=path.rstrip("/"),
+                    **dataset_args,
+                )
+            except FileNotFoundError:
+                # no data for the partition, fallback to an (empty) filtered read
+                pass
+
+        return pa_ds.dataset(path, filesystem=arrow_fs, **dataset_args)
+
+    key = ("dataset", partitions_path, *_get_discovery_key(kwargs))
+    dataset = open_cached_dataset(fs, path, key, kwargs, discover)
+
+    if ds.partition_by and use_index and _filter is not None:
+        index = read_index(fs, path)
+        if index is not None:
+            dataset = apply_index(dataset, index, path)
+
+    return dataset
+
+
+def _get_discovery_key(kwargs: dict) -> tuple:
+    """Return the reader arguments changing the discovered dataset, for caching."""
+    partitioning = kwargs.get("partitioning")
+    if partitioning is not None and not isinstance(partitioning, str):
+        # factories from `HivePartitioning.discover` cannot be compared
+        schema = getattr(partitioning, "schema", None)
+        partitioning = f"{type(partitioning).__name__}({schema})"
+    return (
+        partitioning,
+        bool(kwargs.get("memory_map")),
+        str(kwargs.get("schema")),
+        kwargs.get("ignore_prefixes") and tuple(kwargs["ignore_prefixes"]),
+    )
+
+
+def _get_arrow_filesystem(fs, kwargs: dict):
+    """Return a memory-mapping `pyarrow` filesystem if requested for local files."""
+    if kwargs.get("memory_map") and isinstance(fs, LocalFileSystem):
+        return pa_fs.LocalFileSystem(use_mmap=True)
+    return fs
+
+
+def use_memory_map(ds: Dataset) -> bool:
+    """Return `True` if the dataset is read with memory-mapping, if local."""
+    kwargs = {**ds.args, **ds.read_args}
+    return bool(kwargs.get("memory_map", False))
+
+
+def get_partitions_path(ds: Dataset, path: str) -> str:
+    """Return the folder in `path` for the leading known partition values."""
+    for col in ds.partition_by:
+        if col not in ds.partitions:
+            break
+        val = encode_partition_value(ds.partitions[col])
+        path = f"{path.rstrip('/')}/{col}={val}"
+    return path
+
+
+def iter_arrow(ds: Dataset, batch_size: int | None = None) -> Iterator[pa.RecordBatch]:
+    """Iterate over a Parquet or Feather dataset as record batches.
+
+    Only one batch at a time (plus some read-ahead) is kept in memory, regardless of
+    the dataset size. We honor the dataset `partitions` and `filters`, and the
+    `columns`, `filter` (or `filters`) and `batch_size` reader arguments.
+
+    Args:
+        ds: The dataset to read.
+        batch_size: The max number of rows per batch, overriding the reader args.
+    """
+    kwargs = dict()
+    kwargs.update(ds.args)
+    kwargs.update(ds.read_args)
+
+    scan_args = {k: v for k, v in kwargs.items() if k in ("columns", "batch_size")}
+    if batch_size is not None:
+        scan_args["batch_size"] = batch_size
+
+    _filter = get_filter_expression(ds, kwargs)
+    if _filter is not None:
+        scan_args["filter"] = _filter
+
+    yield from get_arrow_dataset(ds, _filter).to_batches(**scan_args)
+
+
+def parse_hive_folders(partition_by: list[str], folders: list[str]) -> list[tuple]:
+    """Return the partition values of "Hive" folders (eg. `l1=A/l2=1`).
+
+    Types are inferred as by the `pyarrow` readers, without opening any file: `int32`
+    if all values of a column are integers, else strings.
+    """
+    values: dict[str, list[str]] = {col: [] for col in partition_by}
+    for folder in folders:
+        for col, part in zip(partition_by, folder.split("/")):
+            val = part.partition("=")[2]
+            if val != HIVE_NULL_FALLBACK:
+                values[col].append(unquote(val))
+
+    schema = pa.schema([(col, _infer_partition_type(v)) for col, v in values.items()])
+    partitioning = pa_ds.HivePartitioning(schema, null_fallback=HIVE_NULL_FALLBACK)
+
+    keys = []
+    for folder in folders:
+        # the last segment would be a file name
+        expr = partitioning.parse(f"/{folder}/")
+        keys.append(tuple(pa_ds.get_partition_keys(expr).get(c) for c in partition_by))
+    return keys
+
+
+def _infer_partition_type(values: list[str]) -> pa.DataType:
+    if not values:
+        return pa.string()
+    try:
+        pa.array(values, pa.string()).cast(pa.int32())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pa.string()
+    return pa.int32()
+
+
+def _get_partitions_filter(ds: Dataset) -> pa_ds.Expression:
+    """Return a filter expression matching the dataset partition values."""
+    _filter = pa_scalar(True)
+    for key, val in ds.partitions.items():
+        _filter &= pa_field(key) == val
+    return _filter
+
+
+def get_filter_expression(ds: Dataset, kwargs: dict) -> pa_ds.Expression | None:
+    """Combine the dataset `partitions` and `filters` with the reader arguments filter.
+
+    The reader `filter` (or `filters`) argument accepts the same specs as the dataset
+    `filters` field, see `gamma.io._filters`.
+    """
+    specs = [ds.filters, kwargs.pop("filter", None), kwargs.pop("filters", None)]
+    exprs = [to_expression(spec) for spec in specs if spec is not None]
+    if ds.partitions:
+        exprs.append(_get_partitions_filter(ds))
+
+    if not exprs:
+        return None
+    return reduce(operator.and_, exprs)
+
+
+@dispatch
+def read_dataset(cls: Type[pa.Table], *args, **kwargs) -> pa.Table:
+    return read_arrow(*args, **kwargs)
+
+
+@dispatch
+def read_dataset(cls: Type[pa.Table], ds: Dataset) -> pa.Table:
+    return read_arrow(ds)
+
+
+@dispatch
+def read_arrow(*args, **kwargs) -> pa.Table:
+    """Arrow dataset reader shortcut."""
+    return read_arrow(get_dataset(*args, **kwargs))
+
+
+@dispatch
+@log_ds_read
+def read_arrow(ds: Dataset):
+    """Arrow dataset reader shortcut."""
+    return read_arrow(ds, ds.format, ds.protocol)
+
+
+@dispatch
+def read_arrow(ds: Dataset, fmt, protocol):
+    """Fallback for formats not supported by `pyarrow`."""
+    raise NotImplementedError(f"Reading Arrow format not supported yet: {fmt}")
+
+
+@dispatch
+def read_arrow(ds: Dataset, fmt: Literal["parquet"], protocol) -> pa.Table:
+    return read_parquet(ds)
+
+
+@dispatch
+def read_arrow(ds: Dataset, fmt: ArrowFmt, protocol) -> pa.Table:
+    return read_feather(ds)
+
+
+@dispatch
+def read_arrow(
+    ds: Dataset, fmt: Literal["csv"] | Literal["json"], protocol
+) -> pa.Table:
+    return read_text(ds)
+
+
+def use_arrow_text_reader(ds: Dataset) -> bool:
+    """Return if the `text_reader: pyarrow` reader argument is set, see `read_text`."""
+    kwargs = {**ds.args, **ds.read_args}
+    return kwargs.get("text_reader") == "pyarrow"
+
+
+def read_text(ds: Dataset) -> pa.Table:
+    """Read a CSV or JSON lines dataset with the multithreaded `pyarrow` parsers.
+
+    Files are split in blocks of `block_size` bytes (default 1 MiB) parsed in parallel,
+    unless `use_threads: false` is set. Column types are inferred, set the
+    `column_types` reader argument to a `{column: type}` mapping of Arrow type names
+    (eg. `int64`, `string`, `timestamp[s]`) to override them. Only the `columns` (or
+    pandas' `usecols`) are converted, if set. CSV datasets also support the `sep` (or
+    `delimiter`) and `encoding` reader arguments. JSON datasets must set `lines: true`,
+    and their typed columns come first unless `columns` is set.
+
+    The `compression` reader argument is inferred from the file extension by default.
+    Remote files are fetched to memory before parsing.
+    """
+    check_no_filters(ds)
+    fs, path = get_stage_reader_fs_path(ds)
+    if fs.isdir(path):
+        path = get_single_file_in_folder(fs, path, ds)
+
+    kwargs = {**ds.args, **ds.read_args}
+    if ds.format == "json" and not kwargs.get("lines"):
+        msg = f"Dataset {ds.layer}/{ds.name}: JSON files must set `lines: true`."
+        raise DatasetException(msg, ds)
+
+    read_options = {"use_threads": kwargs.get("use_threads", True)}
+    if kwargs.get("block_size"):
+        read_options["block_size"] = kwargs["block_size"]
+
+    types = kwargs.get("column_types") or {}
+    types = {col: _get_arrow_type(typ) for col, typ in types.items()}
+    columns = kwargs.get("columns", kwargs.get("usecols"))
+
+    compression = kwargs.get("compression", "infer")
+    if isinstance(compression, dict):
+        # pandas also accepts a dict with the codec options
+        compression = compression.get("method")
+    if compression == "infer":
+        compression = infer_compression(path)
+
+    with _open_text_input(fs, path, compression) as source:
+        if ds.format == "json":
+            schema = pa.schema(types) if types else None
+            tbl = pa_json.read_json(
+                source,
+                read_options=pa_json.ReadOptions(**read_options),
+                parse_options=pa_json.ParseOptions(explicit_schema=schema),
+            )
+            return tbl if columns is None else tbl.select(columns)
+
+        delimiter = kwargs.get("sep") or kwargs.get("delimiter") or ","
+        return pa_csv.read_csv(
+            source,
+            read_options=pa_csv.ReadOptions(
+                encoding=kwargs.get("encoding") or "utf8", **read_options
+            ),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=types,
+                include_columns=columns,
+                # empty values are nulls, as in pandas
+                strings_can_be_null=True,
+            ),
+        )
+
+
+def _get_arrow_type(typ) -> pa.DataType:
+    return typ if isinstance(typ, pa.DataType) else pa.type_for_alias(typ)
+
+
+def _open_text_input(fs, path: str, compression: str | None) -> pa.NativeFile:
+    """Open a file as an Arrow input stream, decompressing it.
+
+    Arrow parsers get native streams only: reading from Python file objects holds the
+    GIL in the parser threads.
+    """
+    if compression is None or compression in ARROW_TEXT_CODECS:
+        if isinstance(fs, LocalFileSystem):
+            return pa.input_stream(path, compression=compression)
+        return pa.input_stream(pa.py_buffer(fs.cat_file(path)), compression=compression)
+
+    with fs.open(path, "rb", compression=compression) as fo:
+        return pa.BufferReader(fo.read())
+
+
 def write_parquet(tbl: pa.Table, ds: Dataset):
     """Writes a Parquet dataset."""
     func_args = func_arguments(pq.write_table)
+    tbl = sort_table(tbl, ds)
 
     # handle partitions using dataset
     if ds.partition_by:
@@ -128,6 +604,7 @@ def write_parquet(tbl: pa.Table, ds: Dataset):
     remove_extra_arguments(pq.write_table, kwargs)
 
     path = _adjust_writer_path_arrow(ds, fs, path, "parquet")
+    check_write_mode(ds, fs, path)
     fs.makedirs(get_parent(path), exist_ok=True)
     pq.write_table(tbl, path, filesystem=fs, **kwargs)
 
@@ -137,6 +614,8 @@ def write_feather(tbl: pa.Table, ds: Dataset) -> None:
 
     It defaults to uncompressed data.
     """
+    tbl = sort_table(tbl, ds)
+
     # handle partitions using dataset
     if ds.partition_by:
         func_args = func_arguments(pq.ParquetWriter.__init__)
@@ -152,6 +631,7 @@ def write_feather(tbl: pa.Table, ds: Dataset) -> None:
     remove_extra_arguments(pa_write_feather, kwargs)
 
     path = _adjust_writer_path_arrow(ds, fs, path, "feather")
+    check_write_mode(ds, fs, path)
     fs.makedirs(get_parent(path), exist_ok=True)
 
     if fs.protocol == "file":
@@ -160,7 +640,7 @@ def write_feather(tbl: pa.Table, ds: Dataset) -> None:
         with tempfile.TemporaryDirectory() as td:
             lpath = f"{td}/data"
             pa_write_feather(tbl, lpath, **kwargs)
-            fs.put_file(lpath, path)
+            upload_file(fs, lpath, path)
 
 
 def _adjust_writer_path_arrow(ds, fs, path: str, fmt):
@@ -194,6 +674,20 @@ def _write_dataset(
     # get set of write_dataset options
     write_ds_options = kwargs.copy()
     remove_extra_arguments(pa_ds.write_dataset, write_ds_options)
+    apply_write_mode(ds, fs, path, write_ds_options)
+    target_size = kwargs.get("target_file_size", TARGET_FILE_SIZE)
+    _set_file_size_options(tbl, target_size, write_ds_options)
+    if is_sorted_write(ds):
+        # writing with threads does not preserve the row order
+        write_ds_options.setdefault("use_threads", False)
+
+    # collect the written files for the Parquet summary files and sidecar index
+    written: list[pa_ds.WrittenFile] = []
+    is_parquet = isinstance(pa_fmt, pa_ds.ParquetFileFormat)
+    write_metadata = is_parquet and kwargs.get("write_metadata", False)
+    write_index = ds.partition_by and kwargs.get("write_index", False)
+    if write_metadata or write_index:
+        write_ds_options["file_visitor"] = written.append
 
     pa_ds.write_dataset(
         tbl,
@@ -203,3 +697,490 @@ def _write_dataset(
         file_options=file_options,
         **write_ds_options,
     )
+
+    behavior = write_ds_options.get("existing_data_behavior", "error")
+    keep_existing = behavior != "error"
+
+    # existing summary and index files would be out of date
+    if write_index:
+        write_stats_index(fs, path, ds, tbl.schema, written, keep_existing, tbl)
+    elif ds.partition_by:
+        remove_index(fs, path)
+
+    if write_metadata:
+        write_parquet_summary(fs, path, written, keep_existing)
+    elif is_parquet:
+        remove_parquet_summary(fs, path)
+
+    if ds.partition_by:
+        update_write_marker(ds, fs, path)
+
+
+def _set_file_size_options(tbl: pa.Table, target_size, options: dict) -> None:
+    """Set defaults for the file and row group size `write_dataset` options.
+
+    Unless `max_rows_per_file` is provided, we estimate it from the average row size
+    of the Arrow data, so files have about `target_size` bytes in memory. Encoded and
+    compressed files are usually smaller. Row groups are kept large enough for
+    efficient scans, even when partitions receive small batches.
+    """
+    if "max_rows_per_file" not in options and target_size and tbl.num_rows:
+        row_size = max(tbl.nbytes / tbl.num_rows, 1)
+        options["max_rows_per_file"] = max(int(target_size / row_size), 1)
+    set_row_group_options(options)
+
+
+def set_row_group_options(options: dict) -> None:
+    """Set defaults for the row group size `write_dataset` options."""
+    # zero means no limit, row groups cannot be larger than files
+    max_rows = options.get("max_rows_per_file") or MAX_ROWS_PER_GROUP
+    options.setdefault("max_rows_per_group", min(MAX_ROWS_PER_GROUP, max_rows))
+    max_group = options["max_rows_per_group"]
+    options.setdefault("min_rows_per_group", min(MIN_ROWS_PER_GROUP, max_group))
+
+
+def apply_write_mode(ds: Dataset, fs, path: str, options: dict) -> None:
+    """Set the `write_dataset` options implementing the dataset `write_mode`."""
+    if ds.write_mode is None:
+        return
+
+    check_write_mode(ds, fs, path)
+    options["existing_data_behavior"] = EXISTING_DATA_BEHAVIOR[ds.write_mode]
+
+    if ds.write_mode == "overwrite" and fs.exists(path):
+        fs.rm(path, recursive=True)
+    elif ds.write_mode == "append":
+        # unique file names, so we never replace existing files
+        ext = get_extension(ds.format)
+        token = uuid.uuid4().hex[:8]
+        options.setdefault("basename_template", f"part-{token}-{{i}}.{ext}")
+
+
+def write_stats_index(
+    fs,
+    path: str,
+    ds: Dataset,
+    schema: pa.Schema,
+    written: list,
+    keep_existing: bool,
+    tbl: pa.Table | None = None,
+) -> None:
+    """Write the sidecar index with the stats of the written files.
+
+    The written table, if available, tells which float columns hold no NaN, keeping
+    their Parquet footer statistics.
+    """
+    kwargs = dict()
+    kwargs.update(ds.args)
+    kwargs.update(ds.write_args)
+    columns = get_index_columns(schema, kwargs["write_index"], ds.partition_by)
+    nan_free = nan_free_columns(tbl, columns) if tbl is not None else set()
+
+    root = path.rstrip("/")
+    rows = []
+    for entry in written:
+        file = entry.path[len(root) + 1 :]
+        if entry.metadata is not None:
+            # Parquet footer statistics
+            rows += parquet_stats(file, entry.metadata, columns, nan_free)
+        else:
+            rows += feather_stats(fs, entry.path, file, columns)
+
+    write_index(fs, path, get_index_schema(schema, columns), rows, keep_existing)
+
+
+def write_parquet_summary(fs, path: str, written: list, keep_existing: bool) -> None:
+    """Write the `_metadata` and `_common_metadata` files for a Parquet dataset.
+
+    Args:
+        fs: The dataset filesystem.
+        path: The dataset root path.
+        written: The `pyarrow.dataset.WrittenFile` entries for the new files.
+        keep_existing: If other data files may exist, include their metadata. This
+            requires reading their footers.
+    """
+    path = path.rstrip("/")
+    metadata = {}
+    for entry in written:
+        md = entry.metadata
+        md.set_file_path(entry.path[len(path) + 1 :])
+        metadata[entry.path] = md
+
+    if keep_existing:
+        for file in list_data_files(fs, path):
+            if file not in metadata:
+                with fs.open(file, "rb") as fo:
+                    md = pq.read_metadata(fo)
+                md.set_file_path(file[len(path) + 1 :])
+                metadata[file] = md
+
+    if not metadata:
+        return
+
+    mds = [metadata[file] for file in sorted(metadata)]
+    summary = mds[0]
+    try:
+        for md in mds[1:]:
+            summary.append_row_groups(md)
+    except RuntimeError as ex:
+        # eg. files with different schemas, readers will list the files instead
+        logger.warning(f"Cannot write Parquet summary files at '{path}': {ex}")
+        remove_parquet_summary(fs, path)
+        return
+
+    schema = summary.schema.to_arrow_schema()
+    pq.write_metadata(schema, f"{path}/{PARQUET_COMMON_METADATA_FILE}", filesystem=fs)
+    with fs.open(f"{path}/{PARQUET_METADATA_FILE}", "wb") as fo:
+        summary.write_metadata_file(fo)
+
+
+def remove_parquet_summary(fs, path: str) -> None:
+    """Remove the Parquet summary files, if present."""
+    for name in (PARQUET_METADATA_FILE, PARQUET_COMMON_METADATA_FILE):
+        file = f"{path.rstrip('/')}/{name}"
+        if fs.exists(file):
+            fs.rm(file)
+
+
+@dispatch
+def to_arrow(data) -> pa.Table:
+    """Convert a dataframe-like object to a `pyarrow.Table`.
+
+    Backends register their own dataframe types.
+    """
+    from . import load_backends
+
+    # backends register their methods on import, retry if any was loaded
+    if load_backends():
+        return to_arrow(data)
+
+    raise TypeError(f"Cannot convert type {type(data)} to an Arrow table")
+
+
+@dispatch
+def to_arrow(data: pa.Table) -> pa.Table:
+    return data
+
+
+@dispatch
+def to_arrow(data: pa.RecordBatch) -> pa.Table:
+    return pa.Table.from_batches([data])
+
+
+@dispatch
+def open_dataset_writer(*args, **kwargs) -> "DatasetWriter":
+    """Open a streaming writer for a Parquet or Feather dataset.
+
+    See [DatasetWriter][] for details. Use it as a context manager:
+
+        with open_dataset_writer("raw", "customers") as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+    return open_dataset_writer(get_dataset(*args, **kwargs))
+
+
+@dispatch
+def open_dataset_writer(ds: Dataset) -> "DatasetWriter":
+    return DatasetWriter(ds)
+
+
+class DatasetWriter:
+    """Incrementally write a Parquet or Feather dataset with bounded memory.
+
+    Each call to `write` appends the data as new row groups (or record batches for
+    Feather), so only the current chunk is held in memory. Chunks can be Arrow tables,
+    record batches or any dataframe supported by `to_arrow`. The first chunk defines
+    the schema and the following chunks are cast to it.
+
+    For partitioned datasets, chunks are split by the `partition_by` columns and
+    written in the "Hive" layout, keeping up to `max_open_files` files open.
+
+    Data is written to a temporary location, next to the (staging aware) dataset
+    location, and only moved in place by `commit`. When used as a context manager, we
+    commit on success and `abort` on errors, removing the temporary data.
+
+    Existing data is handled according to the dataset `write_mode`. If not set, it is
+    replaced for single-file datasets. For partitioned datasets we then follow the
+    `existing_data_behavior` writer argument of `pyarrow.dataset.write_dataset`,
+    defaulting to `"error"`.
+
+    The `write_index` writer argument is supported for partitioned datasets, with one
+    index entry per chunk written to a file, see `gamma.io._index`. The rows of each
+    chunk are sorted by the dataset `sort_by` and `zorder_by` columns, if set.
+    """
+
+    def __init__(self, ds: Dataset) -> None:
+        if ds.format != "parquet" and ds.format not in FEATHER_STRINGS:
+            msg = f"Streaming writes not supported for format '{ds.format}'"
+            raise DatasetException(msg, ds)
+
+        self.ds = ds
+        self.fs, self.path = get_stage_writer_fs_path(ds)
+        self.schema: pa.Schema | None = None
+
+        kwargs = dict()
+        kwargs.update(ds.args)
+        kwargs.update(ds.write_args)
+        self.existing_data_behavior = EXISTING_DATA_BEHAVIOR.get(
+            ds.write_mode, kwargs.get("existing_data_behavior", "error")
+        )
+        self.max_open_files = kwargs.get("max_open_files") or 64
+        self.file_options = _get_file_writer_options(ds, kwargs)
+        self.index_option = ds.partition_by and kwargs.get("write_index", False)
+
+        if ds.partition_by:
+            self._check_existing_data()
+        else:
+            self.path = _adjust_writer_path_arrow(ds, self.fs, self.path, ds.format)
+        check_write_mode(ds, self.fs, self.path)
+
+        parent, name = self.path.rstrip("/").rsplit("/", 1)
+        self.token = uuid.uuid4().hex[:8]
+        self.tmp_path = f"{parent}/.{name}.{self.token}.tmp"
+
+        self._writers: OrderedDict[str, _FileWriter] = OrderedDict()
+        self._counts: dict[str, int] = dict()
+        self._files: list[str] = []
+        self._index_rows: list[dict] = []
+        self._index_schema: pa.Schema | None = None
+        self.closed = False
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def write(self, data) -> None:
+        """Write a chunk of data."""
+        if self.closed:
+            raise ValueError("Writer is already closed.")
+
+        tbl = to_arrow(data)
+        if not self.ds.partition_by:
+            self._write_file("", self._cast(sort_table(tbl, self.ds)))
+            return
+
+        for partition_dir, part in _split_partitions(tbl, self.ds.partition_by):
+            part = part.drop_columns(self.ds.partition_by)
+            self._write_file(partition_dir, self._cast(sort_table(part, self.ds)))
+
+    def commit(self) -> None:
+        """Close the open files and move the data in place."""
+        if self.closed:
+            return
+
+        self._close_writers()
+        self.closed = True
+        fs = self.fs
+
+        if not self.ds.partition_by:
+            if not self._files:
+                # empty dataset, write the schema only
+                self._write_file("", (self.schema or pa.schema([])).empty_table())
+                self._close_writers()
+            if fs.exists(self.path):
+                fs.rm(self.path, recursive=True)
+            fs.makedirs(get_parent(self.path), exist_ok=True)
+            fs.mv(self.tmp_path, self.path)
+            return
+
+        root = self.path.rstrip("/") + "/"
+        if self.ds.format == "parquet":
+            remove_parquet_summary(fs, self.path)
+
+        if self.ds.write_mode == "overwrite" and fs.exists(self.path):
+            fs.rm(self.path, recursive=True)
+        elif self.existing_data_behavior == "delete_matching":
+            for partition_dir in set(get_parent(f) for f in self._files):
+                if fs.exists(root + partition_dir):
+                    fs.rm(root + partition_dir, recursive=True)
+
+        for rel_path in self._files:
+            dst = root + rel_path
+            fs.makedirs(get_parent(dst), exist_ok=True)
+            fs.mv(f"{self.tmp_path}/{rel_path}", dst)
+
+        if self.index_option and self._index_schema is not None:
+            keep_existing = self.existing_data_behavior != "error"
+            write_index(
+                fs, self.path, self._index_schema, self._index_rows, keep_existing
+            )
+        else:
+            remove_index(fs, self.path)
+
+        update_write_marker(self.ds, fs, self.path)
+
+        if fs.exists(self.tmp_path):
+            fs.rm(self.tmp_path, recursive=True)
+
+    def abort(self) -> None:
+        """Close the open files and discard the written data."""
+        if self.closed:
+            return
+
+        self._close_writers()
+        self.closed = True
+        if self.fs.exists(self.tmp_path):
+            self.fs.rm(self.tmp_path, recursive=True)
+
+    def _check_existing_data(self) -> None:
+        if self.existing_data_behavior != "error":
+            return
+        fs, path = self.fs, self.path
+        if fs.exists(path) and fs.find(path):
+            msg = (
+                f"Dataset {self.ds.layer}.{self.ds.name} location '{path}' is not "
+                "empty. Set the dataset 'write_mode' or the 'existing_data_behavior' "
+                "writer argument to write anyway."
+            )
+            raise DatasetException(msg, self.ds)
+
+    def _cast(self, tbl: pa.Table) -> pa.Table:
+        if self.schema is None:
+            self.schema = tbl.schema
+        elif tbl.schema != self.schema:
+            tbl = tbl.select(self.schema.names).cast(self.schema)
+        return tbl
+
+    def _write_file(self, partition_dir: str, tbl: pa.Table) -> None:
+        writer = self._writers.get(partition_dir)
+        if writer is None:
+            writer = self._open_writer(partition_dir, tbl.schema)
+        self._writers.move_to_end(partition_dir)
+        writer.write(tbl)
+
+        if self.index_option:
+            self._index_chunk(writer, tbl)
+
+    def _index_chunk(self, writer: "_FileWriter", tbl: pa.Table) -> None:
+        if self._index_schema is None:
+            option, partition_by = self.index_option, self.ds.partition_by
+            self._index_columns = get_index_columns(tbl.schema, option, partition_by)
+            self._index_schema = get_index_schema(tbl.schema, self._index_columns)
+        row = table_stats(writer.rel_path, writer.chunks, tbl, self._index_columns)
+        self._index_rows.append(row)
+        writer.chunks += 1
+
+    def _open_writer(self, partition_dir: str, schema: pa.Schema) -> "_FileWriter":
+        # keep the number of open files bounded
+        while len(self._writers) >= self.max_open_files:
+            _, oldest = self._writers.popitem(last=False)
+            oldest.close()
+
+        if self.ds.partition_by:
+            count = self._counts.get(partition_dir, 0)
+            self._counts[partition_dir] = count + 1
+            ext = get_extension(self.ds.format)
+            rel_path = f"{partition_dir}/part-{self.token}-{count}.{ext}"
+            path = f"{self.tmp_path}/{rel_path}"
+        else:
+            rel_path = ""
+            path = self.tmp_path
+
+        self.fs.makedirs(get_parent(path), exist_ok=True)
+        if self.ds.format == "parquet":
+            writer = _ParquetFileWriter(self.fs, path, schema, self.file_options)
+        else:
+            writer = _FeatherFileWriter(self.fs, path, schema, self.file_options)
+
+        writer.rel_path = rel_path
+        self._writers[partition_dir] = writer
+        self._files.append(rel_path)
+        return writer
+
+    def _close_writers(self) -> None:
+        while self._writers:
+            _, writer = self._writers.popitem()
+            writer.close()
+
+
+class _FileWriter:
+    rel_path: str = ""
+    chunks: int = 0
+
+    def write(self, tbl: pa.Table) -> None:  # pragma: no cover
+        raise NotImplementedError()
+
+    def close(self) -> None:  # pragma: no cover
+        raise NotImplementedError()
+
+
+class _ParquetFileWriter(_FileWriter):
+    def __init__(self, fs, path: str, schema: pa.Schema, options: dict) -> None:
+        options = options.copy()
+        self.row_group_size = options.pop("row_group_size", None)
+        self.writer = pq.ParquetWriter(path, schema, filesystem=fs, **options)
+
+    def write(self, tbl: pa.Table) -> None:
+        self.writer.write_table(tbl, row_group_size=self.row_group_size)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _FeatherFileWriter(_FileWriter):
+    def __init__(self, fs, path: str, schema: pa.Schema, options: dict) -> None:
+        self.sink = fs.open(path, "wb")
+        self.writer = pa.ipc.new_file(self.sink, schema, options=options["options"])
+        self.chunksize = options.get("chunksize")
+
+    def write(self, tbl: pa.Table) -> None:
+        self.writer.write_table(tbl, max_chunksize=self.chunksize)
+
+    def close(self) -> None:
+        self.writer.close()
+        self.sink.close()
+
+
+def _get_file_writer_options(ds: Dataset, kwargs: dict) -> dict:
+    """Return the arguments for the file writers from the dataset arguments."""
+    if ds.format == "parquet":
+        options = kwargs.copy()
+        remove_extra_arguments(pq.ParquetWriter.__init__, options)
+        for key in ("self", "where", "schema", "filesystem"):
+            options.pop(key, None)
+        if "row_group_size" in kwargs:
+            options["row_group_size"] = kwargs["row_group_size"]
+        return options
+
+    # feather defaults to uncompressed data, as in `write_feather`
+    compression = kwargs.get("compression")
+    if compression == "uncompressed":
+        compression = None
+    ipc_options = pa.ipc.IpcWriteOptions(compression=compression)
+    return {"options": ipc_options, "chunksize": kwargs.get("chunksize")}
+
+
+def _split_partitions(
+    tbl: pa.Table, partition_by: list[str]
+) -> Iterator[tuple[str, pa.Table]]:
+    """Split a table by the partition columns values.
+
+    Yield `(partition_dir, table)` tuples, where `partition_dir` is the relative
+    "Hive" style path (eg. `l1=A/l2=B`).
+    """
+    idx_col = "__gamma_io_row_idx"
+    indexed = tbl.select(partition_by).append_column(
+        idx_col, pa.array(range(len(tbl)), pa.int64())
+    )
+    groups = indexed.group_by(partition_by).aggregate([(idx_col, "list")])
+
+    keys = groups.select(partition_by).to_pylist()
+    indices = groups.column(f"{idx_col}_list").to_pylist()
+    for key, idx in zip(keys, indices):
+        partition_dir = "/".join(
+            f"{col}={encode_partition_value(val)}" for col, val in key.items()
+        )
+        yield partition_dir, tbl.take(idx)
+
+
+def encode_partition_value(val) -> str:
+    """Encode a partition value as `pyarrow` "Hive" partitioning does."""
+    if val is None:
+        return HIVE_NULL_FALLBACK
+    return quote(str(val), safe="")
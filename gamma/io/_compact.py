@@ -0,0 +1,285 @@
+"""Module implementing small-file compaction for partitioned Arrow datasets.
+
+Appending to partitioned datasets leaves many small files in each partition, slowing
+down every read and listing. `compact_dataset` rewrites the partitions holding more
+files than needed for their size into files of about `target_size` bytes.
+
+Partitions are compacted in parallel. The new files of a partition are written to a
+temporary folder next to the dataset location, then swapped with the partition folder.
+Readers may briefly miss a partition during the swap, but never see duplicated rows.
+The swap is only atomic on filesystems supporting folder renames (eg. local); on
+object stores files are copied and readers may see the partition half moved.
+
+Concurrent writes to the compacted partitions are not supported.
+"""
+
+import logging
+import math
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+import pyarrow as pa
+import pyarrow.dataset as pa_ds
+import pyarrow.parquet as pq
+
+from . import dispatch
+from ._arrow import (
+    TARGET_FILE_SIZE,
+    encode_partition_value,
+    get_partitions_path,
+    remove_parquet_summary,
+    set_row_group_options,
+    write_parquet_summary,
+    write_stats_index,
+)
+from ._dataset import get_dataset, get_extension
+from ._discovery import update_write_marker
+from ._staging import get_stage_writer_fs_path
+from ._types import FEATHER_STRINGS, Dataset, PartitionException
+from ._utils import func_arguments, get_parent, list_data_files
+
+logger = logging.getLogger("gamma.io")
+
+
+class CompactionInfo(NamedTuple):
+    """Statistics for a `compact_dataset` run."""
+
+    partitions: int
+    removed_files: int
+    written_files: int
+
+
+@dispatch
+def compact_dataset(
+    *args,
+    target_size: int | None = None,
+    partitions: dict | list[dict] | None = None,
+    max_workers: int | None = None,
+    **kwargs,
+) -> CompactionInfo:
+    """Rewrite the small files of a partitioned Parquet or Feather dataset.
+
+    Args:
+        *args: The dataset, or the arguments for `get_dataset`.
+        target_size: The target file size in bytes. Defaults to the
+            `target_file_size` writer argument, or `TARGET_FILE_SIZE`.
+        partitions: The partition values to compact (eg. `{"l1": "A"}`), or a list of
+            them. Defaults to all partitions.
+        max_workers: The max number of partitions compacted concurrently.
+        **kwargs: Extra arguments for `get_dataset`. Known partition values (eg.
+            `l1="A"`) also restrict the compacted partitions.
+
+    Returns: The number of compacted partitions and of removed and written files.
+    """
+    ds = get_dataset(*args, **kwargs)
+    return compact_dataset(
+        ds, target_size=target_size, partitions=partitions, max_workers=max_workers
+    )
+
+
+@dispatch
+def compact_dataset(
+    ds: Dataset,
+    target_size: int | None = None,
+    partitions: dict | list[dict] | None = None,
+    max_workers: int | None = None,
+) -> CompactionInfo:
+    if not ds.partition_by:
+        msg = f"Dataset {ds.layer}/{ds.name} does not declare `partition_by`"
+        raise PartitionException(msg, ds)
+    if ds.format != "parquet" and ds.format not in FEATHER_STRINGS:
+        msg = f"Compaction not supported for format '{ds.format}'"
+        raise PartitionException(msg, ds)
+
+    kwargs = dict()
+    kwargs.update(ds.args)
+    kwargs.update(ds.write_args)
+    if target_size is None:
+        target_size = kwargs.get("target_file_size") or TARGET_FILE_SIZE
+
+    fs, path = get_stage_writer_fs_path(ds)
+    path = path.rstrip("/")
+    groups = _get_compaction_groups(ds, fs, path, partitions, target_size)
+    if not groups:
+        return CompactionInfo(0, 0, 0)
+
+    # summary files would point to removed files
+    is_parquet = ds.format == "parquet"
+    if is_parquet:
+        remove_parquet_summary(fs, path)
+
+    compactor = _PartitionCompactor(ds, fs, path, target_size, kwargs)
+    tmp_path = compactor.tmp_path
+
+    try:
+        with ThreadPoolExecutor(max_workers) as executor:
+            results = list(executor.map(compactor.compact, groups.items()))
+    finally:
+        if fs.exists(tmp_path):
+            fs.rm(tmp_path, recursive=True)
+
+    written = [entry for result in results for entry in result]
+    if kwargs.get("write_index"):
+        schema = pa.unify_schemas([compactor.schemas[d] for d in groups])
+        write_stats_index(fs, path, ds, schema, written, keep_existing=True)
+    if is_parquet and kwargs.get("write_metadata"):
+        write_parquet_summary(fs, path, written, keep_existing=True)
+    update_write_marker(ds, fs, path)
+
+    info = CompactionInfo(
+        partitions=len(groups),
+        removed_files=sum(len(files) for files in groups.values()),
+        written_files=len(written),
+    )
+    logger.info(f"Compacted dataset {ds.layer}.{ds.name}: {info}")
+    return info
+
+
+def _get_compaction_groups(
+    ds: Dataset, fs, path: str, partitions, target_size: int
+) -> dict[str, dict[str, int]]:
+    """Return the `{partition_dir: {file: size}}` of the partitions to compact.
+
+    A partition is compacted if it has more files than needed for its total size.
+    """
+    if isinstance(partitions, dict):
+        partitions = [partitions]
+    selections = [_get_partition_folders(ds, p) for p in partitions or [{}]]
+
+    # narrow the listing down to the leading known partitions
+    root = get_partitions_path(ds, path)
+    known = _get_partition_folders(ds, ds.partitions)
+
+    depth = len(ds.partition_by)
+    groups: dict[str, dict[str, int]] = {}
+    for file, info in list_data_files(fs, root, path).items():
+        parts = file[len(path) :].strip("/").split("/")
+        if len(parts) != depth + 1:
+            continue
+        if not _matches(parts, known):
+            continue
+        if not any(_matches(parts, selection) for selection in selections):
+            continue
+        partition_dir = "/".join(parts[:-1])
+        groups.setdefault(partition_dir, {})[file] = info.get("size") or 0
+
+    return {
+        partition_dir: files
+        for partition_dir, files in groups.items()
+        if len(files) > math.ceil(sum(files.values()) / target_size)
+    }
+
+
+def _get_partition_folders(ds: Dataset, values: dict) -> dict[int, str]:
+    """Return the expected folder name at each level for the partition values."""
+    unknown = set(values) - set(ds.partition_by)
+    if unknown:
+        msg = f"Unknown partition columns for {ds.layer}/{ds.name}: {sorted(unknown)}"
+        raise PartitionException(msg, ds)
+
+    return {
+        i: f"{col}={encode_partition_value(values[col])}"
+        for i, col in enumerate(ds.partition_by)
+        if col in values
+    }
+
+
+def _matches(parts: list[str], folders: dict[int, str]) -> bool:
+    return all(parts[i] == folder for i, folder in folders.items())
+
+
+class _PartitionCompactor:
+    """Rewrite and swap in the files of a single partition, thread safe."""
+
+    def __init__(
+        self, ds: Dataset, fs, path: str, target_size: int, kwargs: dict
+    ) -> None:
+        self.fs = fs
+        self.path = path
+        self.target_size = target_size
+
+        # temporary folder next to the dataset location, hidden from readers
+        parent, name = path.rsplit("/", 1)
+        self.token = uuid.uuid4().hex[:8]
+        self.tmp_path = f"{parent}/.{name}.{self.token}.tmp"
+        self.ext = get_extension(ds.format)
+        self.schemas: dict[str, pa.Schema] = {}
+
+        if ds.format == "parquet":
+            self.format = pa_ds.ParquetFileFormat()
+            options_set = func_arguments(pq.write_table)
+        else:
+            # feather defaults to uncompressed data, as in `write_feather`
+            self.format = pa_ds.IpcFileFormat()
+            options_set = func_arguments(pq.ParquetWriter.__init__)
+            options_set -= {"self", "where", "schema"}
+            kwargs = {"compression": "uncompressed", **kwargs}
+
+        writer_args = {k: v for k, v in kwargs.items() if k in options_set}
+        self.file_options = self.format.make_write_options(**writer_args)
+
+    def compact(self, item: tuple[str, dict[str, int]]) -> list[pa_ds.WrittenFile]:
+        """Compact the partition files, returning the written files."""
+        partition_dir, files = item
+        fs = self.fs
+
+        # files may have evolved schemas, unify them as a table concat would do
+        dataset = pa_ds.dataset(list(files), format=self.format, filesystem=fs)
+        fragments = list(dataset.get_fragments())
+        schema = pa.unify_schemas([f.physical_schema for f in fragments])
+        dataset = pa_ds.dataset(
+            list(files), schema=schema, format=self.format, filesystem=fs
+        )
+        self.schemas[partition_dir] = schema
+
+        num_files = math.ceil(sum(files.values()) / self.target_size)
+        options = {"max_rows_per_file": math.ceil(dataset.count_rows() / num_files)}
+        set_row_group_options(options)
+
+        written: list[pa_ds.WrittenFile] = []
+        new_dir = f"{self.tmp_path}/new/{partition_dir}"
+        pa_ds.write_dataset(
+            dataset,
+            new_dir,
+            format=self.format,
+            filesystem=fs,
+            file_options=self.file_options,
+            basename_template=f"part-{self.token}-{{i}}.{self.ext}",
+            existing_data_behavior="error",
+            file_visitor=written.append,
+            **options,
+        )
+
+        self._swap(partition_dir, new_dir, files)
+
+        # report the final paths
+        return [
+            pa_ds.WrittenFile(
+                f"{self.path}/{partition_dir}/{entry.path.rsplit('/', 1)[-1]}",
+                entry.metadata,
+                entry.size,
+            )
+            for entry in written
+        ]
+
+    def _swap(self, partition_dir: str, new_dir: str, files: Iterable[str]) -> None:
+        fs = self.fs
+        current_dir = f"{self.path}/{partition_dir}"
+        old_dir = f"{self.tmp_path}/old/{partition_dir}"
+
+        fs.makedirs(get_parent(old_dir), exist_ok=True)
+        fs.mv(current_dir, old_dir, recursive=True)
+        try:
+            fs.mv(new_dir, current_dir, recursive=True)
+        except Exception:
+            fs.mv(old_dir, current_dir, recursive=True)
+            raise
+
+        # keep files not read for compaction, eg. hidden files
+        compacted = {f[len(current_dir) :] for f in files}
+        for file in fs.find(old_dir):
+            if file[len(old_dir) :] not in compacted:
+                fs.mv(file, current_dir + file[len(old_dir) :])
+        fs.rm(old_dir, recursive=True)
@@ -0,0 +1,54 @@
+"""Module implementing streaming conversions between dataset formats.
+
+Vendor drops often come as large (compressed) CSV or JSON lines files, too big to
+load in memory. `convert_dataset` reads the source dataset in chunks and writes them
+to a Parquet or Feather target with a `DatasetWriter`, so memory usage is bounded by
+the chunk size. Target datasets can be partitioned.
+"""
+
+import logging
+from collections.abc import Iterator
+
+from . import dispatch
+from ._arrow import iter_arrow, open_dataset_writer
+from ._pandas import iter_pandas
+from ._types import FEATHER_STRINGS, Dataset
+
+logger = logging.getLogger("gamma.io")
+
+
+@dispatch
+def convert_dataset(src: Dataset, dst: Dataset, batch_size: int | None = None) -> int:
+    """Convert a dataset into a Parquet or Feather dataset, chunk by chunk.
+
+    CSV and JSON lines sources are read with `iter_pandas`, so the source reader
+    arguments apply (eg. `compression`, `dtype`, `lines: true` for JSON). Parquet
+    and Feather sources are read as record batches. The target is written following
+    its `write_mode`, see `gamma.io._arrow.DatasetWriter`, and only replaces existing
+    data once all chunks are written.
+
+    Args:
+        src: The source dataset.
+        dst: The target Parquet or Feather dataset.
+        batch_size: The max number of rows per chunk. Defaults to the source
+            `chunksize` (text) or `batch_size` (Arrow) reader arguments.
+
+    Returns: The number of rows written.
+    """
+    rows = 0
+    with open_dataset_writer(dst) as writer:
+        for chunk in _iter_chunks(src, batch_size):
+            writer.write(chunk)
+            rows += len(chunk)
+
+    logger.info(
+        f"Converted dataset {src.layer}.{src.name} into {dst.layer}.{dst.name}: "
+        f"{rows} rows"
+    )
+    return rows
+
+
+def _iter_chunks(ds: Dataset, batch_size: int | None) -> Iterator:
+    if ds.format == "parquet" or ds.format in FEATHER_STRINGS:
+        return iter_arrow(ds, batch_size)
+    return iter_pandas(ds, batch_size=batch_size)
@@ -2,12 +2,16 @@
 
 
 import logging
-from typing import Literal, Tuple
+import threading
+from collections import OrderedDict
+from typing import Literal, NamedTuple, Tuple
 
 import fsspec
 
 from . import dispatch
 from ._types import Dataset
+from ._utils import freeze
+from .config import add_config_change_hook, check_config_change
 
 # type alias
 FSPathType = Tuple[fsspec.AbstractFileSystem, str]
@@ -15,6 +19,25 @@ FSPathType = Tuple[fsspec.AbstractFileSystem, str]
 logger = logging.getLogger("gamma.io")
 
 
+class DatasetCacheInfo(NamedTuple):
+    """Statistics for the `get_dataset` resolution cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+#: Max number of resolved datasets to keep in the cache
+DATASET_CACHE_MAXSIZE = 1024
+
+# Resolved datasets cache, keyed by (layer, name, frozen kwargs)
+_DATASET_CACHE: OrderedDict[tuple, Dataset] = OrderedDict()
+_DATASET_CACHE_LOCK = threading.Lock()
+_DATASET_CACHE_HITS = 0
+_DATASET_CACHE_MISSES = 0
+
+
 def get_dataset(
     layer: str,
     name: str,
@@ -46,11 +69,80 @@ def get_dataset(
     from staging and, if not data is available, it will read from the original dataset
     location.
 
+    **Caching behavior**
+
+    Resolved datasets are cached by `(layer, name, kwargs)` and each call returns a
+    fresh copy, so it's safe to modify the returned object. The cache is invalidated
+    when the configuration is reloaded. Use [clear_dataset_cache][] if you change the
+    configuration by other means.
+
     Args:
         layer: The layer name
         name: The dataset name
         **kwargs: See above
     """
+    global _DATASET_CACHE_HITS, _DATASET_CACHE_MISSES
+
+    key = _dataset_cache_key(layer, name, kwargs)
+    if key is not None:
+        check_config_change()
+        with _DATASET_CACHE_LOCK:
+            dataset = _DATASET_CACHE.get(key)
+            if dataset is not None:
+                _DATASET_CACHE_HITS += 1
+                _DATASET_CACHE.move_to_end(key)
+                return dataset.model_copy(deep=True)
+
+    dataset = _build_dataset(layer, name, kwargs)
+
+    with _DATASET_CACHE_LOCK:
+        _DATASET_CACHE_MISSES += 1
+        if key is not None and DATASET_CACHE_MAXSIZE > 0:
+            _DATASET_CACHE[key] = dataset.model_copy(deep=True)
+            while len(_DATASET_CACHE) > DATASET_CACHE_MAXSIZE:
+                _DATASET_CACHE.popitem(last=False)
+
+    return dataset
+
+
+def clear_dataset_cache() -> None:
+    """Clear the `get_dataset` resolution cache and its statistics."""
+    global _DATASET_CACHE_HITS, _DATASET_CACHE_MISSES
+
+    with _DATASET_CACHE_LOCK:
+        _DATASET_CACHE.clear()
+        _DATASET_CACHE_HITS = 0
+        _DATASET_CACHE_MISSES = 0
+
+
+def get_dataset_cache_info() -> DatasetCacheInfo:
+    """Return hit/miss statistics for the `get_dataset` resolution cache."""
+    with _DATASET_CACHE_LOCK:
+        return DatasetCacheInfo(
+            hits=_DATASET_CACHE_HITS,
+            misses=_DATASET_CACHE_MISSES,
+            maxsize=DATASET_CACHE_MAXSIZE,
+            currsize=len(_DATASET_CACHE),
+        )
+
+
+@add_config_change_hook
+def _invalidate_dataset_cache() -> None:
+    """Drop cached datasets, keeping the statistics."""
+    with _DATASET_CACHE_LOCK:
+        _DATASET_CACHE.clear()
+
+
+def _dataset_cache_key(layer: str, name: str, kwargs: dict) -> tuple | None:
+    """Return a hashable cache key or `None` if kwargs cannot be hashed."""
+    try:
+        return (layer, name, freeze(kwargs))
+    except TypeError:
+        return None
+
+
+def _build_dataset(layer: str, name: str, kwargs: dict) -> Dataset:
+    """Resolve the configuration and instantiate a `Dataset`."""
     cfg, _ = _resolve_ds_config(layer, name, kwargs)
 
     fields = set(Dataset.model_fields)
@@ -80,12 +172,24 @@ def get_dataset(
 
 
 @dispatch
-def read_dataset(cls, *args, **kwargs):  # pragma: no cover
+def read_dataset(cls, *args, **kwargs):
+    from . import load_backends
+
+    # backends register their methods on import, retry if any was loaded
+    if load_backends():
+        return read_dataset(cls, *args, **kwargs)
+
     raise NotImplementedError(f"Cannot read dataset returning type {cls}")
 
 
 @dispatch
-def write_dataset(data, *args, **kwargs):  # pragma: no cover
+def write_dataset(data, *args, **kwargs):
+    from . import load_backends
+
+    # backends register their methods on import, retry if any was loaded
+    if load_backends():
+        return write_dataset(data, *args, **kwargs)
+
     raise NotImplementedError(f"Cannot write dataset with input type {type(data)}")
 
 
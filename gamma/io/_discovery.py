@@ -0,0 +1,181 @@
+"""Module implementing a cache for the file discovery of Arrow datasets.
+
+Opening a partitioned (or multi-file) Parquet/Feather dataset lists every file and
+infers the schema, which is the dominant cost of reading remote datasets repeatedly.
+We cache the discovered `pyarrow` dataset per location, holding the file paths,
+partition expressions and schema, so later reads skip the listing. Datasets are
+immutable, so they're safely shared between reads and threads.
+
+The cache is enabled per dataset with the `discovery_cache: true` or `discovery_ttl`
+reader arguments.
+Entries are validated on every read:
+
+- Writes through `gamma.io` to datasets enabling the cache store a random token in a
+  `_gamma_io_write` marker file at the dataset root. Cached entries are valid while
+  the token is unchanged, costing a single small read. Other writers must remove the
+  marker file, or readers will miss their changes.
+- With the `discovery_ttl` reader argument, entries also expire after the given
+  number of seconds. Datasets without a marker are only cached with a TTL.
+
+Use `clear_discovery_cache` to drop all entries.
+"""
+
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import NamedTuple
+
+import pyarrow.dataset as pa_ds
+
+from ._types import Dataset
+
+#: Marker file holding the token of the last write, ignored by readers as it starts
+#: with `_`
+WRITE_MARKER_FILE = "_gamma_io_write"
+
+#: Max number of cached dataset discoveries
+DISCOVERY_CACHE_MAXSIZE = 256
+
+_DISCOVERY_CACHE: OrderedDict[tuple, "_CacheEntry"] = OrderedDict()
+_DISCOVERY_CACHE_LOCK = threading.Lock()
+_DISCOVERY_CACHE_HITS = 0
+_DISCOVERY_CACHE_MISSES = 0
+
+
+class DiscoveryCacheInfo(NamedTuple):
+    """Statistics for the dataset discovery cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _CacheEntry(NamedTuple):
+    dataset: pa_ds.Dataset
+    format: object
+    token: bytes | None
+    expires: float
+
+
+def open_cached_dataset(
+    fs,
+    root: str,
+    key: tuple,
+    kwargs: dict,
+    discover: Callable[[], pa_ds.Dataset | None],
+) -> pa_ds.Dataset | None:
+    """Return the dataset from the cache, or call `discover` and cache the result.
+
+    Args:
+        fs: The `fsspec` filesystem.
+        root: The dataset root path, holding the write marker.
+        key: The cache key, unique for the location and discovery options.
+        kwargs: The reader arguments. The `format` must match the cached one.
+        discover: Function opening the dataset, listing the files. May return `None`,
+            which is not cached.
+    """
+    global _DISCOVERY_CACHE_HITS, _DISCOVERY_CACHE_MISSES
+
+    ttl = kwargs.get("discovery_ttl") or 0
+    if not kwargs.get("discovery_cache", ttl > 0):
+        return discover()
+
+    token = read_write_marker(fs, root)
+    if token is None and ttl <= 0:
+        return discover()
+
+    key = (fs.unstrip_protocol(root.rstrip("/")), *key)
+    with _DISCOVERY_CACHE_LOCK:
+        entry = _DISCOVERY_CACHE.get(key)
+        if entry is not None and _is_valid(entry, token, kwargs.get("format")):
+            _DISCOVERY_CACHE_HITS += 1
+            _DISCOVERY_CACHE.move_to_end(key)
+            return entry.dataset
+
+    dataset = discover()
+    if dataset is None:
+        return None
+
+    entry = _CacheEntry(
+        dataset=dataset,
+        format=kwargs.get("format"),
+        token=token,
+        expires=time.monotonic() + ttl if ttl > 0 else math.inf,
+    )
+
+    with _DISCOVERY_CACHE_LOCK:
+        _DISCOVERY_CACHE_MISSES += 1
+        if DISCOVERY_CACHE_MAXSIZE > 0:
+            _DISCOVERY_CACHE[key] = entry
+            while len(_DISCOVERY_CACHE) > DISCOVERY_CACHE_MAXSIZE:
+                _DISCOVERY_CACHE.popitem(last=False)
+
+    return dataset
+
+
+def _is_valid(entry: _CacheEntry, token: bytes | None, fmt) -> bool:
+    # the file format holds the read options of the dataset fragments
+    if isinstance(fmt, pa_ds.FileFormat) and isinstance(entry.format, pa_ds.FileFormat):
+        if not fmt.equals(entry.format):
+            return False
+    elif fmt != entry.format:
+        return False
+
+    return token == entry.token and time.monotonic() < entry.expires
+
+
+def read_write_marker(fs, root: str) -> bytes | None:
+    """Return the token of the last write to the dataset, or `None` if unknown."""
+    try:
+        return fs.cat_file(f"{root.rstrip('/')}/{WRITE_MARKER_FILE}")
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+def is_discovery_cached(ds: Dataset) -> bool:
+    """Return if the dataset reader arguments enable the discovery cache."""
+    kwargs = {**ds.args, **ds.read_args}
+    return bool(kwargs.get("discovery_cache") or kwargs.get("discovery_ttl"))
+
+
+def update_write_marker(ds: Dataset, fs, root: str) -> None:
+    """Store a new write token for the dataset, invalidating cached discoveries.
+
+    The marker is only written if the dataset enables the cache, or to keep an
+    existing marker up to date.
+    """
+    root = root.rstrip("/")
+    marker_path = f"{root}/{WRITE_MARKER_FILE}"
+    if is_discovery_cached(ds) or fs.exists(marker_path):
+        fs.pipe_file(marker_path, uuid.uuid4().hex.encode())
+
+    # entries of this process are dropped right away
+    location = fs.unstrip_protocol(root)
+    with _DISCOVERY_CACHE_LOCK:
+        for key in [k for k in _DISCOVERY_CACHE if k[0] == location]:
+            del _DISCOVERY_CACHE[key]
+
+
+def clear_discovery_cache() -> None:
+    """Clear the dataset discovery cache and its statistics."""
+    global _DISCOVERY_CACHE_HITS, _DISCOVERY_CACHE_MISSES
+
+    with _DISCOVERY_CACHE_LOCK:
+        _DISCOVERY_CACHE.clear()
+        _DISCOVERY_CACHE_HITS = 0
+        _DISCOVERY_CACHE_MISSES = 0
+
+
+def get_discovery_cache_info() -> DiscoveryCacheInfo:
+    """Return hit/miss statistics for the dataset discovery cache."""
+    with _DISCOVERY_CACHE_LOCK:
+        return DiscoveryCacheInfo(
+            hits=_DISCOVERY_CACHE_HITS,
+            misses=_DISCOVERY_CACHE_MISSES,
+            maxsize=DISCOVERY_CACHE_MAXSIZE,
+            currsize=len(_DISCOVERY_CACHE),
+        )
@@ -0,0 +1,157 @@
+"""Multiple dispatch with a fast path for value-based signatures.
+
+We dispatch on dataset format and protocol using `Literal` types (eg.
+`read_pandas(ds, fmt: Literal["parquet"], protocol)`). `plum` cannot cache the method
+resolution for such signatures, as the method depends on argument values rather than
+just types, so every call runs the full resolution.
+
+Here we wrap `plum` functions to cache resolved methods by argument types, plus the
+argument values on positions where some signature has an "unfaithful" type hint (eg.
+`Literal`, `Type`). Effectively this builds a `(format, protocol, ...) -> method`
+registry on first use. The cache is cleared when methods are registered through the
+dispatcher, so you can still extend functions like `read_pandas` with new formats
+using `gamma.io.dispatch`.
+
+Notes:
+    - Values are only considered for types allowed in `Literal` (eg. `str`, `int`,
+      `Enum`) and classes. Signatures depending on other values (eg. `beartype`
+      validators) are not supported.
+"""
+
+from enum import Enum
+from typing import Any, Callable
+
+import plum
+
+# Argument types that can be used as cache keys by value
+_VALUE_TYPES = (str, bytes, int, Enum, type(None), type)
+
+
+class Dispatcher(plum.Dispatcher):
+    """A `plum.Dispatcher` creating `FastFunction` wrappers.
+
+    We override the private `_add_method`, called by every registration path, so the
+    `plum-dispatch` version range is pinned in the project dependencies.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.fast_functions: dict[plum.Function, FastFunction] = {}
+
+    def _add_method(self, method, *signatures, precedence) -> "FastFunction":
+        f = super()._add_method(method, *signatures, precedence=precedence)
+        fast = self.fast_functions.get(f)
+        if fast is None:
+            fast = self.fast_functions[f] = FastFunction(f)
+        fast.clear_cache()
+        return fast
+
+    def clear_cache(self) -> None:
+        """Clear cache."""
+        super().clear_cache()
+        for fast in self.fast_functions.values():
+            fast.clear_cache()
+
+
+# Wraps a `plum.Function` caching the method resolution. Other attributes (eg.
+# `methods`, `invoke`) are delegated to the wrapped function. The docstring is the
+# wrapped function one, listing all methods, so it's not declared here.
+class FastFunction:
+    def __init__(self, f: plum.Function) -> None:
+        self.function = f
+        self.__name__ = f.__name__
+        self.__qualname__ = getattr(f, "__qualname__", f.__name__)
+        self.__module__ = getattr(f, "__module__", __name__)
+        self.clear_cache()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "function":  # pragma: no cover
+            raise AttributeError(name)
+        return getattr(self.function, name)
+
+    def __repr__(self) -> str:
+        return repr(self.function)
+
+    @property
+    def __doc__(self) -> str | None:
+        return self.function.__doc__
+
+    def register(self, f: Callable, signature=None, precedence=0) -> None:
+        """Register a method, see `plum.Function.register`."""
+        self.function.register(f, signature, precedence=precedence)
+        self.clear_cache()
+
+    def dispatch(self, method: Callable | None = None, precedence=0):
+        """Decorator registering a method, see `plum.Function.dispatch`."""
+        if method is None:
+            return lambda m: self.dispatch(m, precedence=precedence)
+
+        self.register(method, precedence=precedence)
+        return self
+
+    def dispatch_multi(self, *signatures) -> Callable:
+        """Decorator registering a method for several signatures."""
+
+        def decorator(method: Callable) -> "FastFunction":
+            self.function.dispatch_multi(*signatures)(method)
+            self.clear_cache()
+            return self
+
+        return decorator
+
+    def clear_cache(self) -> None:
+        """Drop resolved methods, call this after registering new methods."""
+        self._cache: dict[tuple, tuple[Callable, Any]] = {}
+        self._value_positions: dict[int, tuple[int, ...]] = {}
+
+    def resolve(self, *args) -> Callable:
+        """Return the method that would be called for `args`."""
+        method, _ = self._resolve(args)
+        return method
+
+    def __call__(self, *args, **kwargs):
+        method, return_type = self._resolve(args)
+        result = method(*args, **kwargs)
+        if return_type is Any:
+            return result
+        if isinstance(return_type, type) and isinstance(result, return_type):
+            return result
+        return plum.convert(result, return_type)
+
+    def _resolve(self, args: tuple) -> tuple[Callable, Any]:
+        positions = self._value_positions.get(len(args))
+        if positions is None:
+            positions = self._get_value_positions(len(args))
+
+        key = tuple(map(type, args))
+        if positions:
+            key += tuple(_value_key(args[i]) for i in positions)
+
+        try:
+            return self._cache[key]
+        except KeyError:
+            resolved = self._cache[key] = self.function.resolve_method(args)
+            return resolved
+
+    def _get_value_positions(self, nargs: int) -> tuple[int, ...]:
+        """Return argument positions where resolution depends on values."""
+        positions = set()
+        for signature in self.function.methods:
+            types = signature.types
+            if len(types) > nargs or (len(types) < nargs and not signature.has_varargs):
+                continue
+            for i in range(nargs):
+                hint = types[i] if i < len(types) else signature.varargs
+                if not plum.is_faithful(hint):
+                    positions.add(i)
+
+        positions = tuple(sorted(positions))
+        self._value_positions[nargs] = positions
+        return positions
+
+
+def _value_key(arg: Any) -> Any:
+    if isinstance(arg, _VALUE_TYPES):
+        return arg
+    # cannot be matched by value, the type is already part of the key
+    return None
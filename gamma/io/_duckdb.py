@@ -0,0 +1,199 @@
+"""IO support for DuckDB.
+
+`read_duckdb` returns a lazy `duckdb.DuckDBPyRelation` over the dataset files, so
+aggregations and joins run out-of-core in DuckDB, using all cores, instead of loading
+the whole dataset in a dataframe. Use `register_duckdb_views` to query several
+datasets with SQL:
+
+    import duckdb
+    from gamma.io import register_duckdb_views
+
+    con = duckdb.connect()
+    register_duckdb_views({"customers": ("raw", "customers")}, connection=con)
+    con.sql("SELECT cluster, count(*) FROM customers GROUP BY cluster").df()
+
+Parquet files are read by DuckDB, with "Hive" partitioning. Remote files are read
+through the dataset `fsspec` filesystem, registered in the connection. Feather/Arrow
+IPC datasets are scanned as `pyarrow` datasets. Without a `connection`, relations use
+the DuckDB default connection. Row filters are applied by DuckDB, so `pyarrow`
+expressions are not supported, see `gamma.io._filters`.
+"""
+
+import operator
+from collections.abc import Iterable
+from functools import reduce
+from typing import Literal, Type
+
+import duckdb
+import pyarrow.dataset as pa_ds
+from fsspec.implementations.local import LocalFileSystem
+
+from . import dispatch
+from ._dataset import get_dataset
+from ._staging import get_stage_reader_fs_path
+from ._types import ArrowFmt, Dataset
+
+Relation = duckdb.DuckDBPyRelation
+
+
+@dispatch
+def read_dataset(cls: Type[Relation], *args, **kwargs) -> Relation:
+    return read_duckdb(*args, **kwargs)
+
+
+@dispatch
+def read_dataset(cls: Type[Relation], ds: Dataset) -> Relation:
+    return read_duckdb(ds)
+
+
+@dispatch
+def read_duckdb(*args, connection=None, **kwargs) -> Relation:
+    """Return a DuckDB relation over a dataset.
+
+    Args:
+        *args: Positional arguments to `get_dataset`
+        connection: The `duckdb` connection. Defaults to the DuckDB default
+            connection.
+        **kwargs: Keyword arguments to `get_dataset`
+    """
+    return read_duckdb(get_dataset(*args, **kwargs), connection=connection)
+
+
+@dispatch
+def read_duckdb(ds: Dataset, connection=None) -> Relation:
+    """Return a DuckDB relation over a Parquet or Feather dataset.
+
+    Files are discovered as in `gamma.io._arrow.get_arrow_dataset`, skipping the
+    partitions not matching the dataset `partitions` and `filters`. Row filters and
+    the `columns` reader argument are applied to the relation.
+    """
+    con = duckdb if connection is None else connection
+    return read_duckdb(ds, ds.format, ds.protocol, connection=con)
+
+
+@dispatch
+def read_duckdb(ds: Dataset, fmt, protocol, connection=None) -> Relation:
+    """Fallback for formats not supported by DuckDB."""
+    raise NotImplementedError(f"Reading DuckDB format not supported yet: {fmt}")
+
+
+@dispatch
+def read_duckdb(
+    ds: Dataset, fmt: Literal["parquet"], protocol, connection=None
+) -> Relation:
+    """Read Parquet files with DuckDB."""
+    from ._arrow import get_arrow_dataset
+    from ._fs import get_protocol
+
+    fs, _ = get_stage_reader_fs_path(ds)
+    exprs, _filter = _get_filters(ds)
+
+    # skip files using partitions, index and summary as the pyarrow readers
+    dataset = get_arrow_dataset(ds, _filter)
+    files = [f.path for f in dataset.get_fragments(filter=_filter)]
+    if not files:
+        rel = connection.from_arrow(dataset.schema.empty_table())
+        return _apply_read_args(rel, ds, exprs)
+
+    if not isinstance(fs, LocalFileSystem):
+        # read through the dataset filesystem, with the same options
+        if not connection.filesystem_is_registered(get_protocol(fs)):
+            connection.register_filesystem(fs)
+        files = [fs.unstrip_protocol(f) for f in files]
+
+    rel = connection.read_parquet(files, hive_partitioning=bool(ds.partition_by))
+    return _apply_read_args(rel, ds, exprs)
+
+
+@dispatch
+def read_duckdb(ds: Dataset, fmt: ArrowFmt, protocol, connection=None) -> Relation:
+    """Scan Feather/Arrow IPC files as a `pyarrow` dataset."""
+    from ._arrow import get_arrow_dataset
+
+    exprs, _filter = _get_filters(ds)
+
+    # keep the files matching partitions, as for Parquet
+    dataset = get_arrow_dataset(ds, _filter)
+    dataset = pa_ds.FileSystemDataset(
+        list(dataset.get_fragments(filter=_filter)),
+        dataset.schema,
+        dataset.format,
+        dataset.filesystem,
+    )
+    rel = connection.from_arrow(dataset)
+    return _apply_read_args(rel, ds, exprs)
+
+
+def register_duckdb_views(
+    datasets: dict[str, Dataset | tuple[str, str]] | Iterable[Dataset],
+    connection=None,
+):
+    """Register datasets as DuckDB views, to query them together with SQL.
+
+    Args:
+        datasets: A `{view_name: dataset}` dict, where each dataset is a `Dataset`
+            or a `(layer, name)` tuple. Can also be a list of `Dataset`, registered
+            by dataset name.
+        connection: The `duckdb` connection. Defaults to the DuckDB default
+            connection.
+
+    Returns: The connection.
+    """
+    if not isinstance(datasets, dict):
+        datasets = {ds.name: ds for ds in datasets}
+
+    for view, ds in datasets.items():
+        if not isinstance(ds, Dataset):
+            ds = get_dataset(*ds)
+        read_duckdb(ds, connection=connection).create_view(view, replace=True)
+
+    return duckdb if connection is None else connection
+
+
+def _get_filters(ds: Dataset) -> tuple[list, object]:
+    """Return the row filter expressions and the `pyarrow` expression to skip files."""
+    from ._arrow import get_filter_expression
+    from ._filters import translate_filters
+
+    kwargs = {**ds.args, **ds.read_args}
+    specs = [ds.filters, kwargs.get("filter"), kwargs.get("filters")]
+    specs = [spec for spec in specs if spec is not None]
+    exprs = translate_filters(ds, specs, _duckdb_term, duckdb.Expression)
+    _filter = get_filter_expression(
+        ds, {"filter": kwargs.get("filter"), "filters": kwargs.get("filters")}
+    )
+    return exprs, _filter
+
+
+def _apply_read_args(rel: Relation, ds: Dataset, exprs: list) -> Relation:
+    """Apply the row filters and `columns` reader argument to the relation."""
+    # partitions are already pruned from the files
+    if exprs:
+        rel = rel.filter(reduce(operator.and_, exprs))
+
+    columns = {**ds.args, **ds.read_args}.get("columns")
+    if columns is not None:
+        rel = rel.project(*[duckdb.ColumnExpression(col) for col in columns])
+    return rel
+
+
+def _duckdb_term(column: str, op: str, value=None) -> duckdb.Expression:
+    """Return the DuckDB expression for a filter term, see `gamma.io._filters`."""
+    from ._filters import COMPARISONS
+
+    col = duckdb.ColumnExpression(column)
+
+    if op in COMPARISONS:
+        return COMPARISONS[op](col, duckdb.ConstantExpression(value))
+    if op == "in":
+        return col.isin(*[duckdb.ConstantExpression(v) for v in value])
+    if op == "not in":
+        return col.isnotin(*[duckdb.ConstantExpression(v) for v in value])
+    if op == "between":
+        low, high = value
+        return (col >= duckdb.ConstantExpression(low)) & (
+            col <= duckdb.ConstantExpression(high)
+        )
+    if op == "is null":
+        return col.isnull()
+    return col.isnotnull()
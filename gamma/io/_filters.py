@@ -0,0 +1,159 @@
+"""Module translating row filter specifications to `pyarrow` dataset expressions.
+
+Filters are pushed down to the Parquet/Feather readers, allowing `pyarrow` to skip
+partitions and Parquet row groups based on statistics. A filter spec can be:
+
+- A term, as a `(column, op, value)` tuple (or list, as in YAML config). Supported
+  `op` values are `=`, `==`, `!=`, `<`, `<=`, `>`, `>=`, `in`, `not in` and
+  `between` (value is a `[low, high]` inclusive range). The null checks `is null`
+  and `is not null` take no value, eg. `("col", "is null")`.
+- A list of specs, combined with AND.
+- A list of lists of specs, in disjunctive normal form (OR of ANDs), same as the
+  `filters` argument of `pyarrow.parquet.read_table`.
+- A dict with a single `and`, `or` (list of specs) or `not` (a spec) key.
+- A `pyarrow.compute.Expression`, used as is.
+
+The same specs are translated to Polars expressions by `scan_polars` and DuckDB
+expressions by `read_duckdb`, which do not support `pyarrow` expressions.
+
+Example:
+    read_pandas(
+        "raw",
+        "customers",
+        filters={
+            "or": [
+                [("Index", "between", [10, 20]), ("l1", "in", ["A", "B"])],
+                ("Email", "is null"),
+            ]
+        },
+    )
+"""
+
+import operator
+from collections.abc import Callable
+from functools import reduce
+
+import pyarrow.compute as pc
+
+from ._types import Dataset, DatasetException
+
+#: The comparison operators, as functions of the column and value expressions
+COMPARISONS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_NULL_CHECKS = {"is null", "is not null"}
+
+_OPS = set(COMPARISONS) | _NULL_CHECKS | {"in", "not in", "between"}
+
+
+def to_expression(spec) -> pc.Expression:
+    """Translate a filter specification to a `pyarrow.compute.Expression`."""
+    return translate(spec, _term_expression, pc.Expression)
+
+
+def translate(spec, term: Callable, expr_type: type):
+    """Translate a filter specification to the expressions of a dataframe library.
+
+    Args:
+        spec: The filter specification.
+        term: Function returning the expression for a `(column, op, value)` term.
+            The expressions must support the `&`, `|` and `~` operators.
+        expr_type: The expression type, used as is if found in the spec.
+    """
+    if isinstance(spec, expr_type):
+        return spec
+
+    if isinstance(spec, dict):
+        if len(spec) != 1:
+            raise ValueError(f"Filter dict must have a single key, got: {spec}")
+
+        ((op, arg),) = spec.items()
+        if op == "and":
+            return _combine(operator.and_, arg, term, expr_type)
+        if op == "or":
+            return _combine(operator.or_, arg, term, expr_type)
+        if op == "not":
+            return ~translate(arg, term, expr_type)
+        raise ValueError(f"Unknown filter boolean operator '{op}'")
+
+    if isinstance(spec, (list, tuple)):
+        if _is_term(spec):
+            column, op, *value = spec
+            return term(column, op.lower(), *value)
+
+        # DNF as in pyarrow: a list of lists is an OR of ANDs
+        if spec and all(_is_group(s) for s in spec):
+            return _combine(operator.or_, spec, term, expr_type)
+
+        return _combine(operator.and_, spec, term, expr_type)
+
+    raise ValueError(f"Invalid filter specification: {spec!r}")
+
+
+def translate_filters(ds: Dataset, specs: list, term: Callable, expr_type: type):
+    """Translate the filter specs of a dataset for readers other than `pyarrow`.
+
+    Raises:
+        DatasetException: If a spec holds a `pyarrow.compute.Expression`.
+    """
+    if any(_has_arrow_expression(spec) for spec in specs):
+        msg = (
+            f"Dataset {ds.layer}/{ds.name}: `pyarrow` expression filters are only "
+            "supported by the `pyarrow` readers, use filter specs instead."
+        )
+        raise DatasetException(msg, ds)
+
+    return [translate(spec, term, expr_type) for spec in specs]
+
+
+def _has_arrow_expression(spec) -> bool:
+    if isinstance(spec, pc.Expression):
+        return True
+    if isinstance(spec, dict):
+        return any(_has_arrow_expression(s) for s in spec.values())
+    if isinstance(spec, (list, tuple)) and not _is_term(spec):
+        return any(_has_arrow_expression(s) for s in spec)
+    return False
+
+
+def _combine(op, specs, term: Callable, expr_type: type):
+    if not isinstance(specs, (list, tuple)) or not specs:
+        raise ValueError(f"Expected a non-empty list of filters, got: {specs!r}")
+    return reduce(op, [translate(s, term, expr_type) for s in specs])
+
+
+def _is_term(spec) -> bool:
+    return (
+        len(spec) in (2, 3)
+        and isinstance(spec[0], str)
+        and isinstance(spec[1], str)
+        and spec[1].lower() in _OPS
+    )
+
+
+def _is_group(spec) -> bool:
+    return isinstance(spec, (list, tuple)) and not _is_term(spec)
+
+
+def _term_expression(column: str, op: str, value=None) -> pc.Expression:
+    field = pc.field(column)
+
+    if op in COMPARISONS:
+        return COMPARISONS[op](field, value)
+    if op == "in":
+        return field.isin(value)
+    if op == "not in":
+        return ~field.isin(value)
+    if op == "between":
+        low, high = value
+        return (field >= low) & (field <= high)
+    if op == "is null":
+        return field.is_null()
+    return field.is_valid()
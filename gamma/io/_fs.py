@@ -4,28 +4,225 @@ We rely heavily on `fsspec` for most operation. The main function `get_fs_path`"
 return a `(fs: FileSystem, path: str)` tuple.
 """
 
+import asyncio
+import os
 import re
 import shutil
-from typing import Literal
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import BinaryIO, Literal, NamedTuple
 from urllib.parse import SplitResult, urlsplit
 
 import fsspec
+import fsspec.asyn
 import fsspec.core
+from fsspec.implementations.local import LocalFileSystem
 
 from . import dispatch
 from ._types import Dataset, DatasetException
-from ._utils import get_parent, progress
-from .config import get_filesystems_config
+from ._utils import freeze, get_parent, progress
+from .config import add_config_change_hook, check_config_change, get_filesystems_config
 
 FSPathType = tuple[fsspec.AbstractFileSystem, str]
 
+#: Max number of memoized location lookups in the filesystems matcher
+FS_MATCHER_MAXSIZE = 4096
+
+# Characters with special meaning in a regex
+_REGEX_META = set(".^$*+?{}[]|()\\")
+
+# Lazily built matcher for the current `filesystems` config
+_FS_MATCHER: "FilesystemsMatcher | None" = None
+_FS_MATCHER_LOCK = threading.Lock()
+
+#: Max number of pooled filesystem instances
+FS_POOL_MAXSIZE = 64
+
+# Filesystem instances pool, keyed by (protocol, frozen storage options)
+_FS_POOL: OrderedDict[tuple, fsspec.AbstractFileSystem] = OrderedDict()
+_FS_POOL_LOCK = threading.Lock()
+_FS_POOL_HITS = 0
+_FS_POOL_MISSES = 0
+
+# Instances inherited from a parent process, see `_reset_fs_pool_after_fork`
+_FS_POOL_ORPHANS: list[fsspec.AbstractFileSystem] = []
+
+#: `filesystems` entry key for the upload options, not passed to `fsspec`
+UPLOAD_OPTIONS_KEY = "upload"
+
+#: Default part size when uploading large single files
+UPLOAD_PART_SIZE = 64 * 2**20
+
+#: Default max number of parts uploaded concurrently
+UPLOAD_CONCURRENCY = 8
+
+# S3 multipart upload limits
+_S3_MIN_PART_SIZE = 5 * 2**20
+_S3_MAX_PARTS = 10_000
+
+
+class FilesystemPoolInfo(NamedTuple):
+    """Statistics for the filesystem instances pool."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class UploadOptions(NamedTuple):
+    """Options for uploading large single files, see `upload_file`."""
+
+    part_size: int = UPLOAD_PART_SIZE
+    concurrency: int = UPLOAD_CONCURRENCY
+
+
+class FilesystemsMatcher:
+    """Compiled matcher for the `filesystems` configuration entries.
+
+    This behaves like running `re.match` with each entry `match` pattern in order and
+    picking the first match, but we compile all patterns once into a single
+    alternation and memoize the results.
+
+    When all patterns are literal prefixes (eg. `s3://bucket/.*`), the match depends
+    only on the first characters of the location, so we memoize on that prefix instead
+    of the full location.
+    """
+
+    def __init__(self, filesystems: dict, maxsize: int = FS_MATCHER_MAXSIZE) -> None:
+        self.entries: list[dict] = []
+        patterns = []
+        for candidate in filesystems.values():
+            options = candidate.copy()
+            patterns.append(options.pop("match"))
+            self.entries.append(options)
+
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+        self.combined, self.group_entries = _compile_alternation(patterns)
+
+        prefixes = [_literal_prefix(pattern) for pattern in patterns]
+        if None in prefixes:
+            self.prefix_len = None
+        else:
+            self.prefix_len = max(map(len, prefixes), default=0)
+
+        self.maxsize = maxsize
+        self._memo: OrderedDict[str, int | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def match(self, location: str) -> dict | None:
+        """Return the options of the first entry matching `location`, or `None`.
+
+        The returned dict is shared, don't modify it.
+        """
+        if not self.entries:
+            return None
+
+        key = location if self.prefix_len is None else location[: self.prefix_len]
+
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                idx = self._memo[key]
+                return None if idx is None else self.entries[idx]
+
+        idx = self._find(key)
+
+        with self._lock:
+            self._memo[key] = idx
+            while len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+
+        return None if idx is None else self.entries[idx]
+
+    def _find(self, location: str) -> int | None:
+        if self.combined is not None:
+            m = self.combined.match(location)
+            # the outer wrapping group is the last one to close
+            return None if m is None else self.group_entries[m.lastindex]
+
+        # fallback to a linear scan
+        for idx, pattern in enumerate(self.patterns):
+            if pattern.match(location):
+                return idx
+        return None
+
+
+def _compile_alternation(patterns: list[str]) -> tuple[re.Pattern | None, dict]:
+    """Compile patterns into a single ordered alternation.
+
+    Return the compiled regex and a map of wrapping group index to entry index. If
+    patterns cannot be safely combined (eg. numbered backreferences), return `None`.
+    """
+    if not patterns or any(re.search(r"\\[1-9]", p) for p in patterns):
+        return None, {}
+
+    try:
+        combined = re.compile("|".join(f"({p})" for p in patterns))
+    except re.error:
+        return None, {}
+
+    group_entries = {}
+    group = 1
+    for idx, pattern in enumerate(patterns):
+        group_entries[group] = idx
+        group += 1 + re.compile(pattern).groups
+
+    return combined, group_entries
+
+
+def _literal_prefix(pattern: str) -> str | None:
+    """Return `prefix` if `pattern` matches exactly the strings starting with it.
+
+    Only patterns like `<literal>` or `<literal>.*` are recognized.
+    """
+    if pattern.endswith(".*") and not pattern.endswith("\\.*"):
+        pattern = pattern[:-2]
+
+    prefix = []
+    chars = iter(pattern)
+    for c in chars:
+        if c == "\\":
+            c = next(chars, "")
+            if not c or c.isalnum():
+                return None
+        elif c in _REGEX_META:
+            return None
+        prefix.append(c)
+
+    return "".join(prefix)
+
+
+def get_fs_matcher() -> FilesystemsMatcher:
+    """Return the compiled matcher for the current `filesystems` configuration."""
+    global _FS_MATCHER
+
+    check_config_change()
+    matcher = _FS_MATCHER
+    if matcher is None:
+        with _FS_MATCHER_LOCK:
+            if _FS_MATCHER is None:
+                _FS_MATCHER = FilesystemsMatcher(get_filesystems_config())
+            matcher = _FS_MATCHER
+    return matcher
+
+
+@add_config_change_hook
+def _invalidate_fs_matcher() -> None:
+    global _FS_MATCHER
+    _FS_MATCHER = None
+
 
 def get_fs_options(location: str) -> tuple[SplitResult, dict]:
     """Return the `fsspec` storage options to construct a `FileSystem` object.
 
     We check the `filesystems` configuration for "match" keys providing a regex
     pattern we run against the location URL. We then pick the first matching entry
-    as our storage options.
+    as our storage options. Patterns are compiled once and lookups are memoized, see
+    `FilesystemsMatcher`.
 
     If no entries match, we return a dummy `{'protocol': scheme}` where `scheme` is the
     "URL scheme" part of the location.
@@ -36,37 +233,293 @@ def get_fs_options(location: str) -> tuple[SplitResult, dict]:
 
         - The options dict always have the `protocol` entry, defaulting to the
           URL scheme of `location`.
+
+        - The `upload` entry key is not a storage option, see `get_upload_options`.
     """
     u = urlsplit(location, "file")
-    filesystems = get_filesystems_config()
 
     # try to find a matching entry
-    options = None
-    for candidate in filesystems.values():
-        pattern = candidate["match"]
-        if re.match(pattern, location):
-            options = candidate.copy()
-            break
+    options = get_fs_matcher().match(location)
 
     # no entry found, fallback to simple protocol
     if options is None:
         return u, {"protocol": u.scheme}
 
+    options = options.copy()
+    options.pop(UPLOAD_OPTIONS_KEY, None)
     if "protocol" not in options:
         options["protocol"] = u.scheme
 
-    options.pop("match")
-
     return u, options
 
 
+def get_upload_options(location: str) -> UploadOptions:
+    """Return the options for uploading large single files to `location`.
+
+    These are set in the `upload` key of the matching `filesystems` entry, eg:
+
+        filesystems:
+          my_bucket:
+            match: "s3://my-bucket/.*"
+            upload:
+              part_size: 16777216  # 16 MiB
+              concurrency: 16
+    """
+    options = get_fs_matcher().match(location) or {}
+    return UploadOptions(**options.get(UPLOAD_OPTIONS_KEY, {}))
+
+
+def get_filesystem(protocol: str, **storage_options) -> fsspec.AbstractFileSystem:
+    """Return a pooled `fsspec` filesystem for the protocol and storage options.
+
+    Instances are reused across calls and threads, so connections are kept warm. The
+    pool is bounded (see `FS_POOL_MAXSIZE`), closing the least recently used instances
+    on eviction. In forked child processes the pool starts empty, as clients inherited
+    from the parent are not safe to use. Use `close_filesystems` to release
+    connections explicitly.
+
+    If the storage options are not hashable, we return an unpooled instance.
+    """
+    global _FS_POOL_HITS, _FS_POOL_MISSES
+
+    try:
+        key = (protocol, freeze(storage_options))
+    except TypeError:
+        return fsspec.filesystem(protocol, **storage_options)
+
+    with _FS_POOL_LOCK:
+        fs = _FS_POOL.get(key)
+        if fs is not None:
+            _FS_POOL_HITS += 1
+            _FS_POOL.move_to_end(key)
+            return fs
+
+    # bypass fsspec's own instance cache, we manage the lifecycle here
+    fs = fsspec.filesystem(protocol, skip_instance_cache=True, **storage_options)
+
+    evicted = []
+    with _FS_POOL_LOCK:
+        _FS_POOL_MISSES += 1
+        fs = _FS_POOL.setdefault(key, fs)
+        while len(_FS_POOL) > FS_POOL_MAXSIZE:
+            evicted.append(_FS_POOL.popitem(last=False))
+
+    for (evicted_proto, _), evicted_fs in evicted:
+        close_filesystem(evicted_fs, evicted_proto)
+
+    return fs
+
+
+def close_filesystems(protocol: str | None = None) -> None:
+    """Close and remove pooled filesystems, releasing their connections.
+
+    Args:
+        protocol: If provided, only close filesystems for this protocol.
+    """
+    with _FS_POOL_LOCK:
+        keys = [k for k in _FS_POOL if protocol is None or k[0] == protocol]
+        closing = [(k[0], _FS_POOL.pop(k)) for k in keys]
+
+    for proto, fs in closing:
+        close_filesystem(fs, proto)
+
+
+def get_filesystem_pool_info() -> FilesystemPoolInfo:
+    """Return hit/miss statistics for the filesystem instances pool."""
+    with _FS_POOL_LOCK:
+        return FilesystemPoolInfo(
+            hits=_FS_POOL_HITS,
+            misses=_FS_POOL_MISSES,
+            maxsize=FS_POOL_MAXSIZE,
+            currsize=len(_FS_POOL),
+        )
+
+
+@dispatch
+def close_filesystem(fs: fsspec.AbstractFileSystem, proto) -> None:
+    """Release resources held by a filesystem instance.
+
+    The fallback only clears the listings cache. Add specializations for protocols
+    holding network connections.
+    """
+    fs.invalidate_cache()
+
+
+@dispatch
+def close_filesystem(
+    fs: fsspec.AbstractFileSystem, proto: Literal["s3"] | Literal["s3a"]
+) -> None:
+    fs.invalidate_cache()
+    client = getattr(fs, "_s3creator", None)
+    if client is not None:
+        fs.close_session(fs.loop, client)
+        fs._s3 = fs._s3creator = None
+
+
+@dispatch
+def close_filesystem(
+    fs: fsspec.AbstractFileSystem, proto: Literal["http"] | Literal["https"]
+) -> None:
+    fs.invalidate_cache()
+    session = getattr(fs, "_session", None)
+    if session is not None:
+        fs.close_session(fs.loop, session)
+        fs._session = None
+
+
+def _reset_fs_pool_after_fork() -> None:
+    """Start with an empty pool in forked child processes.
+
+    We keep references to the inherited instances so their finalizers don't try to
+    close the parent connections from the child.
+    """
+    global _FS_POOL_LOCK
+
+    _FS_POOL_LOCK = threading.Lock()
+    _FS_POOL_ORPHANS.extend(_FS_POOL.values())
+    _FS_POOL.clear()
+
+
+os.register_at_fork(after_in_child=_reset_fs_pool_after_fork)
+
+
+@contextmanager
+def open_upload(fs: fsspec.AbstractFileSystem, path: str) -> Iterator[BinaryIO]:
+    """Open a single file for writing, uploading it with `upload_file` on close.
+
+    Streaming writes to remote filesystems go through a single connection. Instead,
+    we write to a local temporary file and upload it in parallel parts. Local files are
+    written directly.
+    """
+    if isinstance(fs, LocalFileSystem):
+        with fs.open(path, "wb") as fo:
+            yield fo
+        return
+
+    with tempfile.TemporaryDirectory() as td:
+        lpath = f"{td}/data"
+        with open(lpath, "wb") as fo:
+            yield fo
+        upload_file(fs, lpath, path)
+
+
+@dispatch
+def upload_file(fs: fsspec.AbstractFileSystem, lpath: str, rpath: str) -> None:
+    """Upload the local file `lpath` to `rpath`, in parallel parts if supported.
+
+    The part size and concurrency are set per `filesystems` entry, see
+    `get_upload_options`.
+    """
+    options = get_upload_options(fs.unstrip_protocol(rpath))
+    upload_file(fs, lpath, rpath, options, get_protocol(fs))
+
+
+@dispatch
+def upload_file(fs: fsspec.AbstractFileSystem, lpath: str, rpath: str, options, proto):
+    """Fallback to the filesystem own upload."""
+    fs.put_file(lpath, rpath)
+
+
+@dispatch
+def upload_file(
+    fs: fsspec.AbstractFileSystem,
+    lpath: str,
+    rpath: str,
+    options,
+    proto: Literal["s3"] | Literal["s3a"],
+):
+    size = os.path.getsize(lpath)
+    if size <= options.part_size:
+        fs.put_file(lpath, rpath)
+        return
+
+    # respect S3 limits, parts other than the last must be at least 5 MiB
+    part_size = max(options.part_size, _S3_MIN_PART_SIZE, -(-size // _S3_MAX_PARTS))
+    offsets = range(0, size, part_size)
+
+    bucket, key, _ = fs.split_path(rpath)
+    fsspec.asyn.sync(
+        fs.loop,
+        _s3_multipart_upload,
+        fs,
+        lpath,
+        bucket,
+        key,
+        offsets,
+        part_size,
+        options.concurrency,
+    )
+    fs.invalidate_cache(rpath)
+
+
+async def _s3_multipart_upload(
+    fs, lpath, bucket, key, offsets, part_size, concurrency
+) -> None:
+    mpu = await fs._call_s3("create_multipart_upload", Bucket=bucket, Key=key)
+    upload_id = mpu["UploadId"]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload_part(num: int, offset: int) -> dict:
+        # only hold `concurrency` parts in memory
+        async with semaphore:
+            body = await asyncio.to_thread(_read_part, lpath, offset, part_size)
+            out = await fs._call_s3(
+                "upload_part",
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=num,
+                Body=body,
+            )
+            return {"PartNumber": num, "ETag": out["ETag"]}
+
+    try:
+        parts = await asyncio.gather(
+            *[upload_part(i + 1, offset) for i, offset in enumerate(offsets)]
+        )
+        await fs._call_s3(
+            "complete_multipart_upload",
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except BaseException:
+        await fs._call_s3(
+            "abort_multipart_upload", Bucket=bucket, Key=key, UploadId=upload_id
+        )
+        raise
+
+
+def _read_part(lpath: str, offset: int, size: int) -> bytes:
+    with open(lpath, "rb") as fo:
+        fo.seek(offset)
+        return fo.read(size)
+
+
+def get_protocol(fs: fsspec.AbstractFileSystem) -> str:
+    """Return the main protocol name of a filesystem."""
+    proto = fs.protocol
+    return proto if isinstance(proto, str) else proto[0]
+
+
 @dispatch
 def get_fs_path(proto, location: str) -> FSPathType:
     """Fallback when a protocol has no specialization."""
     _, options = get_fs_options(location)
     options.pop("protocol")
 
-    fs, path = fsspec.core.url_to_fs(location, **options)
+    if "::" in location:
+        # chained URLs are not pooled
+        fs, path = fsspec.core.url_to_fs(location, **options)
+    else:
+        url_proto, _ = fsspec.core.split_protocol(location)
+        url_proto = url_proto or "file"
+        cls = fsspec.get_filesystem_class(url_proto)
+        kwargs = cls._get_kwargs_from_urls(location)
+        kwargs.update(options)
+        fs = get_filesystem(url_proto, **kwargs)
+        path = cls._strip_protocol(location)
 
     # keep promise of ending directories with a trailing slash as they're sometimes
     # removed by the url_to_fs call
@@ -96,7 +549,7 @@ def get_fs_path(location: str):
 @dispatch
 def get_fs_path(proto: Literal["https"], location: str):
     _, config = get_fs_options(location)
-    return (fsspec.filesystem(**config), location)
+    return (get_filesystem(**config), location)
 
 
 @dispatch
@@ -0,0 +1,260 @@
+"""Module implementing a sidecar min/max index for partitioned Arrow datasets.
+
+Partition pruning only applies to `partition_by` columns. With the `write_index`
+writer argument set, we write an `_index.parquet` file at the dataset root holding,
+for each row group (or record batch, for Feather) of each data file, the number of
+rows and the min, max and null count of the indexed columns. `write_index` can be
+`true`, indexing all non-partition columns with orderable types, or a list of
+columns.
+
+On reads with filters, the statistics aggregated per file are attached as guarantee
+expressions to the dataset fragments, so `pyarrow` skips files that cannot match the
+filter without opening them. This is specially useful for Feather files, which have
+no statistics of their own. Set the `use_index: false` reader argument to ignore it.
+
+Data files missing from the index are always read. Writes through `gamma.io` keep the
+index up to date, or remove it. Other writers must remove the index file.
+"""
+
+import operator
+from collections.abc import Iterable
+from functools import reduce
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pa_ds
+import pyarrow.parquet as pq
+
+from ._utils import list_data_files
+
+#: Sidecar index file name, ignored by readers as it starts with `_`
+INDEX_FILE = "_index.parquet"
+
+
+def get_index_columns(schema: pa.Schema, option, partition_by: list[str]) -> list:
+    """Return the columns to index given the `write_index` writer argument."""
+    if option is True:
+        return [
+            field.name
+            for field in schema
+            if field.name not in partition_by and _is_indexable(field.type)
+        ]
+    return [col for col in option if col not in partition_by]
+
+
+def _is_indexable(dtype: pa.DataType) -> bool:
+    return (
+        pa.types.is_integer(dtype)
+        or pa.types.is_floating(dtype)
+        or pa.types.is_decimal(dtype)
+        or pa.types.is_temporal(dtype)
+        or pa.types.is_string(dtype)
+        or pa.types.is_large_string(dtype)
+    )
+
+
+def get_index_schema(schema: pa.Schema, columns: list[str]) -> pa.Schema:
+    """Return the index table schema for `columns` of the dataset `schema`."""
+    fields = [
+        pa.field("file", pa.string()),
+        pa.field("row_group", pa.int32()),
+        pa.field("num_rows", pa.int64()),
+    ]
+    for col in columns:
+        dtype = schema.field(col).type
+        fields.append(pa.field(f"min.{col}", dtype))
+        fields.append(pa.field(f"max.{col}", dtype))
+        fields.append(pa.field(f"null_count.{col}", pa.int64()))
+    return pa.schema(fields)
+
+
+def table_stats(file: str, row_group: int, tbl, columns: list[str]) -> dict:
+    """Return an index row computing the stats of a table or record batch."""
+    row = {"file": file, "row_group": row_group, "num_rows": tbl.num_rows}
+    for col in columns:
+        values = tbl.column(col)
+        min_max = pc.min_max(values)
+        row[f"min.{col}"] = min_max["min"].as_py()
+        row[f"max.{col}"] = min_max["max"].as_py()
+        row[f"null_count.{col}"] = values.null_count
+        if pa.types.is_floating(values.type) and pc.any(pc.is_nan(values)).as_py():
+            # NaN are not ordered, eg. `x != 1` is true for NaN, mark as unknown
+            row[f"min.{col}"] = row[f"max.{col}"] = None
+            row[f"null_count.{col}"] = None
+    return row
+
+
+def nan_free_columns(tbl: pa.Table, columns: list[str]) -> set[str]:
+    """Return the floating point `columns` of the table holding no NaN."""
+    return {
+        col
+        for col in columns
+        if pa.types.is_floating(tbl.schema.field(col).type)
+        and not pc.any(pc.is_nan(tbl.column(col))).as_py()
+    }
+
+
+def parquet_stats(
+    file: str, md: pq.FileMetaData, columns: list[str], nan_free: Iterable[str] = ()
+) -> list[dict]:
+    """Return the index rows from a Parquet file footer statistics.
+
+    Footer min/max statistics ignore NaN, so floating point columns are marked as
+    unknown unless listed in `nan_free` (see `nan_free_columns`).
+    """
+    nan_free = set(nan_free)
+    rows = []
+    for i in range(md.num_row_groups):
+        rg = md.row_group(i)
+        chunks = [rg.column(j) for j in range(rg.num_columns)]
+        stats = {chunk.path_in_schema: chunk for chunk in chunks}
+        row = {"file": file, "row_group": i, "num_rows": rg.num_rows}
+        for col in columns:
+            chunk = stats.get(col)
+            st = chunk.statistics if chunk is not None else None
+            if chunk is not None and col not in nan_free:
+                if chunk.physical_type in ("FLOAT", "DOUBLE"):
+                    st = None
+            has_min_max = st is not None and st.has_min_max
+            # missing stats are stored as nulls, meaning "unknown"
+            row[f"min.{col}"] = st.min if has_min_max else None
+            row[f"max.{col}"] = st.max if has_min_max else None
+            row[f"null_count.{col}"] = st.null_count if st is not None else None
+        rows.append(row)
+    return rows
+
+
+def feather_stats(fs, path: str, file: str, columns: list[str]) -> list[dict]:
+    """Return the index rows for an Arrow IPC file, reading one batch at a time."""
+    with fs.open(path, "rb") as fo:
+        reader = pa.ipc.open_file(fo)
+        return [
+            table_stats(file, i, reader.get_batch(i), columns)
+            for i in range(reader.num_record_batches)
+        ]
+
+
+def write_index(
+    fs, path: str, schema: pa.Schema, rows: list[dict], keep_existing: bool
+) -> None:
+    """Write the index file, merging the entries of the other existing files.
+
+    Args:
+        fs: The dataset filesystem.
+        path: The dataset root path.
+        schema: The index schema, see `get_index_schema`.
+        rows: The index rows for the written files.
+        keep_existing: If other data files may exist, keep their current entries.
+    """
+    path = path.rstrip("/")
+    index = pa.Table.from_pylist(rows, schema=schema)
+
+    if keep_existing:
+        current = read_index(fs, path)
+        if current is not None and current.schema.equals(schema):
+            files = {f[len(path) + 1 :] for f in list_data_files(fs, path)}
+            keep = files - set(index["file"].to_pylist())
+            mask = pc.is_in(current["file"], pa.array(sorted(keep), pa.string()))
+            index = pa.concat_tables([current.filter(mask), index])
+
+    pq.write_table(index, f"{path}/{INDEX_FILE}", filesystem=fs)
+
+
+def read_index(fs, path: str) -> pa.Table | None:
+    """Return the dataset index table, or `None` if not available."""
+    file = f"{path.rstrip('/')}/{INDEX_FILE}"
+    if not fs.exists(file):
+        return None
+    return pq.read_table(file, filesystem=fs)
+
+
+def remove_index(fs, path: str) -> None:
+    """Remove the index file, if present."""
+    file = f"{path.rstrip('/')}/{INDEX_FILE}"
+    if fs.exists(file):
+        fs.rm(file)
+
+
+def apply_index(dataset: pa_ds.FileSystemDataset, index: pa.Table, path: str):
+    """Attach the index statistics to the dataset fragments as guarantees.
+
+    Returns: A new `FileSystemDataset`, over the same files.
+    """
+    path = path.rstrip("/")
+    guarantees = get_file_guarantees(index)
+
+    fragments = []
+    for fragment in dataset.get_fragments():
+        guarantee = guarantees.get(fragment.path[len(path) + 1 :])
+        if guarantee is not None:
+            fragment = dataset.format.make_fragment(
+                fragment.path,
+                fragment.filesystem,
+                partition_expression=fragment.partition_expression & guarantee,
+            )
+        fragments.append(fragment)
+
+    return pa_ds.FileSystemDataset(
+        fragments, dataset.schema, dataset.format, dataset.filesystem
+    )
+
+
+def get_file_guarantees(index: pa.Table) -> dict[str, pc.Expression]:
+    """Aggregate the index stats by file, as expressions true for all rows."""
+    columns = [name[len("min.") :] for name in index.column_names if name[:4] == "min."]
+
+    files: dict[str, dict] = {}
+    for row in index.to_pylist():
+        for col in columns:
+            if not _is_known(row, col):
+                # unknown stats make the whole file unknown for the column
+                row[f"null_count.{col}"] = None
+
+        agg = files.get(row["file"])
+        if agg is None:
+            files[row["file"]] = row
+            continue
+
+        agg["num_rows"] += row["num_rows"]
+        for col in columns:
+            agg[f"min.{col}"] = _merge(min, agg[f"min.{col}"], row[f"min.{col}"])
+            agg[f"max.{col}"] = _merge(max, agg[f"max.{col}"], row[f"max.{col}"])
+            nulls = agg[f"null_count.{col}"], row[f"null_count.{col}"]
+            agg[f"null_count.{col}"] = None if None in nulls else sum(nulls)
+
+    guarantees = {}
+    for file, agg in files.items():
+        exprs = list(_column_guarantees(agg, columns))
+        if exprs:
+            guarantees[file] = reduce(operator.and_, exprs)
+    return guarantees
+
+
+def _merge(func, a, b):
+    return b if a is None else a if b is None else func(a, b)
+
+
+def _is_known(row: dict, col: str) -> bool:
+    nulls = row[f"null_count.{col}"]
+    if nulls is None:
+        return False
+    return nulls == row["num_rows"] or row[f"min.{col}"] is not None
+
+
+def _column_guarantees(agg: dict, columns: list[str]) -> Iterable[pc.Expression]:
+    for col in columns:
+        if not _is_known(agg, col):
+            continue
+
+        field = pc.field(col)
+        nulls = agg[f"null_count.{col}"]
+        if nulls == agg["num_rows"]:
+            yield field.is_null()
+            continue
+
+        low, high = field >= agg[f"min.{col}"], field <= agg[f"max.{col}"]
+        if nulls == 0:
+            yield low & high & field.is_valid()
+        else:
+            # `pyarrow` only simplifies nullable ranges in this form
+            yield (low | field.is_null()) & (high | field.is_null())
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from typing import Literal, Type
 
 import pandas as pd
@@ -5,10 +6,21 @@ from fsspec import AbstractFileSystem
 
 from . import dispatch
 from ._dataset import get_dataset, get_extension
+from ._fs import open_upload
 from ._logging import log_ds_read, log_ds_write
 from ._staging import get_stage_reader_fs_path, get_stage_writer_fs_path
-from ._types import ArrowFmt, Dataset
-from ._utils import get_parent, get_single_file_in_folder, remove_extra_arguments
+from ._types import ArrowFmt, Dataset, DatasetException, PartitionException
+from ._utils import (
+    check_no_filters,
+    check_write_mode,
+    get_parent,
+    get_single_file_in_folder,
+    list_data_files,
+    remove_extra_arguments,
+)
+
+#: Default number of rows of the chunks read from CSV or JSON lines files
+TEXT_CHUNK_SIZE = 100_000
 
 
 @dispatch
@@ -50,9 +62,31 @@ def read_pandas(ds: Dataset, fmt, protocol):
 
     We assume the storage to be `fsspec` stream compatible (ie. single file).
     """
+    return _read_stream(ds, fmt)
+
+
+@dispatch
+def read_pandas(ds: Dataset, fmt: Literal["csv"] | Literal["json"], protocol):
+    """Read CSV or JSON files, with `pyarrow` if `text_reader: pyarrow` is set.
+
+    See `gamma.io._arrow.read_text` for the supported reader arguments.
+    """
+    from ._arrow import read_text, use_arrow_text_reader
+
+    if use_arrow_text_reader(ds):
+        return read_text(ds).to_pandas()
+    return _read_stream(ds, fmt)
+
+
+def _read_stream(ds: Dataset, fmt) -> pd.DataFrame:
+    check_no_filters(ds)
     func = _get_reader(ds, fmt)
     kwargs = _get_reader_arguments(ds, func)
 
+    # always read a single DataFrame, use `iter_pandas` for chunks
+    kwargs.pop("chunksize", None)
+    kwargs.pop("iterator", None)
+
     # get a fs, path reference
     fs, path = get_stage_reader_fs_path(ds)
 
@@ -76,7 +110,7 @@ def _get_reader(ds: Dataset, fmt):
     # get reader function based on format name
     func = getattr(pd, f"read_{fmt}", None)
     if func is None:
-        NotImplemented(f"Format not supported {fmt}")
+        raise NotImplementedError(f"Format not supported {fmt}")
     return func
 
 
@@ -96,7 +130,7 @@ def read_pandas(ds: Dataset, fmt: Literal["parquet"], protocol) -> pd.DataFrame:
     from ._arrow import read_parquet
 
     tbl = read_parquet(ds)
-    return tbl.to_pandas()
+    return _to_pandas(ds, tbl)
 
 
 @dispatch
@@ -104,9 +138,99 @@ def read_pandas(ds: Dataset, fmt: ArrowFmt, protocol) -> pd.DataFrame:
     from ._arrow import read_feather
 
     tbl = read_feather(ds)
+    return _to_pandas(ds, tbl)
+
+
+def _to_pandas(ds: Dataset, tbl) -> pd.DataFrame:
+    """Convert an Arrow table, sharing memory-mapped buffers where possible."""
+    from ._arrow import use_memory_map
+
+    if use_memory_map(ds):
+        # a block per column allows zero-copy for primitive columns without nulls
+        return tbl.to_pandas(split_blocks=True)
     return tbl.to_pandas()
 
 
+@dispatch
+def iter_pandas(*args, batch_size: int | None = None, **kwargs) -> Iterator:
+    """Iterate over a dataset as pandas DataFrame chunks.
+
+    Memory usage is bounded by the batch size, regardless of the dataset size. See
+    `gamma.io._arrow.iter_arrow` for the supported reader arguments. CSV and JSON
+    lines files are also supported.
+
+    Args:
+        *args: Positional arguments to `get_dataset`
+        batch_size: The max number of rows per chunk
+        **kwargs: Keyword arguments to `get_dataset`
+    """
+    ds = get_dataset(*args, **kwargs)
+    return iter_pandas(ds, batch_size=batch_size)
+
+
+@dispatch
+def iter_pandas(ds: Dataset, batch_size: int | None = None) -> Iterator:
+    """Iterate over a dataset as pandas DataFrame chunks."""
+    return iter_pandas(ds, ds.format, ds.protocol, batch_size=batch_size)
+
+
+@dispatch
+def iter_pandas(ds: Dataset, fmt, protocol, batch_size: int | None = None):
+    """Fallback for formats without streaming support."""
+    raise NotImplementedError(f"Streaming reads not supported for format '{fmt}'")
+
+
+@dispatch
+def iter_pandas(
+    ds: Dataset,
+    fmt: Literal["csv"] | Literal["json"],
+    protocol,
+    batch_size: int | None = None,
+) -> Iterator:
+    """Stream CSV or JSON lines files as DataFrame chunks.
+
+    Chunks default to the `chunksize` reader argument, or `TEXT_CHUNK_SIZE` rows.
+    JSON files must be read with the `lines: true` reader argument. The column types
+    are inferred for each chunk, so set the `dtype` reader argument if they may vary,
+    eg. integer columns with missing values.
+    """
+    check_no_filters(ds)
+    func = _get_reader(ds, fmt)
+    kwargs = _get_reader_arguments(ds, func)
+    kwargs.pop("iterator", None)
+    kwargs["chunksize"] = batch_size or kwargs.get("chunksize") or TEXT_CHUNK_SIZE
+
+    if fmt == "json" and not kwargs.get("lines"):
+        msg = (
+            f"Dataset {ds.layer}/{ds.name}: chunked JSON reads require the "
+            "`lines: true` reader argument"
+        )
+        raise DatasetException(msg, ds)
+
+    fs, path = get_stage_reader_fs_path(ds)
+    path = _adjust_reader_path_pandas(ds, fs, path, fmt)
+    return _iter_text(fs, path, func, kwargs)
+
+
+def _iter_text(fs, path: str, func, kwargs: dict) -> Iterator[pd.DataFrame]:
+    # the file is kept open while iterating
+    with fs.open(path, "rb") as fo, func(fo, **kwargs) as reader:
+        yield from reader
+
+
+@dispatch
+def iter_pandas(
+    ds: Dataset,
+    fmt: Literal["parquet"] | ArrowFmt,
+    protocol,
+    batch_size: int | None = None,
+) -> Iterator:
+    """Stream Parquet or Feather datasets as record batches."""
+    from ._arrow import iter_arrow
+
+    return (batch.to_pandas() for batch in iter_arrow(ds, batch_size))
+
+
 @dispatch
 def write_pandas(df: pd.DataFrame, *args, **kwargs) -> None:
     ds = get_dataset(*args, **kwargs)
@@ -129,7 +253,7 @@ def write_pandas(df: pd.DataFrame, ds: Dataset, fmt, protocol):
     # get reader function based on format name
     func = getattr(pd.DataFrame, f"to_{fmt}", None)
     if func is None:
-        NotImplemented(f"Format not supported {fmt}")
+        raise NotImplementedError(f"Format not supported {fmt}")
 
     # get a fs, path reference
     fs, path = get_stage_writer_fs_path(ds)
@@ -138,6 +262,7 @@ def write_pandas(df: pd.DataFrame, ds: Dataset, fmt, protocol):
     kwargs = process_write_args(ds, fmt)
     remove_extra_arguments(func, kwargs)
 
+    check_write_mode(ds, fs, path)
     if fs.exists(path):
         fs.rm(path, recursive=True)
 
@@ -145,7 +270,7 @@ def write_pandas(df: pd.DataFrame, ds: Dataset, fmt, protocol):
 
     # write data as stream
     fs.makedirs(get_parent(path), exist_ok=True)
-    with fs.open(path, "wb") as fo:
+    with open_upload(fs, path) as fo:
         return func(df, fo, **kwargs)
 
 
@@ -177,6 +302,14 @@ def write_pandas(df: pd.DataFrame, ds: Dataset, fmt: ArrowFmt, proto) -> None:
     write_feather(tbl, ds)
 
 
+@dispatch
+def to_arrow(df: pd.DataFrame):
+    """Convert a pandas DataFrame to a `pyarrow.Table`, dropping the index."""
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
 @dispatch
 def process_write_args(ds: Dataset, fmt):
     """Process dataset writer arguments."""
@@ -209,9 +342,57 @@ def list_partitions(*args, **kwargs) -> pd.DataFrame:
 def list_partitions(ds: Dataset, **kwargs) -> pd.DataFrame:
     """List the existing partition set.
 
-    Return a Dataframe with the available partitions and size.
+    Partitions are discovered from the "Hive" folder structure alone, with a single
+    recursive listing of the dataset location. No data file is opened.
+
+    Args:
+        ds: The partitioned dataset.
+        **kwargs: Known partition values to filter on (eg. `l1="A"`). If the leading
+            partition values are known, only the matching sub-folder is listed.
+
+    Returns: A Dataframe with the available partitions, plus the number of files
+        (`num_files`) and total size (`size_bytes`) of each.
     """
-    ds = get_dataset(layer=ds.layer, name=ds.name, **kwargs)
-    ds.args.update({"columns": ds.partition_by})
+    from ._arrow import encode_partition_value, get_partitions_path, parse_hive_folders
 
-    return read_pandas(ds).drop_duplicates()
+    if kwargs:
+        ds = get_dataset(layer=ds.layer, name=ds.name, **{**ds.partitions, **kwargs})
+    if not ds.partition_by:
+        msg = f"Dataset {ds.layer}/{ds.name} does not declare `partition_by`"
+        raise PartitionException(msg, ds)
+
+    # expected folder name for each known partition value
+    known = {
+        i: f"{col}={encode_partition_value(ds.partitions[col])}"
+        for i, col in enumerate(ds.partition_by)
+        if col in ds.partitions
+    }
+
+    fs, path = get_stage_reader_fs_path(ds)
+    path = path.rstrip("/")
+
+    # narrow the listing down to the leading known partitions
+    root = get_partitions_path(ds, path)
+
+    depth = len(ds.partition_by)
+    folders: dict[str, list[int]] = {}
+    for file, info in list_data_files(fs, root, path).items():
+        parts = file[len(path) :].strip("/").split("/")
+        if len(parts) != depth + 1:
+            continue
+        if any(parts[i] != folder for i, folder in known.items()):
+            continue
+        if any(not p.startswith(f"{col}=") for col, p in zip(ds.partition_by, parts)):
+            continue
+
+        entry = folders.setdefault("/".join(parts[:-1]), [0, 0])
+        entry[0] += 1
+        entry[1] += info.get("size") or 0
+
+    # typed values, as read by the `pyarrow` readers
+    keys = parse_hive_folders(ds.partition_by, list(folders))
+    records = [(*key, n, size) for key, (n, size) in zip(keys, folders.values())]
+
+    columns = [*ds.partition_by, "num_files", "size_bytes"]
+    df = pd.DataFrame.from_records(records, columns=columns)
+    return df.sort_values(ds.partition_by, ignore_index=True)
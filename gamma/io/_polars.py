@@ -1,17 +1,32 @@
 """IO support for Polars."""
 
 
+import glob
+import operator
+import os
+from collections import Counter
+from collections.abc import Iterator
+from functools import reduce
 from typing import Literal, Type
 
 import polars as pl
 from fsspec import AbstractFileSystem
+from fsspec.implementations.local import LocalFileSystem
 
 from . import dispatch
 from ._dataset import get_dataset, get_extension
+from ._fs import open_upload
 from ._logging import log_ds_read, log_ds_write
 from ._staging import get_stage_reader_fs_path, get_stage_writer_fs_path
-from ._types import ArrowFmt, Dataset
-from ._utils import get_parent, get_single_file_in_folder, remove_extra_arguments
+from ._types import ArrowFmt, Dataset, DatasetException
+from ._utils import (
+    check_no_filters,
+    check_write_mode,
+    get_parent,
+    get_single_file_in_folder,
+    has_data,
+    remove_extra_arguments,
+)
 
 
 @dispatch
@@ -53,6 +68,25 @@ def read_polars(ds: Dataset, fmt, protocol):
 
     We assume the storage to be `fsspec` stream compatible (ie. single file).
     """
+    return _read_stream(ds, fmt)
+
+
+@dispatch
+def read_polars(ds: Dataset, fmt: Literal["csv"] | Literal["json"], protocol):
+    """Read CSV or JSON files, with `pyarrow` if `text_reader: pyarrow` is set.
+
+    See `gamma.io._arrow.read_text` for the supported reader arguments.
+    """
+    from ._arrow import read_text, use_arrow_text_reader
+
+    if use_arrow_text_reader(ds):
+        return pl.from_arrow(read_text(ds))
+    return _read_stream(ds, fmt)
+
+
+def _read_stream(ds: Dataset, fmt) -> pl.DataFrame:
+    check_no_filters(ds)
+
     # get reader function based on format name
     func = getattr(pl, f"read_{fmt}", None)
     if func is None:  # pragma: no cover
@@ -77,19 +111,210 @@ def read_polars(ds: Dataset, fmt, protocol):
 @dispatch
 def read_polars(ds: Dataset, fmt: Literal["parquet"], protocol):
     """Read Parquet into a DataFrame."""
-    from ._arrow import read_parquet
+    from ._arrow import read_parquet, use_memory_map
 
     tbl = read_parquet(ds)
-    return pl.from_arrow(tbl)
+    # avoid copying memory-mapped buffers when possible
+    return pl.from_arrow(tbl, rechunk=not use_memory_map(ds))
 
 
 @dispatch
 def read_polars(ds: Dataset, fmt: ArrowFmt, proto):
     """Read Arrow IPC/Feather into a DataFrame."""
-    from ._arrow import read_feather
+    from ._arrow import read_feather, use_memory_map
 
     tbl = read_feather(ds)
-    return pl.from_arrow(tbl)
+    # avoid copying memory-mapped buffers when possible
+    return pl.from_arrow(tbl, rechunk=not use_memory_map(ds))
+
+
+@dispatch
+def iter_polars(*args, batch_size: int | None = None, **kwargs) -> Iterator:
+    """Iterate over a dataset as Polars DataFrame chunks.
+
+    Memory usage is bounded by the batch size, regardless of the dataset size. See
+    `gamma.io._arrow.iter_arrow` for the supported reader arguments.
+
+    Args:
+        *args: Positional arguments to `get_dataset`
+        batch_size: The max number of rows per chunk
+        **kwargs: Keyword arguments to `get_dataset`
+    """
+    ds = get_dataset(*args, **kwargs)
+    return iter_polars(ds, batch_size=batch_size)
+
+
+@dispatch
+def iter_polars(ds: Dataset, batch_size: int | None = None) -> Iterator:
+    """Iterate over a dataset as Polars DataFrame chunks."""
+    return iter_polars(ds, ds.format, ds.protocol, batch_size=batch_size)
+
+
+@dispatch
+def iter_polars(ds: Dataset, fmt, protocol, batch_size: int | None = None):
+    """Fallback for formats without streaming support."""
+    raise NotImplementedError(f"Streaming reads not supported for format '{fmt}'")
+
+
+@dispatch
+def iter_polars(
+    ds: Dataset,
+    fmt: Literal["parquet"] | ArrowFmt,
+    protocol,
+    batch_size: int | None = None,
+) -> Iterator:
+    """Stream Parquet or Feather datasets as record batches."""
+    from ._arrow import iter_arrow
+
+    return (pl.from_arrow(batch) for batch in iter_arrow(ds, batch_size))
+
+
+@dispatch
+def scan_polars(*args, **kwargs) -> pl.LazyFrame:
+    """Lazily scan a dataset as a Polars LazyFrame.
+
+    Only the columns and rows needed by the query plan are read, and the plan can run
+    in the Polars streaming engine. See `scan_polars(ds: Dataset)` for details.
+
+    Args:
+        *args: Positional arguments to `get_dataset`
+        **kwargs: Keyword arguments to `get_dataset`
+    """
+    return scan_polars(get_dataset(*args, **kwargs))
+
+
+@dispatch
+def scan_polars(ds: Dataset) -> pl.LazyFrame:
+    """Lazily scan a Parquet or Feather dataset as a Polars LazyFrame.
+
+    Files are discovered as in `gamma.io._arrow.get_arrow_dataset`, skipping the
+    partitions not matching the dataset `partitions` and `filters`. Local files are
+    scanned with `polars.scan_parquet` or `polars.scan_ipc`, adding the "Hive"
+    partition values as columns, and remote files with `polars.scan_pyarrow_dataset`.
+    Row filters are applied to the LazyFrame, and pushed down by Polars.
+    """
+    return scan_polars(ds, ds.format, ds.protocol)
+
+
+@dispatch
+def scan_polars(ds: Dataset, fmt, protocol) -> pl.LazyFrame:
+    """Fallback for formats without lazy scan support."""
+    raise NotImplementedError(f"Lazy scans not supported for format '{fmt}'")
+
+
+@dispatch
+def scan_polars(
+    ds: Dataset, fmt: Literal["parquet"] | ArrowFmt, protocol
+) -> pl.LazyFrame:
+    """Scan Parquet or Feather files, adding the partition columns.
+
+    Local files are scanned by the Polars readers, one scan per partition folder (a
+    glob pattern if all the folder files are kept). Remote files are scanned as a
+    `pyarrow` dataset with the dataset filesystem, as the `fsspec` storage options
+    don't map to the Polars cloud readers.
+    """
+    import pyarrow.dataset as pa_ds
+
+    from ._arrow import get_arrow_dataset, get_filter_expression, use_memory_map
+    from ._filters import translate_filters
+
+    fs, _ = get_stage_reader_fs_path(ds)
+    func = pl.scan_parquet if fmt == "parquet" else pl.scan_ipc
+
+    kwargs = dict()
+    kwargs.update(ds.args)
+    kwargs.update(ds.read_args)
+    columns = kwargs.pop("columns", None)
+    specs = [ds.filters, kwargs.pop("filter", None), kwargs.pop("filters", None)]
+    _filter = get_filter_expression(ds, {"filter": specs[1], "filters": specs[2]})
+    # partitions are already pruned from the files
+    exprs = translate_filters(
+        ds, [spec for spec in specs if spec is not None], _polars_term, pl.Expr
+    )
+    if fmt != "parquet":
+        # compressed IPC files cannot be memory-mapped, only map them if asked to
+        kwargs["memory_map"] = use_memory_map(ds)
+    remove_extra_arguments(func, kwargs)
+    # Polars only reads local files here, remote ones use the dataset filesystem
+    kwargs.pop("storage_options", None)
+
+    # skip files using partitions, index and summary as the pyarrow readers
+    dataset = get_arrow_dataset(ds, _filter)
+    fragments = list(dataset.get_fragments(filter=_filter))
+
+    if not fragments:
+        lf = pl.from_arrow(dataset.schema.empty_table()).lazy()
+    elif isinstance(fs, LocalFileSystem):
+        lf = _scan_local_fragments(ds, dataset, fragments, func, kwargs)
+    else:
+        dataset = pa_ds.FileSystemDataset(
+            fragments, dataset.schema, dataset.format, dataset.filesystem
+        )
+        lf = pl.scan_pyarrow_dataset(dataset)
+
+    if exprs:
+        lf = lf.filter(reduce(operator.and_, exprs))
+    if columns is not None:
+        lf = lf.select(columns)
+    return lf
+
+
+def _scan_local_fragments(
+    ds: Dataset, dataset, fragments: list, func, kwargs: dict
+) -> pl.LazyFrame:
+    """Scan the fragments of each partition folder, adding the partition columns."""
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+
+    partition_types = {
+        col: pl.from_arrow(pa.array([], dataset.schema.field(col).type)).dtype
+        for col in ds.partition_by
+        if col in dataset.schema.names
+    }
+    folder_sizes = Counter(get_parent(file) for file in dataset.files)
+
+    folders = {}
+    for fragment in fragments:
+        folders.setdefault(get_parent(fragment.path), []).append(fragment)
+
+    frames = []
+    for folder, parts in folders.items():
+        paths = [fragment.path for fragment in parts]
+        pattern = f"{folder}/*{os.path.splitext(paths[0])[1]}"
+        if len(paths) > 1 and len(paths) == folder_sizes[folder]:
+            # the pattern must not match other files, eg. the sidecar index
+            if sorted(glob.glob(pattern)) == sorted(paths):
+                paths = [pattern]
+
+        lf = pl.concat([func(path, **kwargs) for path in paths])
+        keys = pa_ds.get_partition_keys(parts[0].partition_expression)
+        values = [
+            pl.lit(keys.get(col), dtype).alias(col)
+            for col, dtype in partition_types.items()
+        ]
+        frames.append(lf.with_columns(values) if values else lf)
+
+    return frames[0] if len(frames) == 1 else pl.concat(frames, how="diagonal")
+
+
+def _polars_term(column: str, op: str, value=None) -> pl.Expr:
+    """Return the Polars expression for a filter term, see `gamma.io._filters`."""
+    from ._filters import COMPARISONS
+
+    col = pl.col(column)
+
+    if op in COMPARISONS:
+        return COMPARISONS[op](col, value)
+    if op == "in":
+        return col.is_in(value)
+    if op == "not in":
+        return ~col.is_in(value)
+    if op == "between":
+        low, high = value
+        return col.is_between(low, high, closed="both")
+    if op == "is null":
+        return col.is_null()
+    return col.is_not_null()
 
 
 @dispatch
@@ -124,16 +349,20 @@ def write_polars(df: pl.DataFrame, ds: Dataset, fmt, protocol):
     remove_extra_arguments(func, kwargs)
 
     path = _adjust_writer_path_polars(ds, fs, path, fmt)
+    check_write_mode(ds, fs, path)
 
     # stream and write data
     fs.makedirs(get_parent(path), exist_ok=True)
-    with fs.open(path, "wb") as fo:
+    with open_upload(fs, path) as fo:
         return func(df, fo, **kwargs)
 
 
 @dispatch
 def write_polars(df: pl.DataFrame, ds: Dataset, fmt: Literal["parquet"], proto) -> None:
     """Write DataFrame as Parquet."""
+    if use_native_writer(ds):
+        return _write_native(df, ds, pl.DataFrame.write_parquet)
+
     from ._arrow import write_parquet
 
     write_parquet(df.to_arrow(), ds)
@@ -141,11 +370,180 @@ def write_polars(df: pl.DataFrame, ds: Dataset, fmt: Literal["parquet"], proto)
 
 @dispatch
 def write_polars(df: pl.DataFrame, ds: Dataset, fmt: ArrowFmt, proto) -> None:
+    if use_native_writer(ds):
+        return _write_native(df, ds, pl.DataFrame.write_ipc)
+
     from ._arrow import write_feather
 
     write_feather(df.to_arrow(), ds)
 
 
+def use_native_writer(ds: Dataset) -> bool:
+    """Return if Parquet/Feather datasets are written by Polars instead of `pyarrow`.
+
+    Set with the `polars_writer: native` writer argument. Defaults to `pyarrow`.
+    """
+    kwargs = {**ds.args, **ds.write_args}
+    writer = kwargs.get("polars_writer", "pyarrow")
+    if writer not in ("native", "pyarrow"):
+        msg = f"Dataset {ds.layer}/{ds.name}: invalid polars_writer '{writer}'"
+        raise DatasetException(msg, ds)
+    return writer == "native"
+
+
+def _write_native(df: pl.DataFrame, ds: Dataset, func) -> None:
+    """Write a Parquet or Feather dataset with the Polars writers.
+
+    Partitions are split by Polars and written in the same "Hive" layout as the
+    `pyarrow` writers, honoring the `write_mode`, `sort_by`, `zorder_by` and
+    `target_file_size` settings. The `write_index` and `write_metadata` writer
+    arguments are not supported.
+    """
+    from ._arrow import apply_write_mode, remove_parquet_summary
+    from ._discovery import update_write_marker
+    from ._index import remove_index
+
+    fs, path = get_stage_writer_fs_path(ds)
+
+    kwargs = dict()
+    kwargs.update(ds.args)
+    kwargs.update(ds.write_args)
+    for key in ("write_index", "write_metadata"):
+        if kwargs.get(key):
+            msg = f"Dataset {ds.layer}/{ds.name}: {key} requires polars_writer: pyarrow"
+            raise DatasetException(msg, ds)
+
+    df = _sort_native(df, ds)
+    if not ds.partition_by:
+        path = _adjust_writer_path_polars(ds, fs, path, ds.format)
+        check_write_mode(ds, fs, path)
+        fs.makedirs(get_parent(path), exist_ok=True)
+        _write_native_file(df, fs, path, func, _get_native_writer_args(func, kwargs))
+        return
+
+    path = path.rstrip("/")
+    options = {"existing_data_behavior": kwargs.get("existing_data_behavior", "error")}
+    apply_write_mode(ds, fs, path, options)
+    behavior = options["existing_data_behavior"]
+    if behavior == "error" and has_data(fs, path):
+        msg = (
+            f"Dataset {ds.layer}.{ds.name} location '{path}' is not empty. Set the "
+            "dataset 'write_mode' or the 'existing_data_behavior' writer argument to "
+            "write anyway."
+        )
+        raise DatasetException(msg, ds)
+
+    ext = get_extension(ds.format)
+    template = options.get("basename_template") or kwargs.get("basename_template")
+    template = template or f"part-{{i}}.{ext}"
+    rows_per_file = _get_native_rows_per_file(df, kwargs)
+    writer_args = _get_native_writer_args(func, kwargs, rows_per_file)
+
+    for partition_dir, part in _split_partitions_native(df, ds.partition_by):
+        partition_path = f"{path}/{partition_dir}"
+        if behavior == "delete_matching" and fs.exists(partition_path):
+            fs.rm(partition_path, recursive=True)
+        fs.makedirs(partition_path, exist_ok=True)
+
+        for i, offset in enumerate(range(0, len(part), rows_per_file)):
+            file = f"{partition_path}/{template.format(i=i)}"
+            chunk = part.slice(offset, rows_per_file)
+            _write_native_file(chunk, fs, file, func, writer_args)
+
+    # summary and index files would be out of date
+    if ds.format == "parquet":
+        remove_parquet_summary(fs, path)
+    remove_index(fs, path)
+    update_write_marker(ds, fs, path)
+
+
+def _write_native_file(
+    df: pl.DataFrame, fs: AbstractFileSystem, path: str, func, writer_args: dict
+) -> None:
+    if isinstance(fs, LocalFileSystem):
+        # Polars writes to local paths without the Python file layer
+        func(df, path, **writer_args)
+    else:
+        with open_upload(fs, path) as fo:
+            func(df, fo, **writer_args)
+
+
+def _get_native_writer_args(func, kwargs: dict, rows_per_file: int = 0) -> dict:
+    """Return the Polars writer arguments, with `pyarrow` compatible defaults."""
+    from ._arrow import MAX_ROWS_PER_GROUP
+
+    writer_args = kwargs.copy()
+    remove_extra_arguments(func, writer_args)
+    if func is pl.DataFrame.write_parquet:
+        # row group statistics allow readers to skip data
+        writer_args.setdefault("statistics", True)
+        if rows_per_file:
+            writer_args.setdefault(
+                "row_group_size", min(MAX_ROWS_PER_GROUP, rows_per_file)
+            )
+    return writer_args
+
+
+def _get_native_rows_per_file(df: pl.DataFrame, kwargs: dict) -> int:
+    """Return the max rows per file, as `gamma.io._arrow._set_file_size_options`."""
+    from ._arrow import TARGET_FILE_SIZE
+
+    if kwargs.get("max_rows_per_file"):
+        return kwargs["max_rows_per_file"]
+    target_size = kwargs.get("target_file_size", TARGET_FILE_SIZE)
+    if not target_size or not len(df):
+        return max(len(df), 1)
+    row_size = max(df.estimated_size() / len(df), 1)
+    return max(int(target_size / row_size), 1)
+
+
+def _split_partitions_native(
+    df: pl.DataFrame, partition_by: list[str]
+) -> Iterator[tuple[str, pl.DataFrame]]:
+    """Split the DataFrame in `(partition_dir, data)` pairs, without the partitions."""
+    from ._arrow import encode_partition_value
+
+    for part in df.partition_by(partition_by):
+        key = part.select(partition_by).row(0)
+        partition_dir = "/".join(
+            f"{col}={encode_partition_value(val)}"
+            for col, val in zip(partition_by, key)
+        )
+        yield partition_dir, part.drop(partition_by)
+
+
+def _sort_native(df: pl.DataFrame, ds: Dataset) -> pl.DataFrame:
+    """Sort the rows as `gamma.io._sorting.sort_table`, in Polars."""
+    from ._sorting import _ZORDER_COL, get_sort_keys, is_sorted_write, zorder_values
+
+    if not is_sorted_write(ds) or len(df) < 2:
+        return df
+
+    keys = get_sort_keys(ds)
+    columns = [col for col, _ in keys] + list(ds.zorder_by)
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        msg = f"Dataset {ds.layer}/{ds.name}: unknown sort columns {missing}"
+        raise DatasetException(msg, ds)
+
+    by = [col for col, _ in keys]
+    descending = [order == "descending" for _, order in keys]
+    if ds.zorder_by:
+        zorder = zorder_values(df.select(ds.zorder_by).to_arrow(), ds.zorder_by)
+        df = df.with_columns(pl.from_arrow(zorder).alias(_ZORDER_COL))
+        by.append(_ZORDER_COL)
+        descending.append(False)
+        return df.sort(by, descending=descending, nulls_last=True).drop(_ZORDER_COL)
+
+    return df.sort(by, descending=descending, nulls_last=True)
+
+
+@dispatch
+def to_arrow(df: pl.DataFrame):
+    """Convert a Polars DataFrame to a `pyarrow.Table`."""
+    return df.to_arrow()
+
+
 def _adjust_writer_path_polars(ds, fs, path: str, fmt):
     """Adjust the path when writing to folder."""
     ext = get_extension(fmt)
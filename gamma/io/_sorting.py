@@ -0,0 +1,93 @@
+"""Module implementing the row ordering of Parquet and Feather datasets on write.
+
+Row group statistics (and the sidecar index, see `gamma.io._index`) can only skip data
+if the values of the filtered columns are clustered. Rows arrive in whatever order
+the dataframe has, so we can sort them before writing, with the `sort_by` and
+`zorder_by` dataset fields:
+
+- `sort_by` is a list of columns, or `[column, "descending"]` pairs, sorted in
+  lexicographic order. Filters on the first column benefit the most.
+- `zorder_by` is a list of columns whose ranks are interleaved bit by bit, in a
+  Z-order curve. Filters on any of the columns benefit, but less than on the first
+  `sort_by` column. It's applied after the `sort_by` keys.
+
+Partitioned datasets are split after sorting, so the rows in each partition are
+sorted. Sorting runs on the Arrow data, without converting to pandas.
+"""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ._types import Dataset, DatasetException
+
+# Temporary column holding the Z-order values
+_ZORDER_COL = "__gamma_io_zorder"
+
+_ORDERS = {"ascending", "descending"}
+
+
+def is_sorted_write(ds: Dataset) -> bool:
+    """Return if rows are sorted before writing the dataset."""
+    return bool(ds.sort_by or ds.zorder_by)
+
+
+def sort_table(tbl: pa.Table, ds: Dataset) -> pa.Table:
+    """Sort the table rows by the dataset `sort_by` and `zorder_by` columns."""
+    if not is_sorted_write(ds) or tbl.num_rows < 2:
+        return tbl
+
+    keys = get_sort_keys(ds)
+    columns = [col for col, _ in keys] + list(ds.zorder_by)
+    missing = [col for col in columns if col not in tbl.column_names]
+    if missing:
+        msg = f"Dataset {ds.layer}/{ds.name}: unknown sort columns {missing}"
+        raise DatasetException(msg, ds)
+
+    if ds.zorder_by:
+        values = zorder_values(tbl, ds.zorder_by)
+        keys.append((_ZORDER_COL, "ascending"))
+        indices = pc.sort_indices(tbl.append_column(_ZORDER_COL, values), keys)
+    else:
+        indices = pc.sort_indices(tbl, keys)
+
+    return tbl.take(indices)
+
+
+def get_sort_keys(ds: Dataset) -> list[tuple[str, str]]:
+    """Return the `sort_by` field as `(column, order)` sort keys."""
+    keys = []
+    for key in ds.sort_by:
+        if isinstance(key, str):
+            key = (key, "ascending")
+        col, order = key
+        if order not in _ORDERS:
+            msg = f"Dataset {ds.layer}/{ds.name}: invalid sort order '{order}'"
+            raise DatasetException(msg, ds)
+        keys.append((col, order))
+    return keys
+
+
+def zorder_values(tbl: pa.Table, columns: list[str]) -> pa.Array:
+    """Return the Z-order curve value of each row, interleaving the column ranks.
+
+    Each column gets `64 / len(columns)` bits. Columns with more distinct values are
+    scaled down to fit, keeping their order. Nulls rank last.
+    """
+    bits = 64 // len(columns)
+    ranks = []
+    for col in columns:
+        rank = pc.rank(tbl.column(col), tiebreaker="dense")
+        rank = rank.to_numpy().astype(np.uint64) - np.uint64(1)
+        top = int(rank.max())
+        if top >= 2**bits:
+            rank = (rank.astype(np.float64) * ((2**bits - 1) / top)).astype(np.uint64)
+        ranks.append(rank)
+
+    zorder = np.zeros(tbl.num_rows, np.uint64)
+    used_bits = max(int(rank.max()).bit_length() for rank in ranks)
+    for bit in range(used_bits):
+        for i, rank in enumerate(ranks):
+            value = (rank >> np.uint64(bit)) & np.uint64(1)
+            zorder |= value << np.uint64(bit * len(columns) + i)
+    return pa.array(zorder)
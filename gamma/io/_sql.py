@@ -19,6 +19,9 @@ from ._dataset import get_dataset_location
 from ._fs import get_fs_path
 from ._types import Dataset, DatasetException
 
+#: The `pandas.DataFrame.to_sql` `if_exists` argument for each dataset `write_mode`
+SQL_IF_EXISTS = {"overwrite": "replace", "append": "append", "error_if_exists": "fail"}
+
 # Global engine cache, should be created one per process/thread.
 _ENGINE_CACHE: dict[str, Engine] = dict()
 
@@ -109,16 +112,23 @@ def write_pandas(df: pd.DataFrame, ds: Dataset, fmt, protocol: Literal["sql"]) -
     """Support for writing a full table into a SQL database via SQLAlchemy.
 
     This defaults to:
-        - replacing the table if exists (be careful!)
+        - replacing the table if exists (be careful!), unless the dataset `write_mode`
+          is `append` or `error_if_exists`
         - not writing indexes
         - using 'multi' method of insertion
     """
+    if ds.write_mode == "overwrite_partitions":
+        msg = "Write mode 'overwrite_partitions' is not supported for SQL datasets."
+        raise DatasetException(msg, ds)
+
     # get a sqlalch engine
     engine = get_sql_engine(ds)
 
     kwargs = {"con": engine, "if_exists": "replace", "index": False, "method": "multi"}
     kwargs.update(ds.args)
     kwargs.update(ds.write_args)
+    if ds.write_mode is not None:
+        kwargs["if_exists"] = SQL_IF_EXISTS[ds.write_mode]
 
     kwargs["name"] = kwargs.pop("name", None) or kwargs.pop("table_name", None)
     kwargs["method"] = get_sql_insert_method(kwargs["method"])
@@ -1,4 +1,4 @@
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, model_validator
 
@@ -6,6 +6,8 @@ ArrowFmt = Literal["feather"] | Literal["arrow"] | Literal["ipc"]
 
 FEATHER_STRINGS = set(["feather", "arrow", "ipc"])
 
+WriteMode = Literal["overwrite", "overwrite_partitions", "append", "error_if_exists"]
+
 
 class DatasetException(Exception):
     """Base exception for wrong dataset specifications."""
@@ -81,6 +83,33 @@ class Dataset(BaseModel):
     #: Partition values
     partitions: Optional[dict] = {}
 
+    filters: Optional[Any] = None
+    """Row filters pushed down to the reader, for Parquet and Feather datasets only.
+    Supports comparisons, ranges, `in` lists, null checks and boolean combinations on
+    both partition and data columns. See `gamma.io._filters` for the syntax."""
+
+    sort_by: Optional[list] = []
+    """Columns to sort rows by when writing Parquet and Feather datasets, within each
+    partition. Entries are column names or `[column, "descending"]` pairs. Sorted data
+    makes row group statistics selective for filtered reads and compresses better.
+    See `gamma.io._sorting`."""
+
+    zorder_by: Optional[list[str]] = []
+    """Columns to cluster rows by when writing Parquet and Feather datasets, along a
+    Z-order curve, after the `sort_by` columns. Filters on any of these columns can
+    skip data."""
+
+    write_mode: Optional[WriteMode] = None
+    """How writers handle existing data:
+        - `overwrite`: replace the whole dataset.
+        - `overwrite_partitions`: replace only the partitions present in the written
+          data, keeping the others. Same as `overwrite` for single-file datasets.
+        - `append`: add new files to a partitioned dataset.
+        - `error_if_exists`: raise if the dataset location has any data.
+
+    If not set, single-file datasets are replaced and partitioned datasets follow the
+    `existing_data_behavior` writer argument of `pyarrow.dataset.write_dataset`."""
+
     model_config = ConfigDict(extra="forbid")
 
     @model_validator(mode="after")
@@ -28,6 +28,27 @@ def remove_extra_arguments(f, kwargs: dict) -> None:
             del kwargs[name]
 
 
+def freeze(value):
+    """Recursively convert containers to hashable tuples, tagging the types.
+
+    Useful to build cache keys out of keyword arguments. It raises `TypeError` if
+    `value` cannot be hashed.
+    """
+    if isinstance(value, dict):
+        items = sorted((k, freeze(v)) for k, v in value.items())
+        value = (dict, tuple(items))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = [freeze(v) for v in value]
+        if isinstance(value, (set, frozenset)):
+            items = sorted(items)
+        value = (type(value), tuple(items))
+    else:
+        value = (type(value), value)
+
+    hash(value)
+    return value
+
+
 def progress(*, total: int, force_tty=False):
     """Initialize a progress bar.
 
@@ -79,3 +100,54 @@ def get_single_file_in_folder(fs: AbstractFileSystem, path, ds=None):
 
     path = files[0]
     return path
+
+
+def list_data_files(
+    fs: AbstractFileSystem, path: str, root: str | None = None
+) -> dict[str, dict]:
+    """Recursively list data files in `path`, with their details.
+
+    Like `pyarrow`, we ignore files and folders (relative to `root`, defaulting to
+    `path`) starting with `.` or `_`, eg. the `_metadata` summary file.
+    """
+    root = (root or path).rstrip("/")
+    files = {}
+    for file, info in fs.find(path, detail=True).items():
+        parts = file[len(root) :].strip("/").split("/")
+        if any(p[:1] in (".", "_") for p in parts):
+            continue
+        files[file] = info
+    return files
+
+
+def check_no_filters(ds) -> None:
+    """Raise if row filters are set for a reader that cannot apply them."""
+    from ._types import DatasetException
+
+    if ds.filters is not None:
+        msg = (
+            f"Dataset {ds.layer}/{ds.name}: row filters are only supported for "
+            f"Parquet and Feather datasets, got format '{ds.format}'."
+        )
+        raise DatasetException(msg, ds)
+
+
+def has_data(fs: AbstractFileSystem, path: str) -> bool:
+    """Return if `path` is a file or a folder with files in it."""
+    return fs.exists(path) and (fs.isfile(path) or bool(fs.find(path)))
+
+
+def check_write_mode(ds, fs: AbstractFileSystem, path: str) -> None:
+    """Raise if the dataset `write_mode` does not allow writing to `path`."""
+    from ._types import DatasetException
+
+    if ds.write_mode == "append" and not ds.partition_by:
+        msg = (
+            f"Dataset {ds.layer}/{ds.name}: write mode 'append' is only supported for "
+            "partitioned datasets."
+        )
+        raise DatasetException(msg, ds)
+
+    if ds.write_mode == "error_if_exists" and has_data(fs, path):
+        msg = f"Dataset {ds.layer}/{ds.name}: location '{path}' is not empty."
+        raise DatasetException(msg, ds)
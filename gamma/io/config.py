@@ -1,5 +1,7 @@
 """Module abstracting configuration sources."""
 
+from typing import Callable
+
 from ._types import StagingConf
 
 #: Configuration key for datasets
@@ -8,6 +10,12 @@ DATASETS_CONFIG_KEY = "datasets"
 #: Configuration key for filesystems
 FILESYSTEMS_CONFIG_KEY = "filesystems"
 
+#: Callables invoked when the configuration changes
+_CONFIG_CHANGE_HOOKS: list[Callable[[], None]] = []
+
+#: Token identifying the last seen configuration
+_CONFIG_TOKEN: object = None
+
 
 def get_dataset_config(layer: str, name: str) -> dict:
     """Return the datasets configuration as a Python dict.
@@ -42,6 +50,41 @@ def get_staging_config() -> StagingConf:
     return StagingConf(**conf)
 
 
+def add_config_change_hook(func: Callable[[], None]) -> Callable[[], None]:
+    """Register a callable to be invoked without arguments when the config changes.
+
+    We use this to invalidate internal caches derived from the configuration (eg.
+    resolved datasets). Can be used as a decorator.
+    """
+    _CONFIG_CHANGE_HOOKS.append(func)
+    return func
+
+
+def notify_config_change() -> None:
+    """Invoke all registered config change hooks.
+
+    Configuration reloads are detected automatically (see `check_config_change`), but
+    you need to call this yourself if you change the config in ways we cannot detect,
+    like monkey-patching the `_resolve_*` functions or changing environment variables
+    referenced by an already loaded config.
+    """
+    for hook in list(_CONFIG_CHANGE_HOOKS):
+        hook()
+
+
+def check_config_change() -> None:
+    """Notify the config change hooks if the configuration was reloaded.
+
+    This is cheap enough to be called before every cache lookup.
+    """
+    global _CONFIG_TOKEN
+
+    token = _resolve_config_token()
+    if token is not _CONFIG_TOKEN:
+        _CONFIG_TOKEN = token
+        notify_config_change()
+
+
 def _check_gamma_config():
     from ._types import MissingDependencyException
 
@@ -94,3 +137,18 @@ def _resolve_staging_config() -> dict:
 
     config = get_config()[DATASETS_CONFIG_KEY].get("_staging")
     return to_dict(config) if config else {}
+
+
+def _resolve_config_token() -> object:
+    """Return an object identifying the currently loaded configuration.
+
+    The default implementation returns the `gamma-config` global root object, which is
+    replaced whenever the config is reloaded. Monkey-patch this to provide your own
+    change detection.
+    """
+    try:
+        from gamma.config import get_config
+    except ModuleNotFoundError:  # pragma: no cover
+        return None
+
+    return get_config()
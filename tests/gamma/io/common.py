@@ -47,7 +47,9 @@ def check_partitions(ds: Dataset):
 
     # try list only partitions
     p1 = list_partitions(ds)
-    assert set(p1.columns) == {"l1", "l2"}
+    assert set(p1.columns) == {"l1", "l2", "num_files", "size_bytes"}
+    assert p1["num_files"].sum() == len(fs.find(path))
+    assert p1["size_bytes"].sum() == fs.du(path)
     assert "A" in p1["l1"].tolist()
     assert "B" in p1["l1"].tolist()
     assert "C" in p1["l1"].tolist()
@@ -60,6 +62,11 @@ def check_partitions(ds: Dataset):
     assert "B" not in p2["l1"].tolist()
     assert "A" in p2["l2"].tolist() or "B" in p2["l2"].tolist()
 
+    # filter on non-leading partitions
+    p3 = list_partitions(ds, l2="B")
+    assert p3["l2"].tolist() == ["B"] * len(p3)
+    assert len(p3) == len(p1[p1["l2"] == "B"])
+
 
 @dispatch
 def check_df_equal(df1: pd.DataFrame, df2: pd.DataFrame):
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from gamma.io import (
+    PartitionException,
+    compact_dataset,
+    get_dataset,
+    get_fs_path,
+    read_pandas,
+    write_pandas,
+)
+from gamma.io._index import read_index
+from gamma.io._utils import list_data_files
+
+from .common import assign_partitions, check_df_equal
+
+
+def _count_files(fs, path: str, fmt: str) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for file in fs.glob(f"{path.rstrip('/')}/*/*/*.{fmt}"):
+        partition_dir = file.rsplit("/", 1)[0]
+        counts[partition_dir] = counts.get(partition_dir, 0) + 1
+    return counts
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_compact_dataset(io_config, fmt):
+    df = read_pandas("source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    name = f"customers_{fmt}"
+    write_args = {"write_index": True, "write_metadata": True}
+
+    # many small files per partition
+    chunks = [df[i : i + 100] for i in range(0, len(df), 100)]
+    write_pandas(chunks[0], "raw", name, write_mode="overwrite", write_args=write_args)
+    for chunk in chunks[1:]:
+        write_pandas(chunk, "raw", name, write_mode="append", write_args=write_args)
+
+    ds = get_dataset("raw", name, write_args=write_args)
+    fs, path = get_fs_path(ds)
+    before = _count_files(fs, path, fmt)
+    assert all(n == len(chunks) for n in before.values())
+
+    # only the selected partitions
+    info = compact_dataset(ds, partitions=[{"l1": "A", "l2": "A"}, {"l1": "B"}])
+    assert info.partitions == 3
+    after = _count_files(fs, path, fmt)
+    compacted = [d for d in after if "l1=A/l2=A" in d or "l1=B" in d]
+    assert len(compacted) == 3
+    for partition_dir, count in after.items():
+        assert count == (1 if partition_dir in compacted else len(chunks))
+
+    # all others, running in parallel
+    info = compact_dataset("raw", name, max_workers=4, write_args=write_args)
+    assert info.partitions == len(before) - 3
+    assert info.removed_files == (len(before) - 3) * len(chunks)
+    assert set(_count_files(fs, path, fmt).values()) == {1}
+
+    # nothing left to do, no temporary files left behind
+    assert compact_dataset(ds).partitions == 0
+    parent = path.rstrip("/").rsplit("/", 1)[0]
+    assert not [p for p in fs.ls(parent) if p.endswith(".tmp")]
+
+    df2 = read_pandas(ds)
+    check_df_equal(df, df2)
+
+    # index and summary are kept up to date
+    files = {f[len(path.rstrip("/")) + 1 :] for f in list_data_files(fs, path)}
+    assert set(read_index(fs, path)["file"].to_pylist()) == files
+    df2 = read_pandas("raw", name, filters=[("Index", "<=", 100)])
+    check_df_equal(df[df.Index <= 100], df2)
+
+    # single files are never split
+    size = sum(fs.du(f"{path}/l1=C/l2=A", total=False).values())
+    assert compact_dataset("raw", name, l1="C", target_size=size // 3).partitions == 0
+
+    # merge into files of the target size
+    appended = ds.model_copy(update={"write_mode": "append"})
+    for _ in range(2):
+        write_pandas(df[df.l1 == "C"], appended)
+    info = compact_dataset(ds, partitions={"l1": "C", "l2": "A"}, target_size=2 * size)
+    assert info == (1, 3, 2)
+    check_df_equal(pd.concat([df] + [df[df.l1 == "C"]] * 2), read_pandas(ds))
+
+
+def test_compact_dataset_errors(io_config):
+    with pytest.raises(PartitionException):
+        compact_dataset("raw", "customers_parquet_single")
+
+    with pytest.raises(PartitionException):
+        compact_dataset("raw", "customers_parquet", partitions={"foo": "bar"})
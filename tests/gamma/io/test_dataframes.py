@@ -1,11 +1,34 @@
 import gzip
+import inspect
+import io
 import logging
 
+import numpy as np
 import pandas as pd
 import polars as pl
+import pyarrow as pa
+import pyarrow.dataset as pa_ds
+import pyarrow.parquet as pq
 import pytest
-
-from gamma.io import copy_dataset, get_dataset, get_fs_path, read_dataset, write_dataset
+from fsspec.implementations.memory import MemoryFile
+
+from gamma.io import (
+    Dataset,
+    DatasetException,
+    clear_discovery_cache,
+    convert_dataset,
+    copy_dataset,
+    get_dataset,
+    get_discovery_cache_info,
+    get_fs_path,
+    iter_pandas,
+    iter_polars,
+    list_partitions,
+    open_dataset_writer,
+    read_dataset,
+    scan_polars,
+    write_dataset,
+)
 
 from .common import assign_partitions, check_df_equal, check_partitions
 
@@ -13,6 +36,8 @@ DataFrame = pd.DataFrame | pl.DataFrame
 
 df_classes = [pd.DataFrame, pl.DataFrame]
 
+iter_funcs = {pd.DataFrame: iter_pandas, pl.DataFrame: iter_polars}
+
 
 @pytest.mark.parametrize("df_cls", df_classes)
 def test_remote_logs(io_config, caplog, df_cls):
@@ -143,3 +168,807 @@ def test_copy_dataset(io_config):
 
     fs, path = get_fs_path(ds3)
     assert fs.isfile(path)
+
+
+@pytest.mark.parametrize("df_cls", df_classes)
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_iter_batches(io_config, df_cls, fmt):
+    df = read_dataset(df_cls, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    write_dataset(df, "raw", f"customers_{fmt}")
+    iter_func = iter_funcs[df_cls]
+
+    # iterate over the full dataset
+    chunks = list(iter_func("raw", f"customers_{fmt}", batch_size=100))
+    assert len(chunks) >= len(df) // 100
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    check_df_equal(df, concat(chunks))
+
+    # honor partitions, columns and filters
+    chunks = iter_func(
+        "raw",
+        f"customers_{fmt}",
+        batch_size=50,
+        l1="A",
+        read_args={"columns": ["Index", "l1"], "filters": [("Index", "<", 500)]},
+    )
+    df2 = concat(list(chunks))
+    df2 = df2.to_pandas() if isinstance(df2, pl.DataFrame) else df2
+    assert set(df2.columns) == {"Index", "l1"}
+    assert set(df2["l1"].astype(str)) == {"A"}
+    assert df2["Index"].max() < 500
+    assert len(df2) > 0
+
+    # single file datasets
+    write_dataset(df, "raw", f"customers_{fmt}_single")
+    chunks = list(iter_func("raw", f"customers_{fmt}_single", batch_size=300))
+    assert len(chunks) > 1
+    check_df_equal(df, concat(chunks))
+
+
+def concat(chunks: list) -> DataFrame:
+    if isinstance(chunks[0], pl.DataFrame):
+        return pl.concat(chunks)
+    return pd.concat(chunks)
+
+
+@pytest.mark.parametrize("name", ["customers_csv_gz", "customers_jsonl"])
+def test_iter_text(io_config, name):
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local")
+    df = assign_partitions(df)
+    write_dataset(df, "raw", name)
+
+    chunks = list(iter_pandas("raw", name, batch_size=300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    check_df_equal(df, pd.concat(chunks))
+
+    # `chunksize` reader argument, ignored by `read_pandas`
+    ds = get_dataset("raw", name)
+    ds.read_args["chunksize"] = 400
+    assert len(list(iter_pandas(ds))) == 3
+    check_df_equal(df, read_dataset(pd.DataFrame, ds))
+
+    if name == "customers_jsonl":
+        with pytest.raises(DatasetException):
+            iter_pandas(ds.model_copy(update={"args": {"orient": "records"}}))
+
+
+def test_convert_dataset(io_config):
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local")
+    df = assign_partitions(df)
+    write_dataset(df, "raw", "customers_csv_gz")
+    write_dataset(df, "raw", "customers_jsonl")
+
+    # into a partitioned dataset
+    src = get_dataset("raw", "customers_csv_gz")
+    dst = get_dataset("raw", "customers_parquet")
+    assert convert_dataset(src, dst, batch_size=300) == len(df)
+    check_partitions(dst)
+    check_df_equal(df, read_dataset(pd.DataFrame, dst))
+
+    # into a single file
+    src = get_dataset("raw", "customers_jsonl")
+    dst = get_dataset("raw", "customers_feather_single")
+    assert convert_dataset(src, dst, batch_size=300) == len(df)
+    check_df_equal(df, read_dataset(pd.DataFrame, dst))
+
+    # and back, replacing existing data
+    src = get_dataset("raw", "customers_parquet", read_args={"batch_size": 100})
+    dst = get_dataset("raw", "customers_feather_single")
+    assert convert_dataset(src, dst) == len(df)
+    check_df_equal(df, read_dataset(pd.DataFrame, dst))
+
+    with pytest.raises(DatasetException):
+        convert_dataset(dst, get_dataset("raw", "customers_csv"))
+
+
+@pytest.mark.parametrize("name", ["customers_csv_gz", "customers_jsonl"])
+def test_arrow_text_reader(io_config, name):
+    from gamma.io import read_arrow
+
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local")
+    df = assign_partitions(df)
+    write_dataset(df, "raw", name)
+
+    # small blocks to parse in parallel, keep dates as strings like pandas
+    read_args = {
+        "text_reader": "pyarrow",
+        "block_size": 16 * 2**10,
+        "column_types": {"Subscription Date": "string"},
+    }
+    if name == "customers_jsonl":
+        # typed JSON fields come first
+        read_args["columns"] = list(df.columns)
+    ds = get_dataset("raw", name, read_args=read_args)
+    tbl = read_dataset(pa.Table, ds)
+    assert isinstance(tbl, pa.Table)
+    assert tbl.schema.field("Index").type == pa.int64()
+    check_df_equal(df, tbl.to_pandas())
+    check_df_equal(df, read_dataset(pd.DataFrame, ds))
+    check_df_equal(pl.from_pandas(df), read_dataset(pl.DataFrame, ds))
+
+    ds = get_dataset("raw", name, read_args={**read_args, "columns": ["Index", "l1"]})
+    assert read_arrow(ds).column_names == ["Index", "l1"]
+    assert list(read_dataset(pd.DataFrame, ds).columns) == ["Index", "l1"]
+
+    if name == "customers_jsonl":
+        with pytest.raises(DatasetException):
+            read_arrow(ds.model_copy(update={"args": {"orient": "records"}}))
+    else:
+        with pytest.raises(NotImplementedError):
+            read_arrow("raw", "customers_excel")
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_scan_polars(io_config, fmt):
+    df = read_dataset(pl.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    name = f"customers_{fmt}"
+    write_dataset(df, "raw", name)
+
+    # partition columns are added
+    lf = scan_polars("raw", name)
+    assert isinstance(lf, pl.LazyFrame)
+    check_df_equal(df, lf.collect())
+    check_df_equal(df, lf.collect(streaming=True))
+
+    # only files in the known partitions are scanned
+    lf = scan_polars("raw", name, l1="B", filters=[("Index", "between", [100, 500])])
+    lf = lf.filter(pl.col("l2") == "A").select(["Index", "First Name"])
+    assert lf.explain().count("SCAN") == 2
+    expected = df.filter(
+        (pl.col("l1") == "B")
+        & (pl.col("l2") == "A")
+        & pl.col("Index").is_between(100, 500)
+    )
+    assert lf.collect().columns == ["Index", "First Name"]
+    assert sorted(lf.collect()["Index"]) == sorted(expected["Index"])
+
+    # single file datasets
+    write_dataset(df, "raw", f"customers_{fmt}_single")
+    check_df_equal(df, scan_polars("raw", f"customers_{fmt}_single").collect())
+
+    # partition columns are added once per partition folder
+    ds = get_dataset("raw", name, write_mode="overwrite")
+    ds.write_args.update(max_rows_per_file=100, max_rows_per_group=100)
+    write_dataset(df, ds)
+    lf = scan_polars(ds)
+    assert lf.explain().count("WITH_COLUMNS") == len(df.select(["l1", "l2"]).unique())
+    check_df_equal(df, lf.collect())
+
+    # remote files are scanned with the dataset filesystem
+    location = f"memory://scan_polars/{name}"
+    ds = ds.model_copy(update={"location": location, "write_args": {}})
+    write_dataset(df, ds)
+    check_df_equal(df, scan_polars(ds).collect())
+    lf = scan_polars(ds.model_copy(update={"partitions": {"l1": "B"}}))
+    assert sorted(lf.collect()["Index"]) == sorted(
+        df.filter(pl.col("l1") == "B")["Index"]
+    )
+
+    # `pyarrow` expressions cannot be translated
+    with pytest.raises(DatasetException):
+        scan_polars("raw", name, filters=pa_ds.field("Index") < 10)
+    with pytest.raises(DatasetException):
+        scan_polars("raw", name, filters={"not": pa_ds.field("Index") < 10})
+
+    with pytest.raises(NotImplementedError):
+        scan_polars("source", "customers_1k_local_plain")
+
+
+@pytest.mark.parametrize("df_cls", df_classes)
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_dataset_writer(io_config, df_cls, fmt):
+    df = read_dataset(df_cls, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    chunks = [df[i : i + 128] for i in range(0, len(df), 128)]
+
+    for name in [f"customers_{fmt}", f"customers_{fmt}_single"]:
+        ds = get_dataset("raw", name)
+        with open_dataset_writer(ds) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+            # nothing visible before commit
+            fs, path = get_fs_path(ds)
+            assert not fs.exists(path)
+
+        check_df_equal(df, read_dataset(df_cls, ds))
+
+    # no temp files left behind
+    ds = get_dataset("raw", f"customers_{fmt}")
+    fs, path = get_fs_path(ds)
+    parent = path.rstrip("/").rsplit("/", 1)[0]
+    assert not [p for p in fs.ls(parent) if p.endswith(".tmp")]
+
+    # partitioned datasets refuse to overwrite by default
+    with pytest.raises(DatasetException):
+        open_dataset_writer(ds)
+
+    # errors discard the data
+    ds.write_args["existing_data_behavior"] = "delete_matching"
+    with pytest.raises(RuntimeError):
+        with open_dataset_writer(ds) as writer:
+            writer.write(chunks[0])
+            raise RuntimeError("fail")
+
+    check_df_equal(df, read_dataset(df_cls, ds))
+
+    # replace only the written partitions
+    pdf = df.to_pandas() if isinstance(df, pl.DataFrame) else df
+    with open_dataset_writer(ds) as writer:
+        writer.write(pdf[pdf.l1 == "A"].head(50))
+    df2 = read_dataset(pd.DataFrame, ds)
+    assert (df2.l1 == "A").sum() == 50
+    assert (df2.l1 != "A").sum() == (pdf.l1 != "A").sum()
+
+
+@pytest.mark.parametrize("df_cls", df_classes)
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_write_modes(io_config, df_cls, fmt):
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    name = f"customers_{fmt}"
+
+    def read() -> pd.DataFrame:
+        df2 = read_dataset(df_cls, "raw", name)
+        return df2.to_pandas() if isinstance(df2, pl.DataFrame) else df2
+
+    write_dataset(df, "raw", name, write_mode="error_if_exists")
+    with pytest.raises(DatasetException):
+        write_dataset(df, "raw", name, write_mode="error_if_exists")
+
+    # replace only the partitions in the input
+    part = df[df.l1 == "A"].head(50)
+    write_dataset(part, "raw", name, write_mode="overwrite_partitions")
+    df2 = read()
+    assert (df2.l1 == "A").sum() == 50
+    assert (df2.l1 != "A").sum() == (df.l1 != "A").sum()
+
+    # add new files, twice
+    for _ in range(2):
+        write_dataset(df[df.l1 == "B"], "raw", name, write_mode="append")
+    df2 = read()
+    assert (df2.l1 == "B").sum() == 3 * (df.l1 == "B").sum()
+    assert (df2.l1 == "C").sum() == (df.l1 == "C").sum()
+
+    # same for the streaming writer
+    with open_dataset_writer(get_dataset("raw", name, write_mode="append")) as w:
+        w.write(df[df.l1 == "C"])
+    df2 = read()
+    assert (df2.l1 == "C").sum() == 2 * (df.l1 == "C").sum()
+
+    write_dataset(df[df.l1 == "D"], "raw", name, write_mode="overwrite")
+    check_df_equal(df[df.l1 == "D"], read())
+
+    # single-file datasets cannot be appended to
+    name = f"customers_{fmt}_single"
+    with pytest.raises(DatasetException):
+        write_dataset(df, "raw", name, write_mode="append")
+    write_dataset(df, "raw", name, write_mode="error_if_exists")
+    with pytest.raises(DatasetException):
+        write_dataset(df, "raw", name, write_mode="error_if_exists")
+    write_dataset(df.head(10), "raw", name, write_mode="overwrite_partitions")
+    assert len(read_dataset(df_cls, "raw", name)) == 10
+
+
+def test_target_file_size(io_config):
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    ds = get_dataset("raw", "customers_parquet", write_mode="overwrite")
+
+    # one file per partition with the defaults
+    write_dataset(df, ds)
+    fs, path = get_fs_path(ds)
+    num_partitions = len(list_partitions(ds))
+    assert len(fs.glob(f"{path}/*/*/*.parquet")) == num_partitions
+
+    # about 100 rows per file
+    nbytes = pa.Table.from_pandas(df, preserve_index=False).nbytes
+    ds.write_args["target_file_size"] = nbytes // 10
+    write_dataset(df, ds)
+    files = fs.glob(f"{path}/*/*/*.parquet")
+    assert len(files) >= 10
+    for file in files:
+        with fs.open(file) as fo:
+            md = pq.read_metadata(fo)
+        assert md.num_rows <= len(df) // 10 + 1
+        assert md.num_row_groups == 1
+
+    check_df_equal(df, read_dataset(pd.DataFrame, ds))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_polars_native_writer(io_config, fmt):
+    df = read_dataset(pl.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    pdf = df.to_pandas()
+    name = f"customers_{fmt}"
+    write_args = {"polars_writer": "native"}
+
+    # same layout as the pyarrow writers
+    ds = get_dataset("raw", name, write_args=write_args, sort_by=["Index"])
+    write_dataset(df, ds)
+    check_partitions(ds)
+    check_df_equal(df, read_dataset(pl.DataFrame, ds))
+    df2 = read_dataset(pd.DataFrame, "raw", name, filters=[("l1", "=", "A")])
+    check_df_equal(pdf[pdf.l1 == "A"], df2)
+
+    fs, path = get_fs_path(ds)
+    files = fs.glob(f"{path}/*/*/*.{fmt}")
+    for file in files:
+        index = pa_ds.dataset(file, format=fmt).to_table()["Index"].to_pylist()
+        assert index == sorted(index)
+
+    # write modes
+    with pytest.raises(DatasetException):
+        write_dataset(df, ds)
+    part = df.filter(pl.col("l1") == "A").head(50)
+    mode = "overwrite_partitions"
+    write_dataset(part, "raw", name, write_args=write_args, write_mode=mode)
+    for _ in range(2):
+        part = df.filter(pl.col("l1") == "B")
+        write_dataset(part, "raw", name, write_args=write_args, write_mode="append")
+    df2 = read_dataset(pd.DataFrame, "raw", name)
+    assert (df2.l1 == "A").sum() == 50
+    assert (df2.l1 == "B").sum() == 3 * (pdf.l1 == "B").sum()
+    assert (df2.l1 == "C").sum() == (pdf.l1 == "C").sum()
+
+    # file size
+    ds = get_dataset("raw", name, write_args=write_args, write_mode="overwrite")
+    ds.write_args["target_file_size"] = df.estimated_size() // 10
+    write_dataset(df, ds)
+    assert len(fs.glob(f"{path}/*/*/*.{fmt}")) >= 10
+    check_df_equal(df, read_dataset(pl.DataFrame, ds))
+
+    # single file datasets
+    name = f"customers_{fmt}_single"
+    write_dataset(df, "raw", name, write_args=write_args)
+    check_df_equal(df, read_dataset(pl.DataFrame, "raw", name))
+
+    with pytest.raises(DatasetException):
+        write_dataset(df, ds.model_copy(update={"write_args": {"polars_writer": "x"}}))
+    with pytest.raises(DatasetException):
+        ds.write_args["write_index"] = True
+        write_dataset(df, ds)
+
+
+@pytest.mark.parametrize("df_cls", df_classes)
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_sorted_write(io_config, df_cls, fmt):
+    df = read_dataset(df_cls, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+
+    ds = get_dataset("raw", f"customers_{fmt}", sort_by=[["Index", "descending"]])
+    write_dataset(df, ds)
+    fs, path = get_fs_path(ds)
+    files = fs.glob(f"{path}/*/*/*.{fmt}")
+    assert len(files) > 1
+    for file in files:
+        with fs.open(file) as fo:
+            index = pa_ds.dataset(fo.name, format=fmt).to_table()["Index"]
+        assert index.to_pylist() == sorted(index.to_pylist(), reverse=True)
+    check_df_equal(df, read_dataset(df_cls, ds))
+
+    ds = get_dataset("raw", f"customers_{fmt}_single", sort_by=["l2", "Index"])
+    write_dataset(df, ds)
+    df2 = read_dataset(pd.DataFrame, ds)
+    keys = df2[["l2", "Index"]]
+    assert keys.equals(keys.sort_values(["l2", "Index"]))
+
+    with pytest.raises(DatasetException):
+        write_dataset(df, "raw", f"customers_{fmt}_single", sort_by=["foo"])
+
+
+def test_zorder_write(io_config):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"x": rng.integers(0, 64, 4096), "y": rng.integers(0, 64, 4096)})
+    df["Index"] = range(len(df))
+
+    def count_row_groups(**kwargs) -> int:
+        ds = get_dataset("raw", "customers_parquet_single", **kwargs)
+        ds.args["row_group_size"] = 256
+        write_dataset(df, ds)
+        fs, path = get_fs_path(ds)
+        with fs.open(path) as fo:
+            md = pq.read_metadata(fo)
+
+        # row groups that may match `x < 8` or `y < 8`
+        count = 0
+        for i in range(md.num_row_groups):
+            for col in range(2):
+                stats = md.row_group(i).column(col).statistics
+                count += stats.min < 8
+        return count
+
+    unsorted = count_row_groups()
+    assert unsorted == 2 * 16
+    zorder = count_row_groups(zorder_by=["x", "y"])
+    assert zorder <= unsorted // 3
+
+    # unlike sorting, helps filters on both columns
+    assert zorder < count_row_groups(sort_by=["x", "y"])
+
+    ds = get_dataset("raw", "customers_parquet_single", zorder_by=["x", "y"])
+    df2 = read_dataset(pd.DataFrame, ds).sort_values("Index", ignore_index=True)
+    pd.testing.assert_frame_equal(df, df2)
+
+
+@pytest.mark.parametrize("df_cls", df_classes)
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_read_filters(io_config, df_cls, fmt):
+    df = read_dataset(df_cls, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    write_dataset(df, "raw", f"customers_{fmt}")
+    write_dataset(df, "raw", f"customers_{fmt}_single")
+
+    # mix partition and data columns
+    filters = {
+        "or": [
+            [("Index", "between", [100, 199]), ("l1", "in", ["A", "B"])],
+            ("Index", "<", 10),
+        ]
+    }
+    pdf = df.to_pandas() if isinstance(df, pl.DataFrame) else df
+    index, l1 = pdf["Index"], pdf["l1"].astype(str)
+    mask = (index.between(100, 199) & l1.isin(["A", "B"])) | (index < 10)
+    expected = set(index[mask])
+
+    for name in [f"customers_{fmt}", f"customers_{fmt}_single"]:
+        df2 = read_dataset(df_cls, "raw", name, filters=filters)
+        df2 = df2.to_pandas() if isinstance(df2, pl.DataFrame) else df2
+        assert set(df2["Index"]) == expected
+
+    # combined with partition values
+    name = f"customers_{fmt}"
+    df2 = read_dataset(df_cls, "raw", name, filters=[("Index", "<", 10)], l1="A")
+    assert len(df2) == ((index < 10) & (l1 == "A")).sum()
+
+    # row filters are not supported by stream readers
+    with pytest.raises(DatasetException):
+        filters = [("Index", "is null")]
+        read_dataset(df_cls, "source", "customers_1k_local_plain", filters=filters)
+
+
+def test_list_partitions_from_folders(io_config):
+    df = pd.DataFrame({"Index": [1, 2, 3], "l1": ["A", "A/B", None], "l2": "B"})
+    ds = get_dataset("raw", "customers_parquet")
+    ds.write_args["existing_data_behavior"] = "delete_matching"
+    with open_dataset_writer(ds) as writer:
+        writer.write(df)
+
+    # ignore files not matching the folder structure
+    fs, path = get_fs_path(ds)
+    fs.touch(f"{path}/_metadata")
+    fs.makedirs(f"{path}/l1=A/.hidden", exist_ok=True)
+    fs.touch(f"{path}/l1=A/.hidden/part-0.parquet")
+
+    parts = list_partitions(ds)
+    assert parts["l1"].tolist() == ["A", "A/B", None]
+    assert parts["l2"].tolist() == ["B"] * 3
+    assert parts["num_files"].tolist() == [1, 1, 1]
+    assert (parts["size_bytes"] > 0).all()
+
+    parts = list_partitions(ds, l1="A/B")
+    assert parts["l1"].tolist() == ["A/B"]
+
+    assert len(list_partitions(ds, l1="C")) == 0
+
+
+def test_list_partitions_typed(io_config):
+    df = pd.DataFrame(
+        {"Index": range(8), "l1": [2020, 2021] * 4, "l2": list("AABB") * 2}
+    )
+    write_dataset(df, "raw", "customers_parquet")
+
+    # integer partitions are typed as in readers
+    parts = list_partitions("raw", "customers_parquet")
+    assert parts["l1"].tolist() == [2020, 2020, 2021, 2021]
+    l1 = parts["l1"].tolist()[0]
+    df2 = read_dataset(pd.DataFrame, "raw", "customers_parquet", l1=l1)
+    assert sorted(df2["Index"]) == [0, 2, 4, 6]
+
+    # partitions of the dataset are kept
+    parts = list_partitions("raw", "customers_parquet", l2="B")
+    assert parts["l1"].tolist() == [2020, 2021]
+    assert parts["l2"].tolist() == ["B", "B"]
+
+    ds = get_dataset("raw", "customers_parquet", l1=2021)
+    parts = list_partitions(ds, l2="A")
+    assert parts[["l1", "l2"]].values.tolist() == [[2021, "A"]]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_partition_pruning(io_config, monkeypatch, fmt):
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    write_dataset(df, "raw", f"customers_{fmt}")
+
+    # record the dataset folders listed by pyarrow
+    ds = get_dataset("raw", f"customers_{fmt}")
+    _, path = get_fs_path(ds)
+    listed = []
+    open_dataset = pa_ds.dataset
+
+    def _dataset(source, *args, **kwargs):
+        listed.append(source.rstrip("/"))
+        return open_dataset(source, *args, **kwargs)
+
+    _dataset.__signature__ = inspect.signature(open_dataset)
+    monkeypatch.setattr(pa_ds, "dataset", _dataset)
+
+    # partition columns are still present
+    df2 = read_dataset(pd.DataFrame, "raw", f"customers_{fmt}", l1="B", l2="A")
+    expected = df[(df.l1 == "B") & (df.l2 == "A")]
+    check_df_equal(expected, df2)
+    assert listed and all(p.endswith("/l1=B/l2=A") for p in listed)
+
+    listed.clear()
+    df2 = read_dataset(pd.DataFrame, "raw", f"customers_{fmt}", l1="C")
+    check_df_equal(df[df.l1 == "C"], df2)
+    assert listed and all(p.endswith("/l1=C") for p in listed)
+
+    # not leading partitions cannot be pruned
+    listed.clear()
+    df2 = read_dataset(pd.DataFrame, "raw", f"customers_{fmt}", l2="B")
+    check_df_equal(df[df.l2 == "B"], df2)
+    assert listed == [path.rstrip("/")]
+
+    # missing partitions
+    df2 = read_dataset(pd.DataFrame, "raw", f"customers_{fmt}", l1="X")
+    assert len(df2) == 0
+
+
+def test_parquet_summary_metadata(io_config, monkeypatch, caplog):
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    ds = get_dataset("raw", "customers_parquet")
+    ds.write_args["write_metadata"] = True
+    write_dataset(df[df.l1 != "D"], ds)
+
+    fs, path = get_fs_path(ds)
+    assert fs.exists(f"{path}/_metadata")
+    assert fs.exists(f"{path}/_common_metadata")
+
+    # record reads from the summary
+    summaries = []
+    parquet_dataset = pa_ds.parquet_dataset
+
+    def _parquet_dataset(*args, **kwargs):
+        summaries.append(args[0])
+        return parquet_dataset(*args, **kwargs)
+
+    _parquet_dataset.__signature__ = inspect.signature(parquet_dataset)
+    monkeypatch.setattr(pa_ds, "parquet_dataset", _parquet_dataset)
+
+    check_df_equal(df[df.l1 != "D"], read_dataset(pd.DataFrame, ds))
+    df2 = read_dataset(pd.DataFrame, ds.layer, ds.name, l1="B")
+    check_df_equal(df[df.l1 == "B"], df2)
+    assert len(summaries) == 2
+
+    # appending keeps the summary complete
+    ds.write_args["existing_data_behavior"] = "overwrite_or_ignore"
+    ds.write_args["basename_template"] = "extra-{i}.parquet"
+    write_dataset(df[df.l1 == "D"], ds)
+    summaries.clear()
+    check_df_equal(df, read_dataset(pd.DataFrame, ds))
+    assert len(summaries) == 1
+
+    # stale summaries are ignored
+    fs.mkdir(f"{path}/l1=E/l2=A")
+    fs.copy(f"{path}/l1=D/l2=A/extra-0.parquet", f"{path}/l1=E/l2=A/part-0.parquet")
+    df2 = read_dataset(pd.DataFrame, ds)
+    assert len(df2) == len(df) + (df.l1 + df.l2 == "DA").sum()
+    assert "stale Parquet summary" in caplog.text
+    fs.rm(f"{path}/l1=E", recursive=True)
+
+    # writing without summary removes it
+    del ds.write_args["write_metadata"]
+    write_dataset(df[df.l1 == "D"], ds)
+    assert not fs.exists(f"{path}/_metadata")
+    check_df_equal(df, read_dataset(pd.DataFrame, ds))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_discovery_cache(io_config, monkeypatch, fmt):
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    read_args = {"discovery_cache": True}
+    name = f"customers_{fmt}"
+    ds = get_dataset("raw", name, read_args=read_args, write_mode="append")
+    clear_discovery_cache()
+    write_dataset(df[df.l1 != "D"], ds)
+
+    fs, path = get_fs_path(ds)
+    assert fs.exists(f"{path}/_gamma_io_write")
+
+    # record file discoveries
+    discoveries = []
+    dataset = pa_ds.dataset
+
+    def _dataset(*args, **kwargs):
+        discoveries.append(args[0])
+        return dataset(*args, **kwargs)
+
+    _dataset.__signature__ = inspect.signature(dataset)
+    monkeypatch.setattr(pa_ds, "dataset", _dataset)
+
+    # the listing is cached for each known partitions folder
+    for _ in range(2):
+        check_df_equal(df[df.l1 != "D"], read_dataset(pd.DataFrame, ds))
+        df2 = read_dataset(pd.DataFrame, ds.layer, ds.name, l1="B", read_args=read_args)
+        check_df_equal(df[df.l1 == "B"], df2)
+    assert len(discoveries) == 2
+    assert get_discovery_cache_info()[:2] == (2, 2)
+
+    # writes invalidate it
+    write_dataset(df[df.l1 == "D"], ds)
+    check_df_equal(df, read_dataset(pd.DataFrame, ds))
+    assert len(discoveries) == 3
+
+    # as do other processes writes, through the marker
+    fs.pipe_file(f"{path}/_gamma_io_write", b"other")
+    check_df_equal(df, read_dataset(pd.DataFrame, ds))
+    assert len(discoveries) == 4
+
+    # without marker, only cached with a TTL
+    fs.rm_file(f"{path}/_gamma_io_write")
+    read_dataset(pd.DataFrame, ds)
+    assert len(discoveries) == 5
+    ds.read_args["discovery_ttl"] = 60
+    for _ in range(2):
+        read_dataset(pd.DataFrame, ds)
+    assert len(discoveries) == 6
+
+    # new files are missed until expired
+    fs.copy(f"{path}/l1=D", f"{path}/l1=E", recursive=True)
+    assert len(read_dataset(pd.DataFrame, ds)) == len(df)
+    clear_discovery_cache()
+    df2 = read_dataset(pd.DataFrame, ds)
+    assert len(df2) == len(df) + (df.l1 == "D").sum()
+    assert get_discovery_cache_info() == (0, 1, 256, 1)
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_stats_index(io_config, fmt):
+    from gamma.io._arrow import get_arrow_dataset
+    from gamma.io._filters import to_expression
+
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    ds = get_dataset("raw", f"customers_{fmt}")
+    ds.write_args.update(write_index=True, max_rows_per_file=50, max_rows_per_group=25)
+    write_dataset(df, ds)
+
+    fs, path = get_fs_path(ds)
+    assert fs.exists(f"{path}/_index.parquet")
+
+    def _count_files(filters, **read_args):
+        ds2 = get_dataset(ds.layer, ds.name, read_args=read_args)
+        expr = to_expression(filters)
+        dataset = get_arrow_dataset(ds2, filter=expr)
+        return len(list(dataset.get_fragments(filter=expr)))
+
+    # files are chunks of sorted "Index" values
+    filters = [("Index", "<=", 100), ("Email", "is not null")]
+    num_files = _count_files(filters)
+    assert 0 < num_files < _count_files(filters, use_index=False)
+    assert _count_files([("Email", "is null")]) == 0
+
+    df2 = read_dataset(pd.DataFrame, ds.layer, ds.name, filters=filters)
+    check_df_equal(df[df.Index <= 100], df2)
+
+    # streaming writer, a file per chunk and partition
+    ds.write_args.update(existing_data_behavior="delete_matching", max_open_files=1)
+    with open_dataset_writer(ds) as writer:
+        for i in range(0, len(df), 100):
+            writer.write(df[i : i + 100])
+    assert _count_files([("Index", ">", 0)]) > 40
+    assert 0 < _count_files([("Index", "<=", 100)]) <= 8
+    df2 = read_dataset(pd.DataFrame, ds.layer, ds.name, filters=[("Index", ">", 900)])
+    check_df_equal(df[df.Index > 900], df2)
+
+    # writing without index removes it
+    del ds.write_args["write_index"], ds.write_args["max_open_files"]
+    write_dataset(df, ds)
+    assert not fs.exists(f"{path}/_index.parquet")
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_stats_index_nan(io_config, fmt):
+    from gamma.io._arrow import get_arrow_dataset
+    from gamma.io._filters import to_expression
+
+    score = [1.0] * 50 + [2.0] * 150
+    ds = get_dataset("raw", f"customers_{fmt}", write_mode="overwrite")
+    ds.write_args.update(write_index=True, max_rows_per_file=50, max_rows_per_group=50)
+    # NaN compare as greater than any value
+    filters = {"not": ("score", "<=", 1.0)}
+    expr = to_expression(filters)
+
+    # float stats skip files without NaN
+    df = pl.DataFrame({"Index": range(200), "score": score, "l1": "A", "l2": "B"})
+    write_dataset(df, ds)
+    dataset = get_arrow_dataset(ds, filter=expr)
+    assert len(list(dataset.get_fragments(filter=expr))) == 3
+
+    # NaN rows match the filter, so their file is read. Use Polars as pandas converts
+    # NaN to null
+    score[10] = float("nan")
+    df = pl.DataFrame({"Index": range(200), "score": score, "l1": "A", "l2": "B"})
+    write_dataset(df, ds)
+    dataset = get_arrow_dataset(ds, filter=expr)
+    assert len(list(dataset.get_fragments(filter=expr))) == 4
+    if fmt == "feather":
+        # `pyarrow` still prunes Parquet row groups using the footer statistics
+        df2 = read_dataset(pd.DataFrame, ds.layer, ds.name, filters=filters)
+        assert sorted(df2["Index"]) == [10, *range(50, 200)]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_memory_map(io_config, fmt):
+    from gamma.io._arrow import read_feather, read_parquet
+
+    tbl = pa.table({"x": np.arange(1_000_000), "y": np.ones(1_000_000)})
+    if fmt == "feather":
+        # single chunk columns, required for zero-copy conversion to pandas
+        args = {"compression": "uncompressed", "chunksize": len(tbl)}
+    else:
+        args = {"compression": "none"}
+    ds = get_dataset("raw", f"customers_{fmt}_single", args=args)
+    write_dataset(tbl.to_pandas(), ds)
+
+    ds = get_dataset(ds.layer, ds.name, args=args, read_args={"memory_map": True})
+    if fmt == "feather":
+        # uncompressed Feather buffers are backed by the mapped file
+        start = pa.total_allocated_bytes()
+        tbl2 = read_feather(ds)
+        assert pa.total_allocated_bytes() - start < 1_000_000
+        assert tbl2.equals(tbl)
+
+        df = read_dataset(pd.DataFrame, ds)
+        assert pa.total_allocated_bytes() - start < 1_000_000
+        assert not df["x"].values.flags.writeable
+    else:
+        assert read_parquet(ds).equals(tbl)
+
+    pd.testing.assert_frame_equal(read_dataset(pd.DataFrame, ds), tbl.to_pandas())
+    assert read_dataset(pl.DataFrame, ds).to_arrow().equals(tbl)
+
+
+def test_remote_feather_range_reads(io_config, monkeypatch):
+    from gamma.io import _arrow
+
+    tbl = pa.table({f"c{i}": np.arange(100_000) for i in range(10)})
+    ds = Dataset(
+        layer="test",
+        name="remote_feather",
+        location="memory://test/remote.feather",
+        format="feather",
+        args={"compression": "uncompressed"},
+    )
+    write_dataset(tbl.to_pandas(), ds)
+
+    # count the bytes read from the remote file
+    fs, path = get_fs_path(ds)
+    bytes_read = []
+
+    def _read(self, *args):
+        data = io.BytesIO.read(self, *args)
+        bytes_read.append(len(data))
+        return data
+
+    monkeypatch.setattr(MemoryFile, "read", _read)
+
+    # small files are read at once
+    assert _arrow.read_feather(ds).equals(tbl)
+    assert bytes_read == [fs.size(path)]
+
+    # column projection only fetches the needed buffers
+    monkeypatch.setattr(_arrow, "FEATHER_BUFFER_MAX_SIZE", 0)
+    bytes_read.clear()
+    ds.read_args["columns"] = ["c1"]
+    assert _arrow.read_feather(ds).equals(tbl.select(["c1"]))
+    assert 0 < sum(bytes_read) < fs.size(path) / 5
+
+    fs.rm(path)
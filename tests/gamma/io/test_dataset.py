@@ -1,6 +1,13 @@
 import pytest
+from gamma.config.globalconfig import reset_config
 
-from gamma.io import Dataset, get_dataset, get_dataset_location
+from gamma.io import (
+    Dataset,
+    clear_dataset_cache,
+    get_dataset,
+    get_dataset_cache_info,
+    get_dataset_location,
+)
 
 
 def test_load_ds_from_config(io_config):
@@ -61,3 +68,43 @@ def test_location(io_config):
     ds.is_file = True
     loc = get_dataset_location(ds)
     assert not loc.endswith("/")
+
+
+def test_dataset_cache(io_config):
+    clear_dataset_cache()
+
+    ds1 = get_dataset("raw", "customers_parquet", l1="A")
+    ds2 = get_dataset("raw", "customers_parquet", l1="A")
+    info = get_dataset_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    # we get equal, but independent, copies
+    assert ds1 == ds2
+    assert ds1 is not ds2
+    ds1.args["foo"] = "bar"
+    ds1.partitions["l2"] = "B"
+    ds3 = get_dataset("raw", "customers_parquet", l1="A")
+    assert "foo" not in ds3.args
+    assert ds3.partitions == {"l1": "A"}
+
+    # different kwargs are different entries
+    ds4 = get_dataset("raw", "customers_parquet", l1="B")
+    assert ds4.partitions == {"l1": "B"}
+    ds5 = get_dataset("raw", "customers_parquet", args={"compression": "snappy"})
+    assert ds5.args["compression"] == "snappy"
+    info = get_dataset_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 3, 3)
+
+    # unhashable kwargs bypass the cache
+    ds6 = get_dataset("run", "customers_dyn", params={"obj": bytearray(b"x")})
+    assert ds6.params["obj"] == bytearray(b"x")
+    assert get_dataset_cache_info().currsize == 3
+
+    # reloading the config invalidates the entries
+    reset_config()
+    get_dataset("raw", "customers_parquet", l1="A")
+    info = get_dataset_cache_info()
+    assert (info.hits, info.currsize) == (2, 1)
+
+    clear_dataset_cache()
+    assert get_dataset_cache_info() == (0, 0, info.maxsize, 0)
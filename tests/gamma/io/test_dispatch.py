@@ -0,0 +1,110 @@
+from typing import Literal, Type
+
+import pandas as pd
+import plum
+import polars as pl
+
+from gamma.io import Dataset
+from gamma.io._dispatch import Dispatcher, FastFunction
+
+
+def test_fast_dispatch_values():
+    dispatch = Dispatcher()
+
+    @dispatch
+    def load(ds: Dataset, fmt, protocol):
+        return "fallback"
+
+    @dispatch
+    def load(ds: Dataset, fmt: Literal["parquet"], protocol):
+        return "parquet"
+
+    @dispatch
+    def load(ds: Dataset, fmt: Literal["parquet"], protocol: Literal["s3"]):
+        return "parquet-s3"
+
+    assert isinstance(load, FastFunction)
+    ds = Dataset(layer="l", name="n", location="file:///tmp/x", format="csv")
+
+    for _ in range(2):
+        assert load(ds, "csv", "file") == "fallback"
+        assert load(ds, "parquet", "file") == "parquet"
+        assert load(ds, "parquet", "s3") == "parquet-s3"
+        assert load(ds, "csv", "s3") == "fallback"
+
+    # fmt and protocol are matched by value
+    assert {1, 2} <= set(load._value_positions[3])
+
+    # registering a new method invalidates the cache
+    @dispatch
+    def load(ds: Dataset, fmt: Literal["csv"], protocol):
+        return "csv"
+
+    assert load(ds, "csv", "file") == "csv"
+    assert load.resolve(ds, "parquet", "file")(ds, None, None) == "parquet"
+
+
+def test_fast_dispatch_types():
+    dispatch = Dispatcher()
+
+    @dispatch
+    def read(cls, *args):
+        return "fallback"
+
+    @dispatch
+    def read(cls: Type[pd.DataFrame], *args):
+        return "pandas"
+
+    @dispatch
+    def read(cls: Type[pl.DataFrame], *args):
+        return "polars"
+
+    for _ in range(2):
+        assert read(pd.DataFrame, "a", "b") == "pandas"
+        assert read(pl.DataFrame, "a", "b") == "polars"
+        assert read(dict, "a") == "fallback"
+
+    # faithful signatures only cache by type
+    @dispatch
+    def ext(fmt: str) -> str:
+        return fmt
+
+    assert ext("csv") == "csv"
+    assert ext._value_positions[1] == ()
+
+
+def test_fast_dispatch_doc():
+    from gamma.io import read_pandas
+
+    # docstrings of the wrapped function, listing all methods
+    assert isinstance(read_pandas, FastFunction)
+    assert "Pandas dataset reader shortcut." in read_pandas.__doc__
+    assert "Specialized support for Parquet datasets." in read_pandas.__doc__
+
+
+def test_fast_dispatch_register():
+    dispatch = Dispatcher()
+
+    @dispatch
+    def ext(fmt: str):
+        return "default"
+
+    assert ext("foo") == "default"
+
+    # methods registered through the function also invalidate the cache
+    @ext.dispatch
+    def ext(fmt: Literal["foo"]):
+        return "foo"
+
+    assert isinstance(ext, FastFunction)
+    assert ext("foo") == "foo"
+
+    ext.register(lambda fmt: "bar", plum.Signature(Literal["bar"]))
+    assert ext("bar") == "bar"
+
+    @ext.dispatch_multi((Literal["a"],), (Literal["b"],))
+    def ext(fmt):
+        return "ab"
+
+    assert ext("a") == ext("b") == "ab"
+    assert ext("foo") == "foo"
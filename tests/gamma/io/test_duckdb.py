@@ -0,0 +1,85 @@
+import pandas as pd
+import pyarrow.dataset as pa_ds
+import pytest
+
+from gamma.io import DatasetException, get_dataset, read_dataset, write_dataset
+
+from .common import assign_partitions, check_df_equal
+
+duckdb = pytest.importorskip("duckdb")
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_read_duckdb(io_config, fmt):
+    from gamma.io import read_duckdb
+
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    name = f"customers_{fmt}"
+    write_dataset(df, "raw", name)
+
+    con = duckdb.connect()
+    rel = read_duckdb("raw", name, connection=con)
+    assert isinstance(rel, duckdb.DuckDBPyRelation)
+    check_df_equal(df, rel.df())
+
+    # aggregations run in DuckDB
+    counts = rel.aggregate("l1, count(*) AS n", "l1").df()
+    expected = df.groupby("l1").size()
+    assert counts.set_index("l1")["n"].sort_index().tolist() == expected.tolist()
+
+    # partitions, filters and columns
+    rel = read_duckdb(
+        "raw",
+        name,
+        l1="A",
+        filters=[("Index", "between", [100, 500])],
+        read_args={"columns": ["Index", "l2"]},
+        connection=con,
+    )
+    df2 = rel.df()
+    assert list(df2.columns) == ["Index", "l2"]
+    mask = (df.l1 == "A") & df.Index.between(100, 500)
+    assert sorted(df2["Index"]) == sorted(df.Index[mask])
+
+    # partitions not forming a path prefix
+    df2 = read_duckdb("raw", name, l2="B", connection=con).df()
+    assert sorted(df2["Index"]) == sorted(df.Index[df.l2 == "B"])
+    assert set(df2["l2"]) == {"B"}
+
+    with pytest.raises(DatasetException):
+        read_duckdb("raw", name, filters=pa_ds.field("Index") < 10, connection=con)
+
+    # single files and dataset dispatch
+    write_dataset(df, "raw", f"customers_{fmt}_single")
+    ds = get_dataset("raw", f"customers_{fmt}_single")
+    df2 = read_dataset(duckdb.DuckDBPyRelation, ds).df()
+    assert sorted(df2["Index"]) == sorted(df["Index"])
+
+    with pytest.raises(NotImplementedError):
+        read_duckdb("source", "customers_1k_local_plain")
+
+
+def test_register_duckdb_views(io_config):
+    from gamma.io import register_duckdb_views
+
+    df = read_dataset(pd.DataFrame, "source", "customers_1k_local_plain")
+    df = assign_partitions(df)
+    write_dataset(df, "raw", "customers_parquet")
+    write_dataset(df[["Index", "l1"]], "raw", "customers_feather_single")
+
+    con = duckdb.connect()
+    views = {
+        "customers": ("raw", "customers_parquet"),
+        "segments": get_dataset("raw", "customers_feather_single"),
+    }
+    assert register_duckdb_views(views, connection=con) is con
+
+    sql = """
+        SELECT s.l1, count(*) AS n
+        FROM customers c JOIN segments s ON c.Index = s.Index
+        GROUP BY s.l1
+        ORDER BY s.l1
+    """
+    counts = con.sql(sql).df()
+    assert counts["n"].tolist() == df.groupby("l1").size().sort_index().tolist()
@@ -0,0 +1,48 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from gamma.io._filters import to_expression
+
+TABLE = pa.table(
+    {
+        "a": [1, 2, 3, 4, None],
+        "b": ["x", "y", "z", "x", "y"],
+    }
+)
+
+
+def _select(spec) -> list:
+    return TABLE.filter(to_expression(spec))["a"].to_pylist()
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        (("a", "=", 2), [2]),
+        (("a", "!=", 2), [1, 3, 4]),
+        (("a", ">=", 3), [3, 4]),
+        (("a", "between", [2, 3]), [2, 3]),
+        (("b", "in", ["x", "z"]), [1, 3, 4]),
+        (("b", "not in", ["x", "z"]), [2, None]),
+        (("a", "is null"), [None]),
+        (["a", "is not null"], [1, 2, 3, 4]),
+        # list of terms is a conjunction
+        ([("a", ">", 1), ("b", "=", "x")], [4]),
+        # list of lists is in disjunctive normal form
+        ([[("a", "<", 2)], [("b", "=", "z"), ("a", ">", 2)]], [1, 3]),
+        ({"or": [("a", "=", 1), {"not": ("b", "!=", "z")}]}, [1, 3]),
+        ({"and": [("a", "<", 4), {"or": [("b", "=", "x"), ("a", "is null")]}]}, [1]),
+        (pc.field("a") == 4, [4]),
+    ],
+)
+def test_to_expression(spec, expected):
+    assert _select(spec) == expected
+
+
+@pytest.mark.parametrize(
+    "spec", [{"xor": []}, {"and": [], "or": []}, {"and": []}, [], "a = 1"]
+)
+def test_to_expression_invalid(spec):
+    with pytest.raises(ValueError):
+        to_expression(spec)
@@ -0,0 +1,197 @@
+import asyncio
+import multiprocessing as mp
+import os
+import re
+
+import pytest
+import s3fs
+
+from gamma.io import (
+    close_filesystems,
+    config,
+    get_filesystem,
+    get_filesystem_pool_info,
+    get_fs_path,
+)
+from gamma.io._fs import (
+    FilesystemsMatcher,
+    UploadOptions,
+    get_fs_matcher,
+    get_fs_options,
+    get_upload_options,
+    open_upload,
+    upload_file,
+)
+
+FILESYSTEMS = {
+    "bucket_a": {"match": "s3://bucket-a/.*", "endpoint_url": "http://a"},
+    "bucket_b_data": {"match": r"s3://bucket-b/data/", "endpoint_url": "http://b1"},
+    "bucket_b": {"match": "s3://bucket-b/.*", "endpoint_url": "http://b2"},
+    "grouped": {"match": r"gs://(foo|bar)-(\d+)/.*", "protocol": "gcs"},
+    "backref": {"match": r"gs://(\w)\1/.*", "token": "anon"},
+}
+
+LOCATIONS = [
+    "s3://bucket-a/some/file.parquet",
+    "s3://bucket-b/data/part-0.parquet",
+    "s3://bucket-b/other/part-0.parquet",
+    "s3://bucket-c/file.csv",
+    "gs://bar-12/file.csv",
+    "gs://xx/file.csv",
+    "file:///tmp/data.csv",
+]
+
+
+def _linear_match(filesystems, location):
+    for candidate in filesystems.values():
+        if re.match(candidate["match"], location):
+            return {k: v for k, v in candidate.items() if k != "match"}
+    return None
+
+
+@pytest.mark.parametrize("location", LOCATIONS)
+def test_matcher_same_as_linear_scan(location):
+    literal = {k: v for k, v in FILESYSTEMS.items() if k.startswith("bucket")}
+
+    for filesystems in [FILESYSTEMS, literal]:
+        matcher = FilesystemsMatcher(filesystems)
+        expected = _linear_match(filesystems, location)
+        assert matcher.match(location) == expected
+        # memoized
+        assert matcher.match(location) == expected
+
+    # only literal prefixes, memoize on prefix
+    matcher = FilesystemsMatcher(literal)
+    assert matcher.prefix_len == len("s3://bucket-b/data/")
+    assert FilesystemsMatcher(FILESYSTEMS).prefix_len is None
+
+
+def test_matcher_backref_fallback():
+    matcher = FilesystemsMatcher(FILESYSTEMS)
+    assert matcher.combined is None
+
+    no_backref = {k: v for k, v in FILESYSTEMS.items() if k != "backref"}
+    matcher = FilesystemsMatcher(no_backref)
+    assert matcher.combined is not None
+    assert matcher.match("gs://foo-1/x")["protocol"] == "gcs"
+
+
+def test_fs_options_config_change(io_config, monkeypatch):
+    _, options = get_fs_options("s3://test-bucket/foo")
+    assert options == {"protocol": "s3", "endpoint_url": "http://localhost:4566"}
+
+    # changes in the returned options do not leak
+    options["foo"] = "bar"
+    _, options = get_fs_options("s3://test-bucket/foo")
+    assert "foo" not in options
+
+    # monkey-patching the config requires notification
+    monkeypatch.setattr(config, "_resolve_filesystems_config", lambda: FILESYSTEMS)
+    matcher = get_fs_matcher()
+    config.notify_config_change()
+    assert get_fs_matcher() is not matcher
+
+    _, options = get_fs_options("s3://test-bucket/foo")
+    assert options == {"protocol": "s3"}
+    _, options = get_fs_options("gs://foo-1/x")
+    assert options == {"protocol": "gcs"}
+
+    monkeypatch.undo()
+    config.notify_config_change()
+
+
+def _pooled_fs_id():
+    return id(get_filesystem("file"))
+
+
+def test_filesystem_pool(io_config):
+    close_filesystems()
+    info = get_filesystem_pool_info()
+
+    fs1 = get_filesystem("file")
+    fs2 = get_filesystem("file")
+    assert fs1 is fs2
+    assert get_filesystem("file", auto_mkdir=True) is not fs1
+
+    # get_fs_path uses the pool
+    fs3, path = get_fs_path("file:///tmp/foo/")
+    assert fs3 is fs1
+    assert path == "/tmp/foo/"
+
+    info2 = get_filesystem_pool_info()
+    assert info2.hits - info.hits == 2
+    assert info2.currsize == 2
+
+    # unhashable options are not pooled
+    get_filesystem("memory", foo=[bytearray()])
+    assert get_filesystem_pool_info().currsize == 2
+
+    # forked children do not reuse the parent instances
+    with mp.get_context("fork").Pool(1) as pool:
+        assert pool.apply(_pooled_fs_id) != id(fs1)
+
+    close_filesystems("memory")
+    assert get_filesystem_pool_info().currsize == 2
+    close_filesystems()
+    assert get_filesystem_pool_info().currsize == 0
+    assert get_filesystem("file") is not fs1
+
+
+def test_upload_options(io_config):
+    assert get_upload_options("s3://test-bucket/foo") == UploadOptions(5 * 2**20, 4)
+    assert get_upload_options("s3://other/foo") == UploadOptions()
+
+
+class FakeS3:
+    """Record the multipart upload calls of an `S3FileSystem`."""
+
+    def __init__(self):
+        self.parts = {}
+        self.completed = None
+        self.running = self.max_running = 0
+
+    async def __call__(self, method, **kwargs):
+        if method == "create_multipart_upload":
+            return {"UploadId": "upload-1"}
+        if method == "upload_part":
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await asyncio.sleep(0.01)
+            self.running -= 1
+            self.parts[kwargs["PartNumber"]] = kwargs["Body"]
+            return {"ETag": f"etag-{kwargs['PartNumber']}"}
+        if method == "complete_multipart_upload":
+            self.completed = kwargs["MultipartUpload"]["Parts"]
+            return {}
+        raise AssertionError(f"Unexpected call: {method}")
+
+
+def test_s3_parallel_upload(tmp_path, monkeypatch):
+    fs = s3fs.S3FileSystem(anon=True, skip_instance_cache=True)
+    fake = FakeS3()
+    monkeypatch.setattr(fs, "_call_s3", fake)
+
+    data = os.urandom(12 * 2**20)
+    lpath = tmp_path / "data"
+    lpath.write_bytes(data)
+
+    # part size below the S3 minimum is increased to 5 MiB
+    options = UploadOptions(part_size=2**20, concurrency=2)
+    upload_file(fs, str(lpath), "bucket/data", options, "s3")
+
+    assert sorted(fake.parts) == [1, 2, 3]
+    assert b"".join(fake.parts[i] for i in [1, 2, 3]) == data
+    assert [p["PartNumber"] for p in fake.completed] == [1, 2, 3]
+    assert fake.max_running == 2
+
+
+def test_open_upload(tmp_path):
+    fs, path = get_fs_path("memory://test/upload.bin")
+    with open_upload(fs, path) as fo:
+        fo.write(b"remote")
+    assert fs.cat_file(path) == b"remote"
+
+    fs, path = get_fs_path(f"file://{tmp_path}/upload.bin")
+    with open_upload(fs, path) as fo:
+        fo.write(b"local")
+    assert (tmp_path / "upload.bin").read_bytes() == b"local"
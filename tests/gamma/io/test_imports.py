@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_LIBS = ["pandas", "pyarrow", "polars", "sqlalchemy"]
+
+
+def _run(code: str) -> str:
+    from .conftest import _project_root
+
+    env = dict(os.environ, PYTHONPATH=_project_root())
+    cp = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert cp.returncode == 0, cp.stderr
+    return cp.stdout.strip()
+
+
+def _loaded_libs(code: str) -> set[str]:
+    code += f"\nimport sys; print(*[m for m in {BACKEND_LIBS} if m in sys.modules])"
+    return set(_run(code).split())
+
+
+def test_import_is_lazy():
+    code = "import gamma.io\nfrom gamma.io import get_fs_path, copy_dataset, Dataset"
+    assert _loaded_libs(code) == set()
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("read_pandas", {"pandas", "pyarrow", "sqlalchemy"}),
+        ("iter_pandas", {"pandas", "pyarrow", "sqlalchemy"}),
+        ("convert_dataset", {"pandas", "pyarrow", "sqlalchemy"}),
+        ("read_polars", {"polars"}),
+    ],
+)
+def test_backend_loaded_on_access(name, expected):
+    code = f"from gamma.io import {name}"
+    loaded = _loaded_libs(code)
+    assert expected <= loaded
+    assert "polars" not in loaded or name == "read_polars"
+
+
+def test_read_write_dataset_load_backends(io_config, tmp_path):
+    code = f"""
+import pandas as pd
+from gamma.io import Dataset, read_dataset, write_dataset
+
+ds = Dataset(layer="l", name="n", location="file://{tmp_path}/data.csv", format="csv")
+write_dataset(pd.DataFrame({{"a": [1, 2]}}), ds)
+print(read_dataset(pd.DataFrame, ds)["a"].sum())
+"""
+    assert _run(code) == "3"
@@ -6,6 +6,7 @@ from itertools import cycle
 from random import choice
 
 import boto3
+import pandas as pd
 import pytest
 
 from gamma.io import copy_dataset, get_dataset, get_fs_path, read_pandas, write_pandas
@@ -107,3 +108,17 @@ def test_s3_read_write_copy(io_config, bucket_test):
     )
 
     assert len(fs.find(path)) == len(fs.find(path2))
+
+
+def test_s3_multipart_upload(io_config, bucket_test):
+    # about 14 MiB, larger than two of the configured 5 MiB parts
+    rows = 2**18
+    data = [f"x{os.urandom(24).hex()}" for _ in range(rows)]
+    df = pd.DataFrame({"Index": range(rows), "data": data})
+
+    write_pandas(df, "raw", "customers_s3_csv")
+    fs, path = get_fs_path(get_dataset("raw", "customers_s3_csv"))
+    assert fs.size(path) > 2 * 5 * 2**20
+
+    df2 = read_pandas("raw", "customers_s3_csv")
+    pd.testing.assert_frame_equal(df, df2)
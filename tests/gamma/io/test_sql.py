@@ -41,6 +41,10 @@ def test_sql_read_write(io_config, caplog):
 
     pd.testing.assert_frame_equal(df, df2)
 
+    # append to the table instead of replacing it
+    write_pandas(df, "raw", "customers_sql_table", write_mode="append")
+    assert len(read_pandas(ds)) == 2 * len(df)
+
     # check we can read a parameterized SQL query
     df3 = read_pandas("raw", "customers_sql_query", first_name="andr%")
 